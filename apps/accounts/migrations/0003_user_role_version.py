@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_create_groups_and_permissions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="role_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
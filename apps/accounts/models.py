@@ -5,6 +5,20 @@ from django.db import models
 class User(AbstractUser):
     email = models.EmailField(unique=True)
     profile_picture = models.ImageField(upload_to="profile_pics/", null=True, blank=True)
+    # Bumped whenever the user's group, organization or active flag
+    # changes, outstanding tokens carrying an older version are rejected.
+    role_version = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_is_active = instance.__dict__.get("is_active")
+        return instance
+
+    def is_changing_active(self):
+        """True when `is_active` differs from the value loaded from the database."""
+        stored = getattr(self, "_stored_is_active", None)
+        return stored is not None and stored != self.is_active
 
     def __str__(self):
         return self.username
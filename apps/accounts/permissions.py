@@ -1,3 +1,6 @@
+from rest_framework.permissions import IsAuthenticated
+
+from authentication import claims
 from mini_jira import constants
 
 
@@ -5,3 +8,12 @@ group_permission_mapping = {
     constants.ADMIN: [],
     constants.MEMBER: []
 }
+
+
+class AdminGroupPermission(IsAuthenticated):
+    message = "Permission denied"
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        return claims.get_user_group_name(request) == constants.ADMIN
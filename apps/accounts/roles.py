@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from accounts.models import User
+
+
+ROLE_VERSION_KEY = "role_version:{user_id}"
+
+
+def get_cache():
+    return caches[settings.AUTH_CLAIMS_CACHE_ALIAS]
+
+
+def get_role_version(user_id):
+    """The user's current role version, None for a deleted user."""
+    key = ROLE_VERSION_KEY.format(user_id=user_id)
+    role_version = get_cache().get(key)
+    if role_version is None:
+        role_version = User.objects.filter(id=user_id).values_list("role_version", flat=True).first()
+        if role_version is not None:
+            get_cache().set(key, role_version, timeout=settings.AUTH_CLAIMS_CACHE_TIMEOUT)
+    return role_version
+
+
+def bump_role_version(user_ids):
+    """
+    Invalidates every token issued to `user_ids` so far. The cached
+    versions are dropped again once the transaction commits, a request
+    reading in between caches the version from before the bump.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    User.objects.filter(id__in=user_ids).update(role_version=F("role_version") + 1)
+    keys = [ROLE_VERSION_KEY.format(user_id=user_id) for user_id in user_ids]
+    get_cache().delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: get_cache().delete_many(keys))
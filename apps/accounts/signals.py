@@ -0,0 +1,53 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from organizations.models import Organization, OrganizationUser
+
+from accounts.models import User
+from accounts.roles import bump_role_version
+
+
+def get_changed_user_ids(instance, action, reverse, pk_set):
+    """
+    Returns the ids of the users an m2m_changed signal on User.groups or
+    Organization.users touched, or None for the pre_* half of the change.
+    """
+    forward = isinstance(instance, User)
+    if forward:
+        return [instance.pk] if action.startswith("post_") else None
+    # group.user_set.clear() does not report pk_set, so the users are
+    # remembered before the rows go away.
+    if action == "pre_clear":
+        users = instance.user_set if hasattr(instance, "user_set") else instance.users
+        instance._cleared_user_ids = list(users.values_list("id", flat=True))
+        return None
+    if action == "post_clear":
+        return instance.__dict__.pop("_cleared_user_ids", [])
+    return pk_set if action.startswith("post_") else None
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=Organization.users.through)
+def user_role_handler(sender, instance, action, reverse, pk_set, **kwargs):
+    user_ids = get_changed_user_ids(instance, action, reverse, pk_set)
+    if user_ids:
+        bump_role_version(user_ids)
+
+
+@receiver(post_save, sender=OrganizationUser)
+@receiver(post_delete, sender=OrganizationUser)
+def organization_user_handler(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_role_version([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def user_active_handler(sender, instance, created, raw=False, **kwargs):
+    if raw or created or not instance.is_changing_active():
+        return
+    # Stateless authentication never loads the user, a deactivated user's
+    # tokens are rejected through the role version.
+    bump_role_version([instance.pk])
+    instance._stored_is_active = instance.is_active
+    # Saving the instance again must not write the old version back.
+    instance.refresh_from_db(fields=["role_version"])
@@ -0,0 +1,41 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+
+from authentication import claims
+
+
+class ClaimsTokenUser(TokenUser):
+    """Stateless user built from the token claims alone."""
+
+    @cached_property
+    def group(self):
+        return self.token.get(claims.GROUP_CLAIM)
+
+    @cached_property
+    def organization_id(self):
+        return self.token.get(claims.ORGANIZATION_CLAIM)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication rejecting tokens issued before the user's last role change."""
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if not claims.is_current(validated_token, user.role_version):
+            raise InvalidToken("Token claims are out of date, please log in again")
+        return user
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates with a ClaimsTokenUser instead of loading the user row,
+    for read-only endpoints that need nothing but the user id and claims.
+    The role version is checked against the cache.
+    """
+
+    def get_user(self, validated_token):
+        if not claims.is_current(validated_token):
+            raise InvalidToken("Token claims are out of date, please log in again")
+        return ClaimsTokenUser(validated_token)
@@ -0,0 +1,53 @@
+"""
+Claims embedded in the JWTs this project issues, and helpers reading them
+off a request with a database fallback for requests authenticated without
+a token (sessions, tests using force_authenticate).
+"""
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.roles import get_role_version
+
+
+GROUP_CLAIM = "group"
+ORGANIZATION_CLAIM = "organization"
+ROLE_VERSION_CLAIM = "role_version"
+USERNAME_CLAIM = "username"
+
+
+def add_claims(token, user):
+    token[USERNAME_CLAIM] = user.username
+    token[GROUP_CLAIM] = user.groups.values_list("name", flat=True).first()
+    token[ORGANIZATION_CLAIM] = user.organizations_organization.values_list("id", flat=True).first()
+    # Read back rather than taken from `user`, whose copy may predate a
+    # role change made through another instance.
+    token[ROLE_VERSION_CLAIM] = get_role_version(user.pk)
+    return token
+
+
+def is_current(token, role_version=None):
+    """False once the user's role changed after `token` was issued."""
+    if role_version is None:
+        role_version = get_role_version(token.get(api_settings.USER_ID_CLAIM))
+    return token.get(ROLE_VERSION_CLAIM) == role_version
+
+
+def get_token(request):
+    token = getattr(request, "auth", None)
+    if token is not None and ROLE_VERSION_CLAIM in token:
+        return token
+    return None
+
+
+def get_user_group_name(request):
+    token = get_token(request)
+    if token is not None:
+        return token.get(GROUP_CLAIM)
+    return request.user.groups.values_list("name", flat=True).first()
+
+
+def get_organization_id(request, user=None):
+    token = get_token(request)
+    if token is not None and (user is None or user.pk == request.user.pk):
+        return token.get(ORGANIZATION_CLAIM)
+    user = user or request.user
+    return user.organizations_organization.values_list("id", flat=True).first()
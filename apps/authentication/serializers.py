@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication import claims
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues token pairs carrying the user's group and organization."""
+
+    @classmethod
+    def get_token(cls, user):
+        return claims.add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses to refresh tokens whose claims are out of date."""
+
+    def validate(self, attrs):
+        if not claims.is_current(RefreshToken(attrs["refresh"])):
+            raise InvalidToken("Token claims are out of date, please log in again")
+        return super().validate(attrs)
@@ -117,6 +117,7 @@ def test_respond_invite_accept(client, user2, invitation, project):
     assert response.status_code == status.HTTP_200_OK
     assert invitation.status == ProjectInvitation.STATUS_ACCEPTED
     assert invitation.responded_at is not None
+    assert project.is_collaborator(user2)
 
 
 # Test Case: Respond to Invitation - Reject
@@ -134,6 +135,7 @@ def test_respond_invite_reject(client, user3, invitation_2, project):
     assert response.status_code == status.HTTP_200_OK
     assert invitation_2.status == ProjectInvitation.STATUS_REJECTED
     assert invitation_2.responded_at is not None
+    assert not project.is_collaborator(user3)
 
 
 # Test Case: Respond to Invitation - Not Found
@@ -8,7 +8,10 @@ from django.utils import timezone
 
 class ProjectInvitationListView(APIView):
     def get(self, request):
-        invitations = ProjectInvitation.objects.filter(email=request.user.email)
+        invitations = ProjectInvitation.objects.filter(
+            email=request.user.email,
+            project__is_pending_deletion=False
+        )
         serializer = ProjectInvitationListSerializer(invitations, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -25,7 +28,7 @@ class ProjectInvitationCreateView(APIView):
 class ProjectInvitationResponseView(APIView):
     def get_object(self, uid, user):
         try:
-            return ProjectInvitation.objects.get(id=uid, email=user.email)
+            return ProjectInvitation.objects.get(id=uid, email=user.email, project__is_pending_deletion=False)
         except ProjectInvitation.DoesNotExist:
             return None
 
@@ -34,7 +37,11 @@ class ProjectInvitationResponseView(APIView):
         if invitation:
             serializer = ProjectInvitationResponseSerializer(invitation, data=request.data)
             if serializer.is_valid():
-                serializer.save(responded_at=timezone.now())
+                invitation = serializer.save(responded_at=timezone.now())
+                if invitation.status == ProjectInvitation.STATUS_ACCEPTED:
+                    # Goes through m2m_changed, which invalidates the
+                    # user's cached project memberships.
+                    invitation.project.members.add(request.user)
                 return Response({"detail": "Invitation response recorded."}, status=status.HTTP_200_OK)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         return Response({"detail": "Invitation not found."}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from collaborations.models import ProjectInvitation
+from projects import membership
+from projects.models import Project, ProjectDeletionJob
+from tasks.models import (
+    ArchivedTask,
+    CommentReadReceipt,
+    SearchEntry,
+    Task,
+    TaskComment,
+    TaskCounter,
+    TaskDiscussion,
+    TaskDiscussionMessage,
+    TaskReadWatermark
+)
+
+
+# Purged in this order, children before their parents, so that deleting a
+# batch never cascades into more than the batch itself. Counters go after
+# the tasks, whose delete handler still updates them.
+SECTIONS = [
+    ("search_entries", SearchEntry, "project_id"),
+    ("read_receipts", CommentReadReceipt, "task_comment__task__project_id"),
+    ("read_watermarks", TaskReadWatermark, "task__project_id"),
+    ("messages", TaskDiscussionMessage, "discussion__task__project_id"),
+    ("discussions", TaskDiscussion, "task__project_id"),
+    ("comments", TaskComment, "task__project_id"),
+    ("tasks", Task, "project_id"),
+    ("task_counters", TaskCounter, "project_id"),
+    ("archived_tasks", ArchivedTask, "project_id"),
+    ("invitations", ProjectInvitation, "project_id"),
+    ("members", Project.members.through, "project_id"),
+]
+
+# Comments and messages cascade to their replies, batches only take rows
+# with no replies left so a thread is purged from its leaves up.
+THREADED = {TaskComment, TaskDiscussionMessage}
+
+
+def get_claimable_jobs():
+    """
+    Jobs no worker is on. Failed jobs are retried up to
+    `PROJECT_PURGE_MAX_ATTEMPTS` times, running jobs whose worker has not
+    reported progress within `PROJECT_PURGE_LEASE_TIMEOUT` are taken over.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.PROJECT_PURGE_LEASE_TIMEOUT)
+    return ProjectDeletionJob.objects.filter(
+        Q(status=ProjectDeletionJob.STATUS_PENDING)
+        | Q(status=ProjectDeletionJob.STATUS_FAILED, attempts__lt=settings.PROJECT_PURGE_MAX_ATTEMPTS)
+        | Q(status=ProjectDeletionJob.STATUS_RUNNING, updated_at__lt=stale)
+    )
+
+
+def claim_job(exclude):
+    """
+    Marks the oldest claimable job as running and returns it. Workers skip
+    the rows another one has locked, the compare-and-set on the status
+    covers databases without row locks.
+    """
+    jobs = get_claimable_jobs().exclude(id__in=exclude).order_by("created_at")
+    while True:
+        with transaction.atomic():
+            job = jobs.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            claimed = ProjectDeletionJob.objects.filter(
+                id=job.id, status=job.status, updated_at=job.updated_at
+            ).update(status=ProjectDeletionJob.STATUS_RUNNING, error="", updated_at=timezone.now())
+        if claimed:
+            job.status = ProjectDeletionJob.STATUS_RUNNING
+            job.error = ""
+            return job
+        jobs = jobs.exclude(id=job.id)
+
+
+def purge_projects(batch_size, max_batches=None, progress=None):
+    """
+    Works through the queued deletion jobs oldest first. Every batch is
+    deleted in its own transaction together with the job's progress, so a
+    run that crashes or stops after `max_batches` is resumed by the next
+    one. A job that fails is recorded as failed and the run moves on to
+    the next one. Returns the number of batches deleted.
+    """
+    batches = 0
+    claimed = set()
+    while max_batches is None or batches < max_batches:
+        job = claim_job(claimed)
+        if job is None:
+            break
+        claimed.add(job.id)
+        remaining = None if max_batches is None else max_batches - batches
+        try:
+            batches += purge_project(job, batch_size, remaining, progress)
+        except Exception as error:
+            ProjectDeletionJob.objects.filter(id=job.id).update(
+                status=ProjectDeletionJob.STATUS_FAILED,
+                error=str(error),
+                attempts=F("attempts") + 1,
+                updated_at=timezone.now(),
+            )
+    return batches
+
+
+def purge_project(job, batch_size, max_batches=None, progress=None):
+    """Purges a job claimed through `claim_job`."""
+    batches = 0
+    for name, model, project_lookup in SECTIONS:
+        rows = model._base_manager.filter(**{project_lookup: job.project_id})
+        if model in THREADED:
+            rows = rows.filter(replies__isnull=True)
+        while True:
+            if max_batches is not None and batches >= max_batches:
+                # Handed back, the next run picks it up without waiting
+                # for the lease to run out.
+                job.status = ProjectDeletionJob.STATUS_PENDING
+                job.save(update_fields=["status", "updated_at"])
+                return batches
+            ids = list(rows.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                delete_batch(model, ids)
+                job.step = name
+                job.deleted[name] = job.deleted.get(name, 0) + len(ids)
+                job.save(update_fields=["step", "deleted", "updated_at"])
+            batches += 1
+            if progress:
+                progress(job)
+
+    with transaction.atomic():
+        # Everything below the project is gone, the collector has nothing
+        # left to cascade through.
+        Project.all_objects.filter(id=job.project_id).delete()
+        job.status = ProjectDeletionJob.STATUS_DONE
+        job.step = ""
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "step", "finished_at", "updated_at"])
+    return batches
+
+
+def delete_batch(model, ids):
+    if model is Project.members.through:
+        # Deleting the through rows directly skips m2m_changed.
+        user_ids = list(model.objects.filter(pk__in=ids).values_list("user_id", flat=True))
+        model.objects.filter(pk__in=ids).delete()
+        membership.invalidate_users(user_ids)
+        return
+    model._base_manager.filter(pk__in=ids).delete()
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects.deletion import purge_projects
+
+
+class Command(BaseCommand):
+    help = "Purges projects queued for deletion in batches, resuming interrupted jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PROJECT_PURGE_BATCH_SIZE,
+            help="Number of rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches, the next run continues where this one stopped.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(job):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{job.project_name}: {job.deleted}")
+
+        batches = purge_projects(options["batch_size"], max_batches=options["max_batches"], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"{batches} batches purged"))
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from mini_jira import cache as stats_cache
+from mini_jira.cache import HIT, MISS, STATS_KEY, get_stats, increment_stat
+from mini_jira.models import User
+
+
+MEMBERSHIP_KEY = "membership:{user_id}"
+STATS_NAMESPACE = "membership"
+LOCAL_HIT = "local_hits"
+
+
+class LocalCache:
+    """
+    Small in-process LRU cache whose entries also expire after `timeout`
+    seconds. Other processes cannot invalidate it, so the timeout bounds how
+    long they may serve a membership change made elsewhere.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class LocalCounter:
+    """
+    Counts in process and adds the count to the shared stats at most once
+    every `interval` seconds, so that counting a local hit does not cost
+    the round trip to the shared cache the hit saved.
+    """
+
+    def __init__(self, namespace, outcome, interval):
+        self.namespace = namespace
+        self.outcome = outcome
+        self.interval = interval
+        self.count = 0
+        self.flushed_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def increment(self):
+        with self.lock:
+            self.count += 1
+            if time.monotonic() - self.flushed_at < self.interval:
+                return
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            count, self.count = self.count, 0
+            self.flushed_at = time.monotonic()
+        if count:
+            increment_stat(self.namespace, self.outcome, count)
+
+
+local_cache = LocalCache(settings.MEMBERSHIP_LOCAL_CACHE_SIZE, settings.MEMBERSHIP_LOCAL_CACHE_TIMEOUT)
+local_hit_counter = LocalCounter(STATS_NAMESPACE, LOCAL_HIT, settings.MEMBERSHIP_STATS_FLUSH_INTERVAL)
+
+
+def get_cache():
+    return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+
+def get_project_ids(user_id):
+    """
+    Returns the ids of every project `user_id` is a member of, as a
+    frozenset of strings. Looked up in the local tier, then in the shared
+    cache, and only then in the database.
+    """
+    key = MEMBERSHIP_KEY.format(user_id=user_id)
+    project_ids = local_cache.get(key)
+    if project_ids is not None:
+        local_hit_counter.increment()
+        return project_ids
+
+    project_ids = get_cache().get(key)
+    if project_ids is not None:
+        increment_stat(STATS_NAMESPACE, HIT)
+    else:
+        increment_stat(STATS_NAMESPACE, MISS)
+        project_ids = frozenset(
+            str(project_id)
+            for project_id in User.projects.through.objects.filter(user_id=user_id).values_list("project_id", flat=True)
+        )
+        get_cache().set(key, project_ids, timeout=settings.MEMBERSHIP_CACHE_TIMEOUT)
+    local_cache.set(key, project_ids)
+    return project_ids
+
+
+def is_member(user_id, project_id):
+    return str(project_id) in get_project_ids(user_id)
+
+
+def delete_keys(keys):
+    for key in keys:
+        local_cache.delete(key)
+    get_cache().delete_many(keys)
+
+
+def invalidate_users(user_ids):
+    """
+    Drops the cached memberships of `user_ids`, right away so that the
+    transaction reads its own changes, and again once it commits, as a
+    request reading in between caches the memberships from before it.
+    """
+    keys = [MEMBERSHIP_KEY.format(user_id=user_id) for user_id in user_ids]
+    delete_keys(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: delete_keys(keys))
+
+
+def get_membership_stats():
+    """
+    Hit counts of both tiers. Every hit is an authorization query that
+    did not reach the database.
+    """
+    local_hit_counter.flush()
+    stats = get_stats([STATS_NAMESPACE])[STATS_NAMESPACE]
+    local_hits = stats_cache.get_cache().get(STATS_KEY.format(namespace=STATS_NAMESPACE, outcome=LOCAL_HIT), 0)
+    hits = stats[HIT] + local_hits
+    total = hits + stats[MISS]
+    return {
+        LOCAL_HIT: local_hits,
+        "shared_hits": stats[HIT],
+        MISS: stats[MISS],
+        "hit_ratio": round(hits / total, 4) if total else None,
+        "queries_saved": hits,
+    }
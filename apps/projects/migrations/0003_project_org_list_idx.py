@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_remove_projectdiscussion_created_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['organization', 'created_at', 'id'], name='project_org_list_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('organizations', '0006_alter_organization_slug'),
+        ('projects', '0003_project_org_list_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDeletionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('project_id', models.UUIDField(db_index=True)),
+                ('project_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('step', models.CharField(blank=True, default='', max_length=50)),
+                ('deleted', models.JSONField(default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_org_list_idx',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='is_pending_deletion',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_pending_deletion', False)), fields=['organization', 'created_at', 'id'], name='project_org_list_idx'),
+        ),
+        migrations.AddField(
+            model_name='projectdeletionjob',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_deletion_jobs', to='organizations.organization'),
+        ),
+        migrations.AddField(
+            model_name='projectdeletionjob',
+            name='requested_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='project_deletion_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
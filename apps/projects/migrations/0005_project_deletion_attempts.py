@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_deletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectdeletionjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,8 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 
 from organizations.models import Organization
 
-from mini_jira.models import BaseTimeStampedModel, User
+from mini_jira.models import AbstractUUIDModel, BaseTimeStampedModel, User
+from projects import membership
+
+
+class ProjectManager(models.Manager):
+    """Hides projects waiting to be purged, `Project.all_objects` still sees them."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_pending_deletion=False)
 
 
 class Project(BaseTimeStampedModel):
@@ -10,9 +18,84 @@ class Project(BaseTimeStampedModel):
     description = models.TextField()
     organization = models.ForeignKey(Organization, related_name="projects", on_delete=models.CASCADE)
     members = models.ManyToManyField(User, related_name="projects")
+    is_pending_deletion = models.BooleanField(default=False)
+
+    objects = ProjectManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["organization", "created_at", "id"],
+                condition=models.Q(is_pending_deletion=False),
+                name="project_org_list_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
     def is_collaborator(self, user):
-        return self.members.filter(id=user.id).exists()
+        return membership.is_member(user.id, self.id)
+
+    def get_members_by_username(self, usernames):
+        """Resolves `usernames` against the project members with a single query."""
+        if not usernames:
+            return {}
+        members = self.members.filter(username__in=set(usernames)).only("id", "username")
+        return {member.username: member for member in members}
+
+    def get_member_ids_by_username(self):
+        """Maps the username of every project member to the user id."""
+        return dict(self.members.values_list("username", "id"))
+
+    def request_deletion(self, user):
+        """
+        Hides the project right away and queues a job purging it in the
+        background, see `projects.deletion`.
+        """
+        with transaction.atomic():
+            self.is_pending_deletion = True
+            self.save(update_fields=["is_pending_deletion", "updated_at"])
+            return ProjectDeletionJob.objects.create(
+                project_id=self.id,
+                project_name=self.name,
+                organization_id=self.organization_id,
+                requested_by=user,
+            )
+
+
+class ProjectDeletionJob(AbstractUUIDModel):
+    STATUS_PENDING = "PENDING"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_DONE = "DONE"
+    STATUS_FAILED = "FAILED"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    # Not a foreign key, the job outlives the project it purges.
+    project_id = models.UUIDField(db_index=True)
+    project_name = models.CharField(max_length=255)
+    organization = models.ForeignKey(Organization, related_name="project_deletion_jobs", on_delete=models.CASCADE)
+    requested_by = models.ForeignKey(
+        User,
+        related_name="project_deletion_jobs",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    step = models.CharField(max_length=50, blank=True, default="")
+    deleted = models.JSONField(default=dict)
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Deletion of project {self.project_name} ({self.status})"
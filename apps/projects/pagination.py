@@ -0,0 +1,9 @@
+from django.conf import settings
+
+from mini_jira.pagination import KeysetCursorPagination
+
+
+class ProjectCursorPagination(KeysetCursorPagination):
+    ordering = ("created_at", "id")
+    page_size = settings.PROJECT_LIST_PAGE_SIZE
+    max_page_size = settings.PROJECT_LIST_MAX_PAGE_SIZE
@@ -1,26 +1,43 @@
-
 from rest_framework.permissions import IsAuthenticated
 
+from authentication import claims
 from mini_jira import constants
+from mini_jira import request_cache
 
 from projects.models import Project
 
+
+def get_user_group_name(request):
+    return request_cache.memoize(
+        request, ("user_group", request.user.pk), lambda: claims.get_user_group_name(request)
+    )
+
+
+def is_project_collaborator(request, project, user=None):
+    """`project.is_collaborator(user)`, checked once per request."""
+    user = user or request.user
+    return request_cache.memoize(
+        request, ("project_collaborator", project.pk, user.pk), lambda: project.is_collaborator(user=user)
+    )
+
+
 class ProjectCollaboratorPermission(IsAuthenticated):
     message = "Permission denied"
 
     def has_permission(self, request, view):
         method = request.method
-        user_group = request.user.groups.all().first()
 
-        if method == "DELETE" and (
-            not user_group or (user_group and user_group.name != constants.ADMIN)
-        ):
-            return False
+        if method == "DELETE":
+            if get_user_group_name(request) != constants.ADMIN:
+                return False
 
-        project = Project.objects.filter(id=view.kwargs.get("project_uuid")).first()
+        project_uuid = view.kwargs.get("project_uuid")
+        if not project_uuid:
+            return True
+        project = request_cache.get_object(request, Project.objects.all(), project_uuid)
         if not project:
             return True
 
-        if project.is_collaborator(user=request.user):
+        if is_project_collaborator(request, project):
             return True
         return False
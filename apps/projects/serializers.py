@@ -1,6 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
 
-from projects.models import Project
+from authentication import claims
+
+from projects.models import Project, ProjectDeletionJob
 
 from mini_jira.models import User
 
@@ -12,7 +15,9 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class ProjectListSerializer(serializers.ModelSerializer):
-    members = UserSerializer(many=True)
+    # Prefetched by the list view, capped to `members_limit`.
+    members = UserSerializer(source="listed_members", many=True)
+    members_count = serializers.IntegerField(read_only=True)
     created_by = serializers.StringRelatedField()
 
     class Meta:
@@ -23,19 +28,44 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "created_by",
             "created_at",
             "members",
+            "members_count",
             "updated_at"
         ]
 
 
-class ProjectCreateSerializer(serializers.ModelSerializer):
-    description = serializers.CharField(required=False, allow_blank=True)
-    members = serializers.SlugRelatedField(
-        queryset=User.objects.all(),
-        many=True,
-        slug_field="username",
+class ProjectListQuerySerializer(serializers.Serializer):
+    """`members_limit` caps the members listed per project, `members_count` always has the total."""
+    members_limit = serializers.IntegerField(
+        min_value=0,
+        max_value=settings.PROJECT_LIST_MAX_MEMBERS,
         required=False
     )
 
+
+class UsernameListField(serializers.ListField):
+    """A list of usernames, resolved to users with a single query."""
+    child = serializers.CharField()
+
+    def to_internal_value(self, data):
+        usernames = set(super().to_internal_value(data))
+        users = User.objects.filter(username__in=usernames).only("id", "username")
+        missing = usernames - {user.username for user in users}
+        if missing:
+            raise serializers.ValidationError(
+                [f"Object with username={username} does not exist." for username in sorted(missing)]
+            )
+        return list(users)
+
+    def to_representation(self, value):
+        if hasattr(value, "all"):
+            value = value.all()
+        return [user.username for user in value]
+
+
+class ProjectCreateSerializer(serializers.ModelSerializer):
+    description = serializers.CharField(required=False, allow_blank=True)
+    members = UsernameListField(required=False)
+
     class Meta:
         model = Project
         fields = [
@@ -55,10 +85,7 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         return self.context.get("request").user
 
     def get_organization_id(self, user=None):
-        if not user:
-            user = self.get_request_user()
-        org = user.organizations_organization.first()
-        return getattr(org, "id", None)
+        return claims.get_organization_id(self.context.get("request"), user)
 
     def create(self, validated_data):
         members = validated_data.pop("members", [])
@@ -66,8 +93,7 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         validated_data["created_by"] = user
         validated_data["organization_id"] = self.get_organization_id(user)
         instance = super().create(validated_data)
-        instance.members.set(members)
-        instance.members.add(user)
+        instance.members.set([*members, user])
         return instance
 
     def update(self, instance, validated_data):
@@ -77,12 +103,16 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         validated_data["organization_id"] = self.get_organization_id(user)
         instance = super().update(instance, validated_data)
         if members:
-            instance.members.clear()
-            instance.members.set(members)
-            instance.members.add(user)
+            # set() only deletes the through rows of removed members and
+            # inserts the new ones, unchanged memberships are left alone.
+            instance.members.set([*members, user])
         return instance
 
 
+class ProjectMembersSerializer(serializers.Serializer):
+    members = UsernameListField(allow_empty=False, max_length=settings.PROJECT_MEMBERS_MAX_ITEMS)
+
+
 class ProjectDetailSerializer(serializers.ModelSerializer):
     members = UserSerializer(many=True)
     created_by = serializers.StringRelatedField()
@@ -110,10 +140,7 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         return self.context.get("request").user
 
     def get_organization_id(self, user=None):
-        if not user:
-            user = self.get_request_user()
-        org = user.organizations_organization.first()
-        return getattr(org, "id", None)
+        return claims.get_organization_id(self.context.get("request"), user)
 
     def create(self, validated_data):
         user = self.get_request_user()
@@ -126,3 +153,21 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
     #         setattr(instance, attr, value)
     #     instance.save()
     #     return instance
+
+
+class ProjectDeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectDeletionJob
+        fields = [
+            "id",
+            "project_id",
+            "project_name",
+            "status",
+            "step",
+            "deleted",
+            "error",
+            "attempts",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
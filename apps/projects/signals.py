@@ -0,0 +1,66 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.utils import timezone
+
+from mini_jira.cache import bump_generation
+from projects import membership
+from projects.models import Project
+
+
+def get_changed_project_ids(instance, action, reverse, pk_set):
+    """
+    Returns the ids of the projects whose membership an m2m_changed signal
+    on Project.members touched, or None for the pre_* half of the change.
+    """
+    if not reverse:
+        return [instance.id] if action.startswith("post_") else None
+    # user.projects.clear() does not report pk_set, so the user's projects
+    # are remembered before the rows go away.
+    if action == "pre_clear":
+        instance._cleared_project_ids = list(instance.projects.values_list("id", flat=True))
+        return None
+    if action == "post_clear":
+        return instance.__dict__.pop("_cleared_project_ids", [])
+    return pk_set if action.startswith("post_") else None
+
+
+def get_changed_user_ids(instance, action, reverse, pk_set):
+    """Like `get_changed_project_ids`, for the users whose membership changed."""
+    if reverse:
+        return [instance.pk] if action.startswith("post_") else None
+    if action == "pre_clear":
+        instance._cleared_member_ids = list(instance.members.values_list("id", flat=True))
+        return None
+    if action == "post_clear":
+        return instance.__dict__.pop("_cleared_member_ids", [])
+    return pk_set if action.startswith("post_") else None
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_update_handler(sender, instance, **kwargs):
+    bump_generation(instance.id)
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_handler(sender, instance, action, reverse, pk_set, **kwargs):
+    project_ids = get_changed_project_ids(instance, action, reverse, pk_set) or []
+    if project_ids:
+        # Members are rendered with the project, its validators must move too.
+        Project.all_objects.filter(id__in=project_ids).update(updated_at=timezone.now())
+    for project_id in project_ids:
+        bump_generation(project_id)
+    user_ids = get_changed_user_ids(instance, action, reverse, pk_set)
+    if user_ids:
+        membership.invalidate_users(user_ids)
+
+
+@receiver(pre_delete, sender=Project)
+def project_pre_delete_handler(sender, instance, **kwargs):
+    # The membership rows are gone by the time post_delete runs.
+    instance._deleted_member_ids = list(instance.members.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Project)
+def project_members_delete_handler(sender, instance, **kwargs):
+    membership.invalidate_users(instance.__dict__.pop("_deleted_member_ids", []))
@@ -69,7 +69,8 @@ def test_project_list(api_client, user):
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert isinstance(response.data, list)
+    assert isinstance(response.data["results"], list)
+    assert response.data["next"] is None
 
 
 # Test Case 2: Create Project
@@ -143,7 +144,8 @@ def test_project_delete(api_client, user, project):
     url = reverse("project_detail", kwargs={"uuid": project.id})
     response = api_client.delete(url)
 
-    assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["status"] == "PENDING"
     assert Project.objects.filter(id=project.id).count() == 0
 
 
@@ -155,3 +157,343 @@ def test_project_delete_not_found(api_client, user):
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data["detail"] == "Project not found."
+
+
+# Test Case 9: Get Project Detail answers 304 while the project is unchanged
+@pytest.mark.django_db
+def test_project_detail_conditional_get(api_client, user, project):
+    url = reverse("project_detail", kwargs={"uuid": project.id})
+    etag = api_client.get(url)["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    api_client.put(url, {"name": "Renamed"}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Member changes are rendered too and move the validators.
+    project.members.add(user)
+    etag = api_client.get(url)["ETag"]
+    User.objects.create_user(username="newcomer", email="newcomer@example.com", password="password123")
+    api_client.post(reverse("project_members_add", kwargs={"project_uuid": project.id}), {"members": ["newcomer"]}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert "newcomer" in [member["username"] for member in response.data["members"]]
+
+
+# Test Case 10: List Projects answers 304 while no project changed
+@pytest.mark.django_db
+def test_project_list_conditional_get(api_client, user, project):
+    url = reverse("project_list")
+    etag = api_client.get(url)["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    api_client.post(reverse("project_create"), {"name": "Another"}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+# Test Case 11: Get Project Detail cache is invalidated by membership changes
+@pytest.mark.django_db
+def test_project_detail_response_cache(api_client, user, project):
+    url = reverse("project_detail", kwargs={"uuid": project.id})
+    assert [member["username"] for member in api_client.get(url).data["members"]] == ["janedoe"]
+
+    project.members.add(user)
+    usernames = [member["username"] for member in api_client.get(url).data["members"]]
+    assert sorted(usernames) == ["janedoe", "johndoe"]
+
+    user.projects.clear()
+    assert [member["username"] for member in api_client.get(url).data["members"]] == ["janedoe"]
+
+
+# Test Case 12: Cache statistics are restricted to admins
+@pytest.mark.django_db
+def test_cache_stats_admin_only(api_client, user, member_user):
+    response = api_client.get(reverse("cache_stats"))
+    assert response.status_code == status.HTTP_200_OK
+    assert "project_detail" in response.data["responses"]
+
+    api_client.force_authenticate(user=member_user)
+    response = api_client.get(reverse("cache_stats"))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+
+# Test Case 13: Membership checks are served from the cache and invalidated by membership changes
+@pytest.mark.django_db
+def test_membership_cache(user, member_user, project, django_capture_on_commit_callbacks):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from projects import membership
+
+    project.members.set([user])
+    assert project.is_collaborator(user)
+    with CaptureQueriesContext(connection) as context:
+        assert project.is_collaborator(user)
+        membership.local_cache.clear()
+        assert project.is_collaborator(user)
+    assert len(context.captured_queries) == 0
+
+    assert not project.is_collaborator(member_user)
+    project.members.add(member_user)
+    assert project.is_collaborator(member_user)
+    member_user.projects.remove(project)
+    assert not project.is_collaborator(member_user)
+    user.projects.clear()
+    assert not project.is_collaborator(user)
+
+    project.members.add(user)
+    assert project.is_collaborator(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        project.members.remove(user)
+        # A request reading before the commit caches the old memberships.
+        membership.get_cache().set(membership.MEMBERSHIP_KEY.format(user_id=user.id), frozenset([str(project.id)]))
+    assert not project.is_collaborator(user)
+
+    project.members.add(user)
+    assert project.is_collaborator(user)
+    project.delete()
+    assert not project.is_collaborator(user)
+    assert membership.get_membership_stats()["queries_saved"] >= 2
+
+
+# Test Case 14: List Projects is scoped to the caller and caps the listed members
+@pytest.mark.django_db
+def test_project_list_scope(api_client, user, member_user, organization, project):
+    project.members.add(user)
+    other_organization = Organization.objects.create(name="other_org")
+    Project.objects.create(name="Elsewhere", description="", created_by=user, organization=other_organization)
+    own = Project.objects.create(name="Own", description="", created_by=user, organization=organization)
+    url = reverse("project_list")
+
+    response = api_client.get(url, {"members_limit": 1})
+    results = {row["name"]: row for row in response.data["results"]}
+    assert sorted(results) == ["Own", "Test Project"]
+    assert results["Test Project"]["members_count"] == 2
+    assert [member["username"] for member in results["Test Project"]["members"]] == ["janedoe"]
+    assert results["Own"]["members"] == [] and results["Own"]["members_count"] == 0
+
+    api_client.force_authenticate(user=member_user)
+    response = api_client.get(url)
+    assert [row["name"] for row in response.data["results"]] == ["Test Project"]
+    assert len(response.data["results"][0]["members"]) == 2
+    assert api_client.get(url, {"members_limit": -1}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 15: List Projects stays within its query budget regardless of project and member count
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1, 300])
+def test_project_list_query_budget(api_client, user, member_user, organization, rows):
+    from authentication.serializers import ClaimsTokenObtainPairSerializer
+    from mini_jira.testing import assert_query_budget
+    from projects.views import ProjectListView
+
+    projects = Project.objects.bulk_create([
+        Project(name=f"Project {i}", description="", created_by=user, organization=organization)
+        for i in range(rows)
+    ])
+    Project.members.through.objects.bulk_create([
+        Project.members.through(project=project, user=member)
+        for project in projects
+        for member in (user, member_user)
+    ])
+
+    for client_user in (user, member_user):
+        token = ClaimsTokenObtainPairSerializer.get_token(client_user).access_token
+        api_client.force_authenticate(user=client_user, token=token)
+        with assert_query_budget(ProjectListView, "GET"):
+            response = api_client.get(reverse("project_list"), {"members_limit": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == min(rows, 50)
+        assert response.data["results"][0]["members_count"] == 2
+
+
+# Test Case 16: Updating Project members only touches the changed memberships
+@pytest.mark.django_db
+def test_project_update_members_diff(api_client, user, member_user, organization, project):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    users = User.objects.bulk_create([
+        User(username=f"user{i}", email=f"user{i}@example.com") for i in range(300)
+    ])
+    project.members.add(user, *users)
+    usernames = [member.username for member in users[1:]] + ["janedoe", "newcomer"]
+    User.objects.create_user(username="newcomer", email="newcomer@example.com", password="password123")
+
+    url = reverse("project_detail", kwargs={"uuid": project.id})
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.put(url, {"members": usernames}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["members"]) == 302
+    member_queries = [query["sql"] for query in context.captured_queries if '"projects_project_members"' in query["sql"]]
+    assert len([sql for sql in member_queries if sql.startswith("INSERT")]) == 1
+    assert len([sql for sql in member_queries if sql.startswith("DELETE")]) == 1
+    assert len([query for query in context.captured_queries if '"accounts_user"."username" IN' in query["sql"]]) == 1
+    assert not project.members.filter(username="user0").exists()
+
+    response = api_client.put(url, {"members": ["janedoe", "nobody"]}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 17: Add and remove Project members without resending the member list
+@pytest.mark.django_db
+def test_project_members_add_remove(api_client, user, member_user, project):
+    other = User.objects.create_user(username="other", email="other@example.com", password="password123")
+    add_url = reverse("project_members_add", kwargs={"project_uuid": project.id})
+    remove_url = reverse("project_members_remove", kwargs={"project_uuid": project.id})
+    project.members.add(user)
+
+    response = api_client.post(add_url, {"members": ["other", "janedoe"]}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["added"] == ["other"]
+    assert project.is_collaborator(other)
+
+    response = api_client.post(remove_url, {"members": ["other"]}, format="json")
+    assert response.data["removed"] == ["other"]
+    assert not project.is_collaborator(other)
+    assert sorted(project.members.values_list("username", flat=True)) == ["janedoe", "johndoe"]
+
+    response = api_client.post(add_url, {"members": ["ghost"]}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(remove_url, {"members": []}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 18: Deleted Projects are hidden at once and purged in batches by the worker
+@pytest.mark.django_db
+def test_project_deletion_purge(api_client, user, member_user, project):
+    import io
+    from django.core.management import call_command
+    from collaborations.models import ProjectInvitation
+    from tasks.models import CommentReadReceipt, Task, TaskComment, TaskCounter, TaskDiscussion, TaskDiscussionMessage
+
+    project.members.add(user)
+    tasks = [
+        Task.objects.create(title=f"Task {i}", project=project, created_by=user, modified_by=user)
+        for i in range(3)
+    ]
+    comment = TaskComment.objects.create(task=tasks[0], content="Comment", created_by=user)
+    TaskComment.objects.create(task=tasks[0], content="Reply", reply_of=comment, created_by=user)
+    comment.mark_as_read(user)
+    discussion = TaskDiscussion.objects.create(task=tasks[1], title="Design", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Message", created_by=user)
+    ProjectInvitation.objects.create(project=project, inviter=user, email="invitee@example.com")
+
+    job = api_client.delete(reverse("project_detail", kwargs={"uuid": project.id})).data
+    assert api_client.get(reverse("project_detail", kwargs={"uuid": project.id})).status_code == status.HTTP_404_NOT_FOUND
+    assert api_client.get(reverse("task_detail", kwargs={"uuid": tasks[0].id})).status_code == status.HTTP_404_NOT_FOUND
+    assert api_client.get(reverse("project_list")).data["results"] == []
+
+    # Stops early, the next run picks the job up where this one stopped.
+    call_command("purge_projects", "--batch-size", "1", "--max-batches", "3", stdout=io.StringIO())
+    status_url = reverse("project_deletion_status", kwargs={"uuid": job["id"]})
+    response = api_client.get(status_url)
+    assert response.data["status"] == "PENDING"
+    assert sum(response.data["deleted"].values()) == 3
+
+    call_command("purge_projects", "--batch-size", "2", stdout=io.StringIO())
+    response = api_client.get(status_url)
+    assert response.data["status"] == "DONE"
+    assert response.data["deleted"]["tasks"] == 3
+    assert not Project.all_objects.filter(id=project.id).exists()
+    for model in (Task, TaskComment, CommentReadReceipt, TaskDiscussion, TaskDiscussionMessage, TaskCounter, ProjectInvitation):
+        assert not model.objects.exists()
+    assert not project.is_collaborator(user)
+
+    api_client.force_authenticate(user=member_user)
+    assert api_client.get(status_url).status_code == status.HTTP_404_NOT_FOUND
+
+
+# Test Case 19: A failing deletion job does not hold up the others and is retried a limited number of times
+@pytest.mark.django_db
+def test_project_deletion_purge_failures(user, project, organization, monkeypatch):
+    import datetime
+    from django.test.utils import override_settings
+    from django.utils import timezone
+    from projects import deletion
+    from projects.models import ProjectDeletionJob
+    from tasks.models import Task
+
+    Task.objects.create(title="Task", project=project, created_by=user, modified_by=user)
+    other = Project.objects.create(name="Other Project", created_by=user, modified_by=user, organization=organization)
+    failing_job = project.request_deletion(user)
+    other_job = other.request_deletion(user)
+
+    delete_batch = deletion.delete_batch
+
+    def failing_delete_batch(model, ids):
+        if model is Task:
+            raise RuntimeError("Task table is locked")
+        delete_batch(model, ids)
+
+    monkeypatch.setattr(deletion, "delete_batch", failing_delete_batch)
+
+    with override_settings(PROJECT_PURGE_MAX_ATTEMPTS=2):
+        deletion.purge_projects(batch_size=10)
+        failing_job.refresh_from_db()
+        other_job.refresh_from_db()
+        assert failing_job.status == ProjectDeletionJob.STATUS_FAILED
+        assert failing_job.error == "Task table is locked"
+        assert failing_job.attempts == 1
+        assert other_job.status == ProjectDeletionJob.STATUS_DONE
+
+        deletion.purge_projects(batch_size=10)
+        failing_job.refresh_from_db()
+        assert failing_job.attempts == 2
+
+        # Out of attempts, left alone from now on.
+        assert deletion.purge_projects(batch_size=10) == 0
+        failing_job.refresh_from_db()
+        assert failing_job.attempts == 2
+
+    # A running job belongs to its worker until it stops reporting progress.
+    monkeypatch.setattr(deletion, "delete_batch", delete_batch)
+    ProjectDeletionJob.objects.filter(id=failing_job.id).update(
+        status=ProjectDeletionJob.STATUS_RUNNING, updated_at=timezone.now()
+    )
+    assert deletion.claim_job(set()) is None
+    ProjectDeletionJob.objects.filter(id=failing_job.id).update(
+        updated_at=timezone.now() - datetime.timedelta(hours=1)
+    )
+    deletion.purge_projects(batch_size=10)
+    failing_job.refresh_from_db()
+    assert failing_job.status == ProjectDeletionJob.STATUS_DONE
+    assert not Project.all_objects.filter(id=project.id).exists()
+
+
+# Test Case 20: Purging reply threads never deletes more rows than the batch size
+@pytest.mark.django_db
+def test_project_deletion_purge_threads(user, project):
+    from projects import deletion
+    from projects.models import ProjectDeletionJob
+    from tasks.models import Task, TaskComment, TaskDiscussion, TaskDiscussionMessage
+
+    task = Task.objects.create(title="Task", project=project, created_by=user, modified_by=user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Design", created_by=user)
+    comment, message = None, None
+    for i in range(4):
+        comment = TaskComment.objects.create(task=task, content=f"Comment {i}", reply_of=comment, created_by=user)
+        message = TaskDiscussionMessage.objects.create(
+            discussion=discussion, text=f"Message {i}", reply_of=message, created_by=user
+        )
+    job = project.request_deletion(user)
+
+    counts = [(TaskComment.objects.count(), TaskDiscussionMessage.objects.count())]
+
+    def progress(job):
+        counts.append((TaskComment.objects.count(), TaskDiscussionMessage.objects.count()))
+
+    deletion.purge_projects(batch_size=1, progress=progress)
+    for before, after in zip(counts, counts[1:]):
+        assert sum(before) - sum(after) <= 1
+    assert counts[-1] == (0, 0)
+    job.refresh_from_db()
+    assert job.status == ProjectDeletionJob.STATUS_DONE
+    assert job.deleted["comments"] == 4
+    assert job.deleted["messages"] == 4
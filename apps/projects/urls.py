@@ -1,10 +1,20 @@
 from django.urls import path
 
-from projects.views import ProjectListView, ProjectDetailView, ProjectCreateView
+from projects.views import (
+    ProjectListView,
+    ProjectDetailView,
+    ProjectCreateView,
+    ProjectMembersAddView,
+    ProjectMembersRemoveView,
+    ProjectDeletionJobView
+)
 
 
 urlpatterns = [
     path("list/", ProjectListView.as_view(), name="project_list"),
     path("create/", ProjectCreateView.as_view(), name="project_create"),
     path("detail/<uuid:uuid>", ProjectDetailView.as_view(), name="project_detail"),
+    path("members/add/<uuid:project_uuid>", ProjectMembersAddView.as_view(), name="project_members_add"),
+    path("members/remove/<uuid:project_uuid>", ProjectMembersRemoveView.as_view(), name="project_members_remove"),
+    path("deletion/<uuid:uuid>", ProjectDeletionJobView.as_view(), name="project_deletion_status"),
 ]
@@ -1,20 +1,78 @@
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import status
-from rest_framework.generics import ListAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from projects.models import Project
-from projects.serializers import ProjectListSerializer, ProjectCreateSerializer, ProjectDetailSerializer
-from projects.permissions import ProjectCollaboratorPermission
+from authentication import claims
+from authentication.authentication import StatelessJWTAuthentication
+from mini_jira import constants, request_cache
+from mini_jira.cache import ResponseCache
+from mini_jira.conditional import (
+    get_list_validators,
+    get_object_validators,
+    get_not_modified_response,
+    set_validators
+)
+from mini_jira.models import User
+from projects.models import Project, ProjectDeletionJob
+from projects.pagination import ProjectCursorPagination
+from projects.serializers import (
+    ProjectListSerializer,
+    ProjectListQuerySerializer,
+    ProjectCreateSerializer,
+    ProjectDetailSerializer,
+    ProjectMembersSerializer,
+    ProjectDeletionJobSerializer
+)
+from projects.permissions import ProjectCollaboratorPermission, get_user_group_name
 
 
-class ProjectListView(ListAPIView):
+project_detail_cache = ResponseCache("project_detail")
+
+
+class ProjectListView(APIView):
     permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    pagination_class = ProjectCursorPagination
+    query_budgets = {"GET": 3}
+
+    def get_queryset(self, request):
+        """Projects of the caller's organization for admins, otherwise the caller's own projects."""
+        if get_user_group_name(request) == constants.ADMIN:
+            return Project.objects.filter(organization_id=claims.get_organization_id(request))
+        # A subquery rather than a join on members, which would also
+        # restrict the members counted below to the caller.
+        return Project.objects.filter(
+            id__in=Project.members.through.objects.filter(user_id=request.user.id).values("project_id")
+        )
 
     def get(self, request):
-        projects = Project.objects.all()
-        serializer = ProjectListSerializer(projects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        query = ProjectListQuerySerializer(data=request.query_params.dict())
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        projects = self.get_queryset(request)
+        etag, last_modified = get_list_validators(request, projects)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+
+        members = User.objects.only("id", "username").order_by("username", "id")
+        members_limit = query.validated_data.get("members_limit")
+        if members_limit is not None:
+            members = members[:members_limit]
+        members_count = Project.members.through.objects.filter(
+            project_id=OuterRef("pk")
+        ).order_by().values("project_id").annotate(count=Count("*")).values("count")
+        projects = projects.select_related("created_by").annotate(
+            members_count=Coalesce(Subquery(members_count), 0)
+        ).prefetch_related(Prefetch("members", queryset=members, to_attr="listed_members"))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(projects, request, view=self)
+        serializer = ProjectListSerializer(page, many=True)
+        return set_validators(paginator.get_paginated_response(serializer.data), etag, last_modified)
 
 
 class ProjectCreateView(APIView):
@@ -32,16 +90,19 @@ class ProjectDetailView(APIView):
     permission_classes = [ProjectCollaboratorPermission,]
 
     def get_object(self, uuid):
-        try:
-            return Project.objects.get(id=uuid)
-        except Project.DoesNotExist:
-            return None
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
 
     def get(self, request, uuid):
         instance = self.get_object(uuid)
         if instance:
-            serializer = ProjectDetailSerializer(instance)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            etag, last_modified = get_object_validators(request, instance)
+            not_modified = get_not_modified_response(request, etag, last_modified)
+            if not_modified:
+                return not_modified
+            data = project_detail_cache.get(request, instance.id)
+            if data is None:
+                data = project_detail_cache.set(request, instance.id, ProjectDetailSerializer(instance).data)
+            return set_validators(Response(data, status=status.HTTP_200_OK), etag, last_modified)
         return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
 
     def put(self, request, uuid):
@@ -62,8 +123,73 @@ class ProjectDetailView(APIView):
     def delete(self, request, uuid):
         instance = self.get_object(uuid)
         if instance:
-            instance.delete()
-            return Response(status=status.HTTP_200_OK)
+            job = instance.request_deletion(request.user)
+            return Response(ProjectDeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
         return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
 
 
+class ProjectMembersAddView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def post(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = ProjectMembersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        users = serializer.validated_data["members"]
+        existing = set(project.members.filter(id__in=[user.id for user in users]).values_list("id", flat=True))
+        added = [user for user in users if user.id not in existing]
+        if added:
+            project.members.add(*added)
+        return Response({"added": sorted(user.username for user in added)}, status=status.HTTP_200_OK)
+
+
+class ProjectMembersRemoveView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def post(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = ProjectMembersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        users = serializer.validated_data["members"]
+        existing = set(project.members.filter(id__in=[user.id for user in users]).values_list("id", flat=True))
+        removed = [user for user in users if user.id in existing]
+        if removed:
+            project.members.remove(*removed)
+        return Response({"removed": sorted(user.username for user in removed)}, status=status.HTTP_200_OK)
+
+
+class ProjectDeletionJobView(APIView):
+    """Progress of a project deletion, visible to the requester and the organization's admins."""
+
+    def get_object(self, uuid):
+        job = ProjectDeletionJob.objects.filter(id=uuid).first()
+        if not job:
+            return None
+        if job.requested_by_id == self.request.user.id:
+            return job
+        if (
+            get_user_group_name(self.request) == constants.ADMIN
+            and job.organization_id == claims.get_organization_id(self.request)
+        ):
+            return job
+        return None
+
+    def get(self, request, uuid):
+        job = self.get_object(uuid)
+        if job:
+            return Response(ProjectDeletionJobSerializer(job).data, status=status.HTTP_200_OK)
+        return Response({"detail": "Deletion job not found."}, status=status.HTTP_404_NOT_FOUND)
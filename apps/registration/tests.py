@@ -113,3 +113,55 @@ def test_register_organization_missing_data(api_client):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "name" in response.data
+
+
+# Test Case 5: Issued tokens carry role claims and stop working once the role changes
+@pytest.mark.django_db
+def test_token_claims(api_client, valid_user_data, organization):
+    from mini_jira.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    api_client.post(reverse("register_user"), valid_user_data, format="json")
+    credentials = {"username": "johndoe", "password": "password123"}
+    tokens = api_client.post(reverse("generate_token"), credentials, format="json").data
+
+    access = AccessToken(tokens["access"])
+    assert access["group"] == constants.ADMIN
+    assert access["organization"] == organization.id
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert api_client.get(reverse("cache_stats")).status_code == status.HTTP_200_OK
+
+    User.objects.get(username="johndoe").groups.set([Group.objects.get(name=constants.MEMBER)])
+    assert api_client.get(reverse("cache_stats")).status_code == status.HTTP_401_UNAUTHORIZED
+    response = api_client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]}, format="json")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    tokens = api_client.post(reverse("generate_token"), credentials, format="json").data
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert api_client.get(reverse("cache_stats")).status_code == status.HTTP_403_FORBIDDEN
+
+
+# Test Case 6: Deactivating a user rejects their tokens on endpoints that never load the user
+@pytest.mark.django_db
+def test_token_rejected_after_deactivation(api_client, valid_user_data, organization):
+    import uuid
+    from mini_jira.models import User
+
+    api_client.post(reverse("register_user"), valid_user_data, format="json")
+    credentials = {"username": "johndoe", "password": "password123"}
+    tokens = api_client.post(reverse("generate_token"), credentials, format="json").data
+    url = reverse("archived_task_list", kwargs={"project_uuid": uuid.uuid4()})
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    user = User.objects.get(username="johndoe")
+    user.is_active = False
+    user.save()
+    assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Saving again keeps the bumped version.
+    user.first_name = "Johnny"
+    user.save()
+    assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+from django.core import serializers
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from mini_jira.cache import bump_generation
+from mini_jira.models import User
+from tasks import counters, search
+from tasks.models import (
+    ArchivedTask,
+    CommentReadReceipt,
+    Task,
+    TaskComment,
+    TaskDiscussion,
+    TaskDiscussionMessage,
+    TaskReadWatermark
+)
+
+
+# Payload sections in the order they are restored.
+SECTIONS = [
+    ("task", Task, "id"),
+    ("comments", TaskComment, "task_id"),
+    ("read_receipts", CommentReadReceipt, "task_comment__task_id"),
+    ("read_watermarks", TaskReadWatermark, "task_id"),
+    ("discussions", TaskDiscussion, "task_id"),
+    ("messages", TaskDiscussionMessage, "discussion__task_id"),
+]
+
+USER_FIELDS = ["created_by", "modified_by", "assignee", "user"]
+
+
+def get_archivable_tasks(retention_days):
+    """Soft-deleted tasks, and tasks left DONE since before the retention window."""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return Task.objects.filter(
+        Q(is_active=False) | Q(status=Task.STATUS_DONE, updated_at__lt=cutoff)
+    )
+
+
+def archive_tasks(retention_days, batch_size, max_batches=None, progress=None):
+    """
+    Moves archivable tasks into ArchivedTask `batch_size` tasks at a time,
+    every batch in its own transaction. Returns the number of archived tasks.
+    """
+    archived, batches = 0, 0
+    candidates = get_archivable_tasks(retention_days).order_by("updated_at", "id")
+    while max_batches is None or batches < max_batches:
+        ids = list(candidates.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        archived += archive_batch(ids, retention_days)
+        batches += 1
+        if progress:
+            progress(archived)
+    return archived
+
+
+def archive_batch(task_ids, retention_days):
+    with transaction.atomic():
+        # Checked again under the lock, a task reactivated or reopened since
+        # it was picked stays where it is.
+        tasks = list(get_archivable_tasks(retention_days).select_for_update().filter(id__in=task_ids))
+        task_ids = [task.id for task in tasks]
+        payloads = {task.id: {name: [] for name, _, _ in SECTIONS} for task in tasks}
+        for name, model, task_lookup in SECTIONS:
+            objects = model._base_manager.filter(**{f"{task_lookup}__in": task_ids}).annotate(
+                archived_task_id=F(task_lookup)
+            ).order_by("pk")
+            for instance in objects:
+                payloads[instance.archived_task_id][name].extend(serializers.serialize("python", [instance]))
+
+        ArchivedTask.objects.bulk_create([
+            ArchivedTask(
+                id=task.id,
+                project_id=task.project_id,
+                title=task.title,
+                status=task.status,
+                reason=ArchivedTask.REASON_DONE if task.is_active else ArchivedTask.REASON_INACTIVE,
+                payload=payloads[task.id],
+            )
+            for task in tasks
+        ])
+        # Cascades to every archived child row and to the search entries,
+        # the task delete handler updates the counters and response cache.
+        Task.objects.filter(id__in=task_ids).delete()
+    return len(tasks)
+
+
+def restore_task(archived_task, user):
+    """
+    Recreates an archived task and its children as an active task and
+    drops the archive row. References to users deleted in the meantime
+    are cleared, or handed to `user` where a value is required.
+    """
+    payload = archived_task.payload
+    user_ids = {
+        record["fields"].get(field)
+        for name, _, _ in SECTIONS
+        for record in payload.get(name, [])
+        for field in USER_FIELDS
+    }
+    existing = set(User.objects.filter(id__in=user_ids - {None}).values_list("id", flat=True))
+
+    with transaction.atomic():
+        for name, _, _ in SECTIONS:
+            records = []
+            for record in payload.get(name, []):
+                fields = record["fields"]
+                if "user" in fields and fields["user"] not in existing:
+                    # Read receipts and watermarks of deleted users are dropped.
+                    continue
+                for field in USER_FIELDS:
+                    if fields.get(field) is not None and fields[field] not in existing:
+                        fields[field] = user.id if field == "created_by" else None
+                records.append(record)
+            for restored in serializers.deserialize("python", records):
+                restored.save()
+
+        # Deserialized objects are saved raw, which the counter and search
+        # receivers skip, so both are brought up to date here.
+        # The old updated_at would have the next archive run take a
+        # restored DONE task straight back.
+        Task.objects.filter(id=archived_task.id).update(is_active=True, updated_at=timezone.now())
+        task = Task.objects.get(id=archived_task.id)
+        counters.apply_counter_deltas(counters.get_counter_deltas(None, task.get_counter_state()))
+        search.index_task(task)
+        for comment in TaskComment.objects.filter(task=task):
+            search.index_comment(comment)
+        for message in TaskDiscussionMessage.objects.filter(discussion__task=task):
+            search.index_message(message)
+        archived_task.delete()
+    bump_generation(task.project_id)
+    return task
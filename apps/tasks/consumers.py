@@ -2,6 +2,7 @@ from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
 from mini_jira.models import User
+from projects import membership
 
 from tasks.models import TaskComment, TaskDiscussionMessage
 from tasks.serializers import CommentSerializer, TaskDiscussionMessageSerializer
@@ -128,3 +129,50 @@ class TaskUpdateConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event)
 
 
+class ProjectUpdateConsumer(AsyncJsonWebsocketConsumer):
+    GROUP_NAME = "project_{project_uuid}_group"
+
+    EVENT_TYPE_TASKS_CREATED = "tasks_created"
+    EVENT_TYPE_TASKS_UPDATED = "tasks_updated"
+    EVENT_TYPE_TASKS_IMPORTED = "tasks_imported"
+
+    @classmethod
+    def get_group_name(cls, uuid):
+        return cls.GROUP_NAME.format(project_uuid=uuid)
+
+    async def connect(self):
+        self.uuid = self.scope["url_route"]["kwargs"]["uuid"]
+        self.room_group_name = self.get_group_name(self.uuid)
+
+        # Project events carry task ids and assignees, only members may listen.
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated or not await self.is_member(user.id):
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(
+            self.room_group_name,
+            self.channel_name
+        )
+
+        await self.accept()
+
+    @database_sync_to_async
+    def is_member(self, user_id):
+        return membership.is_member(user_id, self.uuid)
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(
+            self.room_group_name,
+            self.channel_name
+        )
+
+    async def tasks_created(self, event):
+        await self.send_json(event)
+
+    async def tasks_updated(self, event):
+        await self.send_json(event)
+
+    async def tasks_imported(self, event):
+        await self.send_json(event)
+
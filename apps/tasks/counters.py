@@ -0,0 +1,163 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from mini_jira.models import User
+from tasks.models import Task, TaskCounter
+
+
+def get_counter_keys(state):
+    """Returns the (dimension, key) pairs a task with the given field values is counted in."""
+    if not state or not state["is_active"]:
+        return []
+    keys = [
+        (TaskCounter.DIMENSION_TOTAL, ""),
+        (TaskCounter.DIMENSION_STATUS, state["status"]),
+        (TaskCounter.DIMENSION_PRIORITY, state["priority"] or ""),
+        (TaskCounter.DIMENSION_ASSIGNEE, str(state["assignee_id"] or "")),
+    ]
+    # Open tasks are bucketed by due day, a task becomes overdue once its
+    # bucket is in the past without any write to the task itself.
+    if state["due_date"] and state["status"] != Task.STATUS_DONE and not state["completed"]:
+        keys.append((TaskCounter.DIMENSION_DUE, get_due_key(state["due_date"])))
+    return keys
+
+
+def get_due_key(due_date):
+    return timezone.localtime(due_date).date().isoformat()
+
+
+def get_counter_deltas(old_state, new_state):
+    """Returns {(project_id, dimension, key): delta} for a task moving from `old_state` to `new_state`."""
+    deltas = Counter()
+    if old_state:
+        for dimension, key in get_counter_keys(old_state):
+            deltas[(old_state["project_id"], dimension, key)] -= 1
+    if new_state:
+        for dimension, key in get_counter_keys(new_state):
+            deltas[(new_state["project_id"], dimension, key)] += 1
+    return deltas
+
+
+def apply_counter_deltas(deltas):
+    """Applies {(project_id, dimension, key): delta} with one INSERT and one UPDATE."""
+    deltas = {counter: delta for counter, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Missing rows are created at zero so every delta is applied by the same
+    # UPDATE. A decrement of a missing row is drift (or a project being
+    # deleted) and is left to the reconciliation command.
+    TaskCounter.objects.bulk_create(
+        [
+            TaskCounter(project_id=project_id, dimension=dimension, key=key, count=0)
+            for (project_id, dimension, key), delta in deltas.items()
+            if delta > 0
+        ],
+        ignore_conflicts=True
+    )
+    conditions = [
+        (Q(project_id=project_id, dimension=dimension, key=key), delta)
+        for (project_id, dimension, key), delta in deltas.items()
+    ]
+    TaskCounter.objects.filter(reduce(or_, [condition for condition, _ in conditions])).update(
+        count=F("count") + Case(
+            *[When(condition, then=Value(delta)) for condition, delta in conditions],
+            default=Value(0)
+        )
+    )
+
+
+def get_summary(project):
+    """Builds the board summary of `project` from its counters."""
+    summary = {
+        "total": 0,
+        "status": {choice: 0 for choice, _ in Task.STATUS_CHOICES},
+        "priority": {choice: 0 for choice, _ in Task.PRIORITY_CHOICES},
+        "assignee": {},
+        "overdue": 0,
+    }
+    today = timezone.localdate().isoformat()
+    assignees = {}
+    for dimension, key, count in TaskCounter.objects.filter(project=project).values_list(
+        "dimension", "key", "count"
+    ):
+        if not count:
+            continue
+        if dimension == TaskCounter.DIMENSION_TOTAL:
+            summary["total"] = count
+        elif dimension == TaskCounter.DIMENSION_STATUS:
+            summary["status"][key] = count
+        elif dimension == TaskCounter.DIMENSION_PRIORITY:
+            summary["priority"][key or "none"] = count
+        elif dimension == TaskCounter.DIMENSION_ASSIGNEE:
+            assignees[key] = count
+        elif dimension == TaskCounter.DIMENSION_DUE and key < today:
+            summary["overdue"] += count
+
+    # Users removed since their tasks were counted fall back to "unassigned".
+    usernames = dict(
+        User.objects.filter(id__in=[int(key) for key in assignees if key]).values_list("id", "username")
+    ) if any(assignees) else {}
+    for key, count in assignees.items():
+        username = usernames.get(int(key), "unassigned") if key else "unassigned"
+        summary["assignee"][username] = summary["assignee"].get(username, 0) + count
+    return summary
+
+
+def reconcile_counters(batch_size, fix=True, progress=None):
+    """
+    Recomputes every project's counters from the task table in batches of
+    `batch_size` rows and compares them with the stored ones.
+
+    Returns the drift as a list of (project_id, dimension, key, stored, actual)
+    tuples. With `fix`, the stored counters of drifted projects are replaced.
+    """
+    drift = []
+    seen = set()
+    project_id, actual = None, Counter()
+    rows = Task.objects.filter(is_active=True).order_by("project_id").values_list(*Task.COUNTER_FIELDS)
+    for count, row in enumerate(rows.iterator(chunk_size=batch_size), start=1):
+        state = dict(zip(Task.COUNTER_FIELDS, row))
+        if state["project_id"] != project_id:
+            if project_id is not None:
+                drift.extend(reconcile_project(project_id, actual, fix))
+                seen.add(project_id)
+            project_id, actual = state["project_id"], Counter()
+        actual.update(get_counter_keys(state))
+        if progress and count % batch_size == 0:
+            progress(count)
+    if project_id is not None:
+        drift.extend(reconcile_project(project_id, actual, fix))
+        seen.add(project_id)
+
+    stale = TaskCounter.objects.exclude(count=0).exclude(project_id__in=seen)
+    for stale_project_id in stale.values_list("project_id", flat=True).distinct():
+        drift.extend(reconcile_project(stale_project_id, Counter(), fix))
+    return drift
+
+
+def reconcile_project(project_id, actual, fix):
+    stored = {
+        (dimension, key): count
+        for dimension, key, count in TaskCounter.objects.filter(project_id=project_id).values_list(
+            "dimension", "key", "count"
+        )
+    }
+
+    drift = [
+        (project_id, dimension, key, stored.get((dimension, key), 0), actual.get((dimension, key), 0))
+        for dimension, key in sorted(set(stored) | set(actual))
+        if stored.get((dimension, key), 0) != actual.get((dimension, key), 0)
+    ]
+    if drift and fix:
+        with transaction.atomic():
+            TaskCounter.objects.filter(project_id=project_id).delete()
+            TaskCounter.objects.bulk_create([
+                TaskCounter(project_id=project_id, dimension=dimension, key=key, count=count)
+                for (dimension, key), count in actual.items()
+            ])
+    return drift
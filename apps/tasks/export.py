@@ -0,0 +1,199 @@
+import csv
+import json
+import zlib
+from itertools import groupby
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+from tasks.models import TaskComment, TaskDiscussionMessage
+
+
+STREAM_TASKS = "tasks"
+STREAM_COMMENTS = "comments"
+STREAM_MESSAGES = "messages"
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_NDJSON: "application/x-ndjson; charset=utf-8",
+}
+
+# (output column, values_list lookup) pairs, related users are joined in.
+TASK_COLUMNS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("status", "status"),
+    ("priority", "priority"),
+    ("completed", "completed"),
+    ("due_date", "due_date"),
+    ("rank", "rank"),
+    ("assignee", "assignee__username"),
+    ("created_by", "created_by__username"),
+    ("modified_by", "modified_by__username"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
+COMMENT_COLUMNS = [
+    ("id", "id"),
+    ("task_id", "task_id"),
+    ("reply_of_id", "reply_of_id"),
+    ("content", "content"),
+    ("created_by", "created_by__username"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
+MESSAGE_COLUMNS = [
+    ("id", "id"),
+    ("task_id", "discussion__task_id"),
+    ("discussion_id", "discussion_id"),
+    ("discussion_title", "discussion__title"),
+    ("reply_of_id", "reply_of_id"),
+    ("text", "text"),
+    ("created_by", "created_by__username"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
+
+def get_stream(stream, tasks):
+    """
+    Returns the (columns, queryset) of an export stream for the selected
+    `tasks`. Every stream is ordered by task id first so streams can be
+    merged with the task stream without buffering.
+    """
+    task_ids = tasks.order_by().values("id")
+    if stream == STREAM_COMMENTS:
+        return COMMENT_COLUMNS, TaskComment.objects.filter(task__in=task_ids).order_by(
+            "task_id", "created_at", "id"
+        )
+    if stream == STREAM_MESSAGES:
+        return MESSAGE_COLUMNS, TaskDiscussionMessage.objects.filter(discussion__task__in=task_ids).order_by(
+            "discussion__task_id", "created_at", "id"
+        )
+    return TASK_COLUMNS, tasks.order_by("id")
+
+
+def iterate_records(columns, queryset, chunk_size):
+    """Yields one dict per row, reading the rows through a server-side cursor."""
+    names = [name for name, _ in columns]
+    rows = queryset.values_list(*[lookup for _, lookup in columns])
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(names, row))
+
+
+def nest_records(tasks, children, chunk_size):
+    """
+    Attaches child records to every task record with a merge join: the task
+    stream and each child stream are ordered by task id, so only the
+    children of the current task are ever held in memory.
+    """
+    groups = {
+        name: groupby(iterate_records(columns, queryset, chunk_size), key=lambda record: record["task_id"])
+        for name, (columns, queryset) in children.items()
+    }
+    current = {name: next(group, None) for name, group in groups.items()}
+    for task in tasks:
+        for name, group in groups.items():
+            while current[name] is not None and current[name][0] < task["id"]:
+                current[name] = next(group, None)
+            if current[name] is not None and current[name][0] == task["id"]:
+                task[name] = list(current[name][1])
+                current[name] = next(group, None)
+            else:
+                task[name] = []
+        yield task
+
+
+class Echo:
+    """File-like object for csv.writer that hands each written line back."""
+
+    def write(self, value):
+        return value
+
+
+def format_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if value is None:
+        return ""
+    return value
+
+
+def render_csv(columns, records):
+    writer = csv.writer(Echo())
+    names = [name for name, _ in columns]
+    yield writer.writerow(names)
+    for record in records:
+        yield writer.writerow([format_value(record[name]) for name in names])
+
+
+def render_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+def encode_chunks(lines, chunk_size):
+    """Groups rendered lines into `chunk_size` line chunks of UTF-8 bytes."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export(tasks, export_format=FORMAT_CSV, stream=STREAM_TASKS, include=(), chunk_size=2000):
+    """Returns an iterator of encoded export chunks for the selected `tasks`."""
+    columns, queryset = get_stream(stream, tasks)
+    records = iterate_records(columns, queryset, chunk_size)
+    if include:
+        records = nest_records(
+            records,
+            {name: get_stream(name, tasks) for name in include},
+            chunk_size
+        )
+    if export_format == FORMAT_NDJSON:
+        lines = render_ndjson(records)
+    else:
+        lines = render_csv(columns, records)
+    return encode_chunks(lines, chunk_size)
+
+
+class CSVRenderer(JSONRenderer):
+    """
+    Lets clients ask for the export with `Accept: text/csv`. Exports bypass
+    renderers with a streaming response, so only error payloads are
+    rendered here, as JSON.
+    """
+    media_type = "text/csv"
+    format = FORMAT_CSV
+
+
+class NDJSONRenderer(JSONRenderer):
+    media_type = "application/x-ndjson"
+    format = FORMAT_NDJSON
+
+
+def accepts_gzip(request):
+    for encoding in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = encoding.partition(";")
+        if name.strip() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
@@ -0,0 +1,86 @@
+from rest_framework import serializers
+
+from tasks.models import Task
+
+
+class CommaSeparatedChoiceField(serializers.Field):
+    default_error_messages = {
+        "invalid_choice": "Invalid value {value}. Please choose from: {choices}",
+    }
+
+    def __init__(self, choices, **kwargs):
+        self.choices = [choice[0] for choice in choices]
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (list, tuple)):
+            data = str(data).split(",")
+        values = [str(value).strip() for value in data if str(value).strip()]
+        for value in values:
+            if value not in self.choices:
+                self.fail("invalid_choice", value=value, choices=", ".join(self.choices))
+        return values
+
+    def to_representation(self, value):
+        return ",".join(value)
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Parses task list query parameters into queryset filters.
+
+    Every filter maps to a column covered by one of the Task indexes, and
+    sort keys are limited to non-null columns so they can be paired with
+    `id` for keyset pagination. Build it from `request.query_params.dict()`
+    so absent boolean parameters stay unset.
+    """
+    SORT_CHOICES = [
+        "created_at",
+        "-created_at",
+        "updated_at",
+        "-updated_at",
+    ]
+
+    status = CommaSeparatedChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = CommaSeparatedChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    assignee = serializers.CharField(required=False)
+    due_after = serializers.DateTimeField(required=False)
+    due_before = serializers.DateTimeField(required=False)
+    completed = serializers.BooleanField(required=False, allow_null=True, default=None)
+    updated_since = serializers.DateTimeField(required=False)
+    sort = serializers.ChoiceField(
+        choices=SORT_CHOICES,
+        error_messages={
+            "invalid_choice": f"Invalid sort key. Please choose from: {', '.join(SORT_CHOICES)}"
+        },
+        required=False
+    )
+
+    def validate(self, attrs):
+        due_after, due_before = attrs.get("due_after"), attrs.get("due_before")
+        if due_after and due_before and due_after > due_before:
+            raise serializers.ValidationError({"due_before": "due_before must be later than due_after"})
+        return attrs
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+        if data.get("status"):
+            queryset = queryset.filter(status__in=data["status"])
+        if data.get("priority"):
+            queryset = queryset.filter(priority__in=data["priority"])
+        if data.get("assignee"):
+            queryset = queryset.filter(assignee__username=data["assignee"])
+        if data.get("due_after"):
+            queryset = queryset.filter(due_date__gte=data["due_after"])
+        if data.get("due_before"):
+            queryset = queryset.filter(due_date__lte=data["due_before"])
+        if data.get("completed") is not None:
+            queryset = queryset.filter(completed=data["completed"])
+        if data.get("updated_since"):
+            queryset = queryset.filter(updated_at__gte=data["updated_since"])
+        return queryset
+
+    def get_ordering(self):
+        sort = self.validated_data.get("sort") or "created_at"
+        tie_breaker = "-id" if sort.startswith("-") else "id"
+        return (sort, tie_breaker)
@@ -0,0 +1,55 @@
+from itertools import islice
+
+from django.conf import settings
+
+from tasks.serializers import TaskBulkItemSerializer
+from tasks.services import bulk_create_tasks
+
+
+def import_tasks(project, user, rows, batch_size=None, start=0, on_batch=None):
+    """
+    Validates and inserts `rows` from `read_rows` in batched transactions.
+
+    Assignees are resolved against a map of the project members built
+    once up front. Rows up to `start` are skipped, which resumes an import
+    from a checkpoint. `on_batch(result)` is called after every committed
+    batch. Tasks go through `bulk_create_tasks`, so no per-task signal or
+    websocket broadcast is sent, callers publish one summary event.
+    """
+    batch_size = batch_size or settings.TASK_IMPORT_BATCH_SIZE
+    members = project.get_member_ids_by_username()
+    result = {"processed": start, "created": 0, "failed": 0, "errors": []}
+    batch = []
+
+    def fail(number, errors):
+        result["failed"] += 1
+        if len(result["errors"]) < settings.TASK_IMPORT_MAX_REPORTED_ERRORS:
+            result["errors"].append({"row": number, "errors": errors})
+
+    def flush(number):
+        if batch:
+            result["created"] += len(bulk_create_tasks(project, user, batch))
+            batch.clear()
+        result["processed"] = number
+        if on_batch:
+            on_batch(result)
+
+    number = start
+    for number, row in islice(rows, start, None):
+        if row is None:
+            fail(number, {"non_field_errors": ["Row could not be parsed"]})
+            continue
+        serializer = TaskBulkItemSerializer(data=row)
+        if not serializer.is_valid():
+            fail(number, serializer.errors)
+            continue
+        data = dict(serializer.validated_data)
+        username = data.pop("assignee", None)
+        if username and username not in members:
+            fail(number, {"assignee": ["Assignee must be from Project members"]})
+            continue
+        batch.append({**data, "assignee_id": members.get(username)})
+        if len(batch) >= batch_size:
+            flush(number)
+    flush(number)
+    return result
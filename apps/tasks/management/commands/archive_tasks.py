@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.archive import archive_tasks
+
+
+class Command(BaseCommand):
+    help = "Moves deleted tasks and tasks done past the retention window into the archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.TASK_ARCHIVE_RETENTION_DAYS,
+            help="Archive DONE tasks not updated for this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_ARCHIVE_BATCH_SIZE,
+            help="Number of tasks moved per transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches, the next run continues where this one stopped.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(count):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Archived {count} tasks")
+
+        archived = archive_tasks(
+            options["retention_days"],
+            options["batch_size"],
+            max_batches=options["max_batches"],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"{archived} tasks archived"))
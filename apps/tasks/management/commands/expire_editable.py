@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.services import expire_editable
+
+
+class Command(BaseCommand):
+    help = "Marks comments and discussion messages past the edit window as no longer editable."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EDITABLE_EXPIRE_BATCH_SIZE,
+            help="Number of rows updated per query.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches, the next run continues where this one stopped.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(model, count):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Expired {count} rows, last batch from {model._meta.verbose_name_plural}")
+
+        expired = expire_editable(
+            options["batch_size"],
+            max_batches=options["max_batches"],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"{expired} comments and messages expired"))
@@ -0,0 +1,101 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from mini_jira.models import User
+from projects.models import Project
+from tasks.consumers import ProjectUpdateConsumer
+from tasks.importer import import_tasks
+from tasks.readers import FORMATS, get_file_format, read_rows
+from tasks.services import broadcast_project_event
+
+
+class Command(BaseCommand):
+    help = "Imports tasks into a project from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("project", help="Id of the project receiving the tasks.")
+        parser.add_argument("path", help="CSV or JSONL file to import.")
+        parser.add_argument("--user", required=True, help="Username recorded as the creator of the tasks.")
+        parser.add_argument(
+            "--file-format",
+            choices=FORMATS,
+            help="Format of the file, detected from the extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_IMPORT_BATCH_SIZE,
+            help="Number of tasks inserted per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording the progress after every batch. An existing checkpoint resumes the import.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(id=options["project"])
+            user = User.objects.get(username=options["user"])
+        except (Project.DoesNotExist, User.DoesNotExist, ValueError) as error:
+            raise CommandError(error)
+        file_format = options["file_format"] or get_file_format(options["path"])
+        if not file_format:
+            raise CommandError("Unknown file format, pass --file-format")
+
+        checkpoint = self.read_checkpoint(options["checkpoint"], project, options["path"])
+        if checkpoint["processed"]:
+            self.stdout.write(f"Resuming after row {checkpoint['processed']}")
+
+        def on_batch(result):
+            self.write_checkpoint(options["checkpoint"], {
+                "project": str(project.id),
+                "path": options["path"],
+                "processed": result["processed"],
+                "created": checkpoint["created"] + result["created"],
+                "failed": checkpoint["failed"] + result["failed"],
+            })
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Processed {result['processed']} rows, created {result['created']} tasks")
+
+        with open(options["path"], encoding="utf-8", errors="surrogateescape", newline="") as stream:
+            result = import_tasks(
+                project,
+                user,
+                read_rows(stream, file_format),
+                batch_size=options["batch_size"],
+                start=checkpoint["processed"],
+                on_batch=on_batch,
+            )
+
+        created = checkpoint["created"] + result["created"]
+        failed = checkpoint["failed"] + result["failed"]
+        broadcast_project_event(
+            project.id,
+            ProjectUpdateConsumer.EVENT_TYPE_TASKS_IMPORTED,
+            {"count": created, "failed": failed}
+        )
+        for error in result["errors"]:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {error['errors']}"))
+        self.stdout.write(self.style.SUCCESS(f"{created} tasks imported, {failed} rows failed"))
+
+    def read_checkpoint(self, path, project, source):
+        empty = {"processed": 0, "created": 0, "failed": 0}
+        if not path or not os.path.exists(path):
+            return empty
+        with open(path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint.get("project") != str(project.id) or checkpoint.get("path") != source:
+            raise CommandError(f"Checkpoint {path} belongs to another import")
+        return {key: checkpoint.get(key, 0) for key in empty}
+
+    def write_checkpoint(self, path, checkpoint):
+        if not path:
+            return
+        # Replace the file in one step so a crash never leaves half a checkpoint.
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary, path)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.services import get_columns_to_rebalance, rebalance_column
+
+
+class Command(BaseCommand):
+    help = "Rewrites the board ranks of columns whose rank keys grew too long."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-length",
+            type=int,
+            default=settings.TASK_RANK_MAX_LENGTH,
+            help="Rebalance columns holding a rank longer than this.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_RANK_REBALANCE_BATCH_SIZE,
+            help="Number of tasks updated per query.",
+        )
+
+    def handle(self, *args, **options):
+        columns = get_columns_to_rebalance(options["max_length"])
+        for project_id, column in columns:
+            count = rebalance_column(project_id, column, batch_size=options["batch_size"])
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Rebalanced {count} tasks in {project_id} {column}")
+        self.stdout.write(self.style.SUCCESS(f"{len(columns)} columns rebalanced"))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full text search index for tasks, comments and discussion messages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SEARCH_REBUILD_BATCH_SIZE,
+            help="Number of entries inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(kind, count):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Indexed {count} {kind} entries")
+
+        totals = rebuild_index(options["batch_size"], progress=progress)
+        for kind, count in totals.items():
+            self.stdout.write(self.style.SUCCESS(f"{kind}: {count} entries indexed"))
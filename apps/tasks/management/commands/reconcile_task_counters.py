@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recomputes the task board counters from the task table and reports drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_COUNTER_RECONCILE_BATCH_SIZE,
+            help="Number of tasks read per query.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without rewriting the counters.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(count):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Counted {count} tasks")
+
+        drift = reconcile_counters(options["batch_size"], fix=not options["dry_run"], progress=progress)
+        for project_id, dimension, key, stored, actual in drift:
+            self.stdout.write(
+                self.style.WARNING(f"{project_id} {dimension}={key or '-'}: stored {stored}, actual {actual}")
+            )
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Task counters are in sync"))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} counters drifted"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(drift)} counters repaired"))
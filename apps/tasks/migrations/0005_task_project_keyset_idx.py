@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_commentreadreceipt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['project', 'created_at', 'id'], name='task_project_keyset_idx'),
+        ),
+    ]
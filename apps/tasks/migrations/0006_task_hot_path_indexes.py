@@ -0,0 +1,33 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_project_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'is_active', 'status'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'is_active', 'due_date'], name='task_assignee_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['task', 'created_at'], name='taskcomment_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdiscussion',
+            index=models.Index(fields=['task', 'created_at'], name='taskdiscussion_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdiscussionmessage',
+            index=models.Index(fields=['discussion', 'created_at'], name='taskmessage_discussion_idx'),
+        ),
+    ]
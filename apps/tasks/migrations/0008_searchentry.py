@@ -0,0 +1,93 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# The inverted index is database specific and invisible to the model state.
+# SQLite rebuilds a table when it is altered, which drops these triggers, so
+# any later migration touching SearchEntry has to recreate them.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tasks_searchentry_fts USING fts5(
+        title, body, content='tasks_searchentry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_searchentry_ai AFTER INSERT ON tasks_searchentry BEGIN
+        INSERT INTO tasks_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_searchentry_ad AFTER DELETE ON tasks_searchentry BEGIN
+        INSERT INTO tasks_searchentry_fts(tasks_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_searchentry_au AFTER UPDATE ON tasks_searchentry BEGIN
+        INSERT INTO tasks_searchentry_fts(tasks_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO tasks_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tasks_searchentry_au",
+    "DROP TRIGGER IF EXISTS tasks_searchentry_ad",
+    "DROP TRIGGER IF EXISTS tasks_searchentry_ai",
+    "DROP TABLE IF EXISTS tasks_searchentry_fts",
+]
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE tasks_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX tasks_searchentry_vector_idx ON tasks_searchentry USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS tasks_searchentry_vector_idx",
+    "ALTER TABLE tasks_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_statements(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_remove_projectdiscussion_created_by_and_more'),
+        ('tasks', '0007_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment'), ('message', 'Discussion Message')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='projects.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='tasks.task')),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(
+            run_statements({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD}),
+            run_statements({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:04
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+from collections import Counter
+
+
+def get_counter_keys(state):
+    # Frozen copy of tasks.counters.get_counter_keys as of this migration,
+    # the live module works on the current models.
+    if not state["is_active"]:
+        return []
+    keys = [
+        ("total", ""),
+        ("status", state["status"]),
+        ("priority", state["priority"] or ""),
+        ("assignee", str(state["assignee_id"] or "")),
+    ]
+    if state["due_date"] and state["status"] != "DONE" and not state["completed"]:
+        keys.append(("due", timezone.localtime(state["due_date"]).date().isoformat()))
+    return keys
+
+
+def populate_counters(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskCounter = apps.get_model("tasks", "TaskCounter")
+    fields = ("project_id", "is_active", "status", "priority", "assignee_id", "due_date", "completed")
+    totals = Counter()
+    for row in Task.objects.filter(is_active=True).values_list(*fields).iterator(chunk_size=2000):
+        state = dict(zip(fields, row))
+        for dimension, key in get_counter_keys(state):
+            totals[(state["project_id"], dimension, key)] += 1
+    TaskCounter.objects.bulk_create(
+        [
+            TaskCounter(project_id=project_id, dimension=dimension, key=key, count=count)
+            for (project_id, dimension, key), count in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_remove_projectdiscussion_created_by_and_more'),
+        ('tasks', '0008_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('priority', 'Priority'), ('assignee', 'Assignee'), ('due', 'Open tasks by due day')], max_length=10)),
+                ('key', models.CharField(blank=True, max_length=64)),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='projects.project')),
+            ],
+            options={
+                'unique_together': {('project', 'dimension', 'key')},
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
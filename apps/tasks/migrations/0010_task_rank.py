@@ -0,0 +1,57 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+# Frozen copy of the key generation in tasks.ranking as of this migration,
+# a change to the live module must not change the keys written here.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def spread_ranks(count):
+    width = 1
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [to_key(index * step, width) for index in range(1, count + 1)]
+
+
+def to_key(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def populate_ranks(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    columns = Task.objects.order_by().values_list("project_id", "status").distinct()
+    for project_id, status in columns:
+        tasks = list(
+            Task.objects.filter(project_id=project_id, status=status).order_by("created_at", "id").only("id")
+        )
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ["rank"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_taskcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(populate_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['project', 'status', 'rank'], name='task_board_rank_idx'),
+        ),
+    ]
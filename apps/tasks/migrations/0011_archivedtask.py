@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:21
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_remove_projectdiscussion_created_by_and_more'),
+        ('tasks', '0010_task_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], max_length=20)),
+                ('reason', models.CharField(choices=[('inactive', 'Deleted'), ('done', 'Done past retention')], max_length=10)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'archived_at', 'id'], name='archivedtask_project_idx')],
+            },
+        ),
+    ]
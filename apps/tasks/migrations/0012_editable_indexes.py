@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_archivedtask'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(condition=models.Q(('is_editable', True)), fields=['created_at'], name='taskcomment_editable_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdiscussionmessage',
+            index=models.Index(condition=models.Q(('is_editable', True)), fields=['created_at'], name='taskmessage_editable_idx'),
+        ),
+    ]
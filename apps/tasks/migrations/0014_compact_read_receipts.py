@@ -0,0 +1,74 @@
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import migrations, transaction
+from django.db.models import Q
+
+
+BATCH_SIZE = 500
+
+
+def get_watermark(comments, read_ids, user_id):
+    """
+    The last comment of the unbroken run, oldest first, that `user_id` has
+    read or written. Comments sharing a timestamp are only covered together.
+    """
+    watermark = None
+    for _, group in groupby(comments, key=itemgetter(1)):
+        group = list(group)
+        if not all(comment_id in read_ids or created_by_id == user_id for comment_id, _, created_by_id in group):
+            break
+        watermark = group[-1]
+    return watermark
+
+
+def compact_read_receipts(apps, schema_editor):
+    CommentReadReceipt = apps.get_model("tasks", "CommentReadReceipt")
+    TaskComment = apps.get_model("tasks", "TaskComment")
+    TaskReadWatermark = apps.get_model("tasks", "TaskReadWatermark")
+
+    pairs = CommentReadReceipt.objects.order_by("user_id", "task_comment__task_id").values_list(
+        "user_id", "task_comment__task_id"
+    ).distinct()
+    last = None
+    while True:
+        batch = pairs
+        if last:
+            # Receipts the watermark does not cover stay, so the walk is keyed
+            # on the last pair rather than on what is left.
+            batch = batch.filter(Q(user_id__gt=last[0]) | Q(user_id=last[0], task_comment__task_id__gt=last[1]))
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            break
+        with transaction.atomic():
+            for user_id, task_id in batch:
+                receipts = CommentReadReceipt.objects.filter(user_id=user_id, task_comment__task_id=task_id)
+                comments = TaskComment.objects.filter(task_id=task_id).order_by("created_at", "id").values_list(
+                    "id", "created_at", "created_by_id"
+                )
+                watermark = get_watermark(comments, set(receipts.values_list("task_comment_id", flat=True)), user_id)
+                if watermark is None:
+                    continue
+                comment_id, created_at, _ = watermark
+                deleted, _ = receipts.filter(task_comment__created_at__lte=created_at).delete()
+                if deleted:
+                    TaskReadWatermark.objects.update_or_create(
+                        user_id=user_id,
+                        task_id=task_id,
+                        defaults={"last_read_at": created_at, "last_read_comment_id": comment_id},
+                    )
+        last = batch[-1]
+
+
+class Migration(migrations.Migration):
+    # Every batch commits on its own, an interrupted run resumes from the
+    # receipts left behind.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0013_taskreadwatermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_read_receipts, migrations.RunPython.noop),
+    ]
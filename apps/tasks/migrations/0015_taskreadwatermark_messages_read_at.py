@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_compact_read_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskreadwatermark',
+            name='messages_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='taskreadwatermark',
+            name='last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 21:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0015_taskreadwatermark_messages_read_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['reply_of', 'created_at', 'id'], name='taskcomment_reply_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdiscussionmessage',
+            index=models.Index(fields=['reply_of', 'created_at', 'id'], name='taskmessage_reply_idx'),
+        ),
+    ]
@@ -1,9 +1,45 @@
 from django.conf import settings
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.utils import timezone
 
 from projects.models import Project
 from mini_jira.models import BaseTimeStampedModel, User
+from tasks.ranking import rank_between
+
+
+def get_edit_deadline():
+    """Comments and messages created before this moment can no longer be edited."""
+    return timezone.now() - timezone.timedelta(seconds=settings.COMMENT_EDIT_DURATION_SECONDS)
+
+
+class EditableQuerySet(models.QuerySet):
+    """
+    Editability is derived from `created_at`, `is_editable` only records that
+    the window is over and is flipped in bulk by `expire_editable`.
+    """
+
+    def with_content_editable(self):
+        return self.annotate(content_editable=models.ExpressionWrapper(
+            models.Q(is_editable=True, created_at__gt=get_edit_deadline()),
+            output_field=models.BooleanField(),
+        ))
+
+    def expired(self):
+        return self.filter(is_editable=True, created_at__lte=get_edit_deadline())
+
+
+class EditableContentModel(BaseTimeStampedModel):
+    is_editable = models.BooleanField(default=True)
+
+    objects = EditableQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_content_editable(self):
+        return self.is_editable and self.created_at > get_edit_deadline()
 
 
 class Task(BaseTimeStampedModel):
@@ -34,19 +70,92 @@ class Task(BaseTimeStampedModel):
     completed = models.BooleanField(default=False)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Position inside the status column of the board, see tasks.ranking.
+    rank = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "status", "rank"],
+                condition=models.Q(is_active=True),
+                name="task_board_rank_idx",
+            ),
+            models.Index(
+                fields=["project", "created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="task_project_keyset_idx",
+            ),
+            models.Index(
+                fields=["project", "updated_at", "id"],
+                condition=models.Q(is_active=True),
+                name="task_project_updated_idx",
+            ),
+            models.Index(
+                fields=["project", "due_date"],
+                condition=models.Q(is_active=True),
+                name="task_project_due_idx",
+            ),
+            models.Index(fields=["project", "is_active", "status"], name="task_project_status_idx"),
+            models.Index(fields=["assignee", "is_active", "due_date"], name="task_assignee_due_idx"),
+        ]
+
+    # Fields that decide which TaskCounter rows a task is counted in.
+    COUNTER_FIELDS = ("project_id", "is_active", "status", "priority", "assignee_id", "due_date", "completed")
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_counter_state()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.snapshot_counter_state()
+
+    def get_counter_state(self):
+        if all(field in self.__dict__ for field in self.COUNTER_FIELDS):
+            return {field: self.__dict__[field] for field in self.COUNTER_FIELDS}
+        return None
+
+    def snapshot_counter_state(self):
+        """Remembers the counted field values and the rank as they are stored in the database."""
+        self._counter_state = self.get_counter_state()
+        self._stored_rank = self.__dict__.get("rank")
+
+    def is_changing_column(self):
+        """True when the status changes while the rank is still the one of the old column."""
+        state = getattr(self, "_counter_state", None)
+        return bool(state) and state["status"] != self.status and self.rank == self._stored_rank
+
+    def save(self, *args, **kwargs):
+        if not self.rank or self.is_changing_column():
+            # New cards and cards moved to another column go to its end.
+            self.rank = rank_between(self.get_last_rank(self.project_id, self.status, exclude=self.pk), None)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "rank" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "rank"]
+        super().save(*args, **kwargs)
+        self._stored_rank = self.rank
+
+    @classmethod
+    def get_last_rank(cls, project_id, status, exclude=None):
+        tasks = cls.objects.filter(project_id=project_id, status=status, is_active=True)
+        if exclude is not None:
+            tasks = tasks.exclude(pk=exclude)
+        return tasks.order_by("-rank").values_list("rank", flat=True).first() or None
+
     def delete_object(self):
         self.is_active = False
         self.save(update_fields=["is_active", "updated_at"])
 
     def is_collaborator(self, user):
-        return self.created_by.id == user.id or self.assignee.id == user.id
+        return user.id in (self.created_by_id, self.assignee_id)
 
 
-class TaskComment(BaseTimeStampedModel):
+class TaskComment(EditableContentModel):
     task = models.ForeignKey(Task, related_name="comments", on_delete=models.CASCADE)
     content = models.TextField()
     reply_of = models.ForeignKey(
@@ -56,26 +165,26 @@ class TaskComment(BaseTimeStampedModel):
         blank=True,
         on_delete=models.CASCADE
     )
-    is_editable = models.BooleanField(default=True)
 
     def __str__(self):
         return f"Comment by {self.created_by.username} on {self.task}"
 
     class Meta:
         ordering = ['created_at']
-
-    def _set_is_editable(self, value):
-        self.is_editable = False
-        self.save(update_fields=["is_editable"])
-
-    @property
-    def is_content_editable(self):
-        secs_elapsed = (timezone.now() - self.created_at).total_seconds()
-        if self.is_editable and secs_elapsed > settings.COMMENT_EDIT_DURATION_SECONDS:
-            self._set_is_editable(False)
-        return self.is_editable
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="taskcomment_task_idx"),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_editable=True),
+                name="taskcomment_editable_idx",
+            ),
+            models.Index(fields=["reply_of", "created_at", "id"], name="taskcomment_reply_idx"),
+        ]
 
     def mark_as_read(self, user):
+        """Comments already covered by the user's watermark on the task get no receipt."""
+        if TaskReadWatermark.objects.filter(user=user, task_id=self.task_id, last_read_at__gte=self.created_at).exists():
+            return None, False
         return self.read_receipts.get_or_create(user=user)
 
 
@@ -91,6 +200,74 @@ class CommentReadReceipt(models.Model):
         return f"User {self.user.username} read comment {self.task_comment.id} at {self.read_at}"
 
 
+class TaskReadWatermark(models.Model):
+    """
+    Every comment of `task` created up to `last_read_at`, and every
+    discussion message up to `messages_read_at`, counts as read by `user`.
+    Receipts are only kept for comments read out of order, past the
+    watermark.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="read_watermarks")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="read_watermarks")
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    last_read_comment = models.ForeignKey(
+        TaskComment,
+        related_name="+",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    messages_read_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "task")
+
+    def __str__(self):
+        return f"User {self.user.username} read {self.task} up to {self.last_read_at}"
+
+    @classmethod
+    def advance(cls, user, task, comment):
+        """
+        Moves the user's watermark on `task` up to `comment`, never back, and
+        drops the receipts it now covers.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(
+                models.Q(last_read_at__isnull=True) | models.Q(last_read_at__lt=comment.created_at),
+                user=user,
+                task=task,
+            ).update(
+                last_read_at=comment.created_at,
+                last_read_comment=comment,
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                cls.objects.get_or_create(
+                    user=user,
+                    task=task,
+                    defaults={"last_read_at": comment.created_at, "last_read_comment": comment},
+                )
+            CommentReadReceipt.objects.filter(
+                user=user,
+                task_comment__task=task,
+                task_comment__created_at__lte=comment.created_at,
+            ).delete()
+        return cls.objects.get(user=user, task=task)
+
+    @classmethod
+    def advance_messages(cls, user, task, read_at):
+        """Moves the user's discussion watermark on `task` up to `read_at`, never back."""
+        updated = cls.objects.filter(
+            models.Q(messages_read_at__isnull=True) | models.Q(messages_read_at__lt=read_at),
+            user=user,
+            task=task,
+        ).update(messages_read_at=read_at, updated_at=timezone.now())
+        if not updated:
+            cls.objects.get_or_create(user=user, task=task, defaults={"messages_read_at": read_at})
+        return cls.objects.get(user=user, task=task)
+
+
 class TaskDiscussion(BaseTimeStampedModel):
     title = models.CharField(max_length=255, blank=True, null=True)
     task = models.ForeignKey(Task, related_name="task_discussions", on_delete=models.CASCADE)
@@ -100,16 +277,124 @@ class TaskDiscussion(BaseTimeStampedModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="taskdiscussion_task_idx"),
+        ]
 
 
-class TaskDiscussionMessage(BaseTimeStampedModel):
+class TaskDiscussionMessage(EditableContentModel):
     discussion = models.ForeignKey(TaskDiscussion, related_name="messages", on_delete=models.CASCADE)
     text = models.TextField()
     reply_of = models.ForeignKey("self", null=True, blank=True, related_name="replies", on_delete=models.CASCADE)
-    is_editable = models.BooleanField(default=True)
 
     def __str__(self):
         return f"Message by {self.created_by.username} in {self.discussion.title}"
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=["discussion", "created_at"], name="taskmessage_discussion_idx"),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_editable=True),
+                name="taskmessage_editable_idx",
+            ),
+            models.Index(fields=["reply_of", "created_at", "id"], name="taskmessage_reply_idx"),
+        ]
+
+
+class SearchEntry(models.Model):
+    """
+    Denormalized search document for a task, comment or discussion message.
+
+    The inverted index lives next to this table and is created by the
+    migration for the active database: a `search_vector` tsvector column
+    with a GIN index on PostgreSQL, and an external-content FTS5 table
+    (`tasks_searchentry_fts`) kept in sync by triggers on SQLite.
+    """
+    KIND_TASK = "task"
+    KIND_COMMENT = "comment"
+    KIND_MESSAGE = "message"
+    KIND_CHOICES = [
+        (KIND_TASK, "Task"),
+        (KIND_COMMENT, "Comment"),
+        (KIND_MESSAGE, "Discussion Message"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    task = models.ForeignKey(Task, related_name="search_entries", on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, related_name="search_entries", on_delete=models.CASCADE)
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+
+class TaskCounter(models.Model):
+    """
+    Number of active tasks of a project per (dimension, key), maintained
+    incrementally from the task write paths so board summaries never have
+    to aggregate the task table.
+    """
+    DIMENSION_TOTAL = "total"
+    DIMENSION_STATUS = "status"
+    DIMENSION_PRIORITY = "priority"
+    DIMENSION_ASSIGNEE = "assignee"
+    DIMENSION_DUE = "due"
+    DIMENSION_CHOICES = [
+        (DIMENSION_TOTAL, "Total"),
+        (DIMENSION_STATUS, "Status"),
+        (DIMENSION_PRIORITY, "Priority"),
+        (DIMENSION_ASSIGNEE, "Assignee"),
+        (DIMENSION_DUE, "Open tasks by due day"),
+    ]
+
+    project = models.ForeignKey(Project, related_name="task_counters", on_delete=models.CASCADE)
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=64, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("project", "dimension", "key")
+
+    def __str__(self):
+        return f"{self.project_id} {self.dimension}={self.key}: {self.count}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Cold copy of a task removed from the live tables, with its comments,
+    read receipts, discussions and messages serialized into `payload`.
+    """
+    REASON_INACTIVE = "inactive"
+    REASON_DONE = "done"
+    REASON_CHOICES = [
+        (REASON_INACTIVE, "Deleted"),
+        (REASON_DONE, "Done past retention"),
+    ]
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    project = models.ForeignKey(Project, related_name="archived_tasks", on_delete=models.CASCADE)
+    title = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "archived_at", "id"], name="archivedtask_project_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def is_collaborator(self, user):
+        """`Task.is_collaborator` of the archived task."""
+        fields = self.payload["task"][0]["fields"]
+        return user.id in (fields.get("created_by"), fields.get("assignee"))
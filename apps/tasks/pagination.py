@@ -0,0 +1,46 @@
+from django.conf import settings
+from rest_framework.utils.urls import replace_query_param
+
+from mini_jira.pagination import KeysetCursorPagination
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    ordering = ("created_at", "id")
+    page_size = settings.TASK_LIST_PAGE_SIZE
+    max_page_size = settings.TASK_LIST_MAX_PAGE_SIZE
+
+
+class TaskBoardPagination(TaskCursorPagination):
+    """
+    Pages one status column of the board in rank order. Every column has
+    its own next link, the cursor only applies to the column named by the
+    `column` query parameter.
+    """
+    ordering = ("rank", "id")
+    page_size = settings.TASK_BOARD_PAGE_SIZE
+    column_query_param = "column"
+
+    def __init__(self, column, **kwargs):
+        super().__init__(**kwargs)
+        self.column = column
+
+    def decode_cursor(self, request):
+        if request.query_params.get(self.column_query_param) != self.column:
+            return None
+        return super().decode_cursor(request)
+
+    def get_next_link(self):
+        link = super().get_next_link()
+        if link is None:
+            return None
+        return replace_query_param(link, self.column_query_param, self.column)
+
+
+class ArchivedTaskPagination(TaskCursorPagination):
+    ordering = ("-archived_at", "-id")
+
+
+class TaskCommentPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size = settings.TASK_COMMENT_PAGE_SIZE
+    max_page_size = settings.TASK_COMMENT_MAX_PAGE_SIZE
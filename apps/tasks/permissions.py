@@ -1,23 +1,72 @@
-
 from rest_framework.permissions import IsAuthenticated
 
-from tasks.models import Task
+from mini_jira import request_cache
+from projects.permissions import is_project_collaborator
+from tasks.models import ArchivedTask, Task
+
+
+def get_task_queryset(view):
+    """The view's own task queryset, so the permission check loads what the view renders."""
+    if hasattr(view, "get_task_queryset"):
+        return view.get_task_queryset()
+    return Task.objects.select_related("project")
 
 
 class TaskCollaboratorPermission(IsAuthenticated):
     message = "Permission denied"
+    # Methods reserved to the task's creator and assignee, other project
+    # members only get the remaining ones.
+    collaborator_methods = ["DELETE", "PUT"]
 
     def has_permission(self, request, view):
         method = request.method
-        task = Task.objects.filter(id=view.kwargs.get("uuid")).first()
+        task_uuid = view.kwargs.get("uuid") or view.kwargs.get("task_uuid")
+        if not task_uuid:
+            return True
+
+        task = request_cache.get_object(request, get_task_queryset(view), task_uuid)
         if not task:
             return True
 
-        if method in ["DELETE", "PUT"]:
+        if method in self.collaborator_methods:
             if task.is_collaborator(user=request.user):
                 return True
             return False
 
-        if task.project.is_collaborator(user=request.user):
+        if is_project_collaborator(request, task.project):
             return True
         return False
+
+
+class TaskEditPermission(TaskCollaboratorPermission):
+    """For endpoints that change the task itself through POST, like moving its card."""
+    collaborator_methods = ["DELETE", "PUT", "POST"]
+
+
+class ArchivedTaskPermission(IsAuthenticated):
+    message = "Permission denied"
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        archived_task = request_cache.get_object(
+            request, ArchivedTask.objects.select_related("project"), view.kwargs.get("uuid")
+        )
+        if not archived_task:
+            return True
+        if request.method == "POST":
+            # Restoring undoes a delete, which is up to the creator or assignee.
+            return archived_task.is_collaborator(request.user)
+        return is_project_collaborator(request, archived_task.project)
+
+
+class ReplyTreePermission(IsAuthenticated):
+    message = "Permission denied"
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        root = view.get_root_object()
+        if not root:
+            return True
+        return is_project_collaborator(request, view.get_task(root).project)
@@ -0,0 +1,71 @@
+import itertools
+
+
+# Digits and lowercase letters only, so keys sort the same way in Python
+# and under the default collations of SQLite and PostgreSQL.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def rank_between(before=None, after=None):
+    """
+    Returns a key that sorts strictly between `before` and `after`, where
+    None stands for the start or the end of the column.
+
+    Keys never end with the zero digit, which keeps room below every key.
+    Appending or prepending steps the last digit instead of halving the gap,
+    so a key grows by one character every ~18 cards added at the same end.
+    """
+    before = before or ""
+    if after is not None and after <= before:
+        raise ValueError(f"{before!r} does not sort before {after!r}")
+
+    key = []
+    for position in itertools.count():
+        low = DIGITS.index(before[position]) if position < len(before) else None
+        high = DIGITS.index(after[position]) if after and position < len(after) else None
+        if low is None and high is None:
+            return "".join(key) + DIGITS[BASE // 2]
+        if high is None:
+            if low + 1 < BASE:
+                return "".join(key) + DIGITS[low + 1]
+        elif low is None:
+            if high > 1:
+                return "".join(key) + DIGITS[high - 1]
+        elif high - low > 1:
+            return "".join(key) + DIGITS[(low + high) // 2]
+
+        digit = low if low is not None else 0
+        key.append(DIGITS[digit])
+        if high is not None and digit < high:
+            # The key is already below `after`, only `before` bounds the rest.
+            after = None
+
+
+def ranks_between(before, after, count):
+    """Returns `count` ascending keys between `before` and `after`, splitting the gap evenly."""
+    if count <= 0:
+        return []
+    middle = rank_between(before, after)
+    lower = ranks_between(before, middle, (count - 1) // 2)
+    upper = ranks_between(middle, after, count - 1 - len(lower))
+    return lower + [middle] + upper
+
+
+def spread_ranks(count):
+    """Returns `count` ascending keys of minimal length spaced evenly over the whole key range."""
+    # Leave at least one free key between neighbours.
+    width = 1
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [to_key(index * step, width) for index in range(1, count + 1)]
+
+
+def to_key(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    # Trailing zeros carry no ordering information for keys of equal width.
+    return "".join(reversed(digits)).rstrip(DIGITS[0])
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+}
+
+
+def get_file_format(name):
+    for extension, file_format in EXTENSIONS.items():
+        if name.lower().endswith(extension):
+            return file_format
+    return None
+
+
+def read_rows(stream, file_format):
+    """
+    Parses `stream` (text or binary) one line at a time and yields
+    (row number, row) pairs. Rows that cannot be parsed, or that are not
+    valid UTF-8, are yielded as (row number, None).
+    """
+    if isinstance(stream.read(0), bytes):
+        # Invalid bytes are kept as lone surrogates instead of ending the
+        # read, so that they only fail their own row.
+        stream = io.TextIOWrapper(stream, encoding="utf-8", errors="surrogateescape", newline="")
+    for number, row in READERS[file_format](stream):
+        yield number, row if row is None or is_decoded(row) else None
+
+
+def is_decoded(row):
+    try:
+        json.dumps(row, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def read_csv_rows(stream):
+    for number, row in enumerate(csv.DictReader(stream), start=1):
+        # Empty cells mean "not set", not an empty value.
+        yield number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def read_jsonl_rows(stream):
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+READERS = {
+    FORMAT_CSV: read_csv_rows,
+    FORMAT_JSONL: read_jsonl_rows,
+}
+
+FORMATS = sorted(READERS)
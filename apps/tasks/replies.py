@@ -0,0 +1,79 @@
+from django.db import connection
+
+from mini_jira.models import User
+
+
+# Both the depth and the breadth limit are applied in the recursive step,
+# so branches that are cut are never walked. Siblings are ranked with a
+# correlated subquery, window functions are not allowed in the recursive
+# part of a CTE.
+TREE_SQL = """
+    WITH RECURSIVE tree(id, depth) AS (
+        SELECT id, 0 FROM {table} WHERE id = %(root)s
+        UNION ALL
+        SELECT child.id, tree.depth + 1
+        FROM {table} child
+        JOIN tree ON child.reply_of_id = tree.id
+        WHERE tree.depth < %(depth)s
+          AND child.id IN (
+              SELECT sibling.id FROM {table} sibling
+              WHERE sibling.reply_of_id = child.reply_of_id
+              ORDER BY sibling.created_at, sibling.id
+              LIMIT %(replies)s
+          )
+    )
+    SELECT node.*, tree.depth AS depth, author.username AS author,
+           CASE WHEN tree.depth < %(depth)s THEN EXISTS (
+               SELECT 1 FROM {table} reply
+               WHERE reply.reply_of_id = node.id
+               LIMIT 1 OFFSET %(replies)s
+           ) ELSE EXISTS (
+               SELECT 1 FROM {table} reply WHERE reply.reply_of_id = node.id
+           ) END AS has_more_replies
+    FROM tree
+    JOIN {table} node ON node.id = tree.id
+    JOIN {user_table} author ON author.id = node.created_by_id
+    ORDER BY tree.depth, node.created_at, node.id
+    LIMIT %(nodes)s
+"""
+
+
+def get_reply_rows(model, root_id, max_depth, max_replies, max_nodes):
+    """
+    The reply tree below `root_id` in a single recursive query, ordered by
+    depth. `has_more_replies` tells whether a node has replies past the
+    depth or breadth limit. One node past `max_nodes` is fetched as well,
+    so the caller can tell the tree was cut there.
+    """
+    sql = TREE_SQL.format(
+        table=connection.ops.quote_name(model._meta.db_table),
+        user_table=connection.ops.quote_name(User._meta.db_table),
+    )
+    params = {
+        "root": model._meta.pk.get_db_prep_value(root_id, connection),
+        "depth": max_depth,
+        "replies": max_replies,
+        "nodes": max_nodes + 1,
+    }
+    return list(model.objects.raw(sql, params))
+
+
+def get_reply_tree(model, root_id, max_depth, max_replies, max_nodes):
+    """
+    Returns the root with its replies nested under `tree_replies`, or None
+    when it does not exist. Assembled in one pass over the rows, parents
+    always come before their replies.
+    """
+    rows = get_reply_rows(model, root_id, max_depth, max_replies, max_nodes)
+    if not rows:
+        return None
+    nodes = {}
+    for row in rows[:max_nodes]:
+        row.tree_replies = []
+        row.has_more_replies = bool(row.has_more_replies)
+        if row.depth:
+            nodes[row.reply_of_id].tree_replies.append(row)
+        nodes[row.id] = row
+    for row in rows[max_nodes:]:
+        nodes[row.reply_of_id].has_more_replies = True
+    return rows[0]
@@ -4,4 +4,5 @@ from tasks import consumers
 
 websocket_urlpatterns = [
     path("ws/task/<uuid:uuid>/updates", consumers.TaskUpdateConsumer.as_asgi()),
+    path("ws/project/<uuid:uuid>/updates", consumers.ProjectUpdateConsumer.as_asgi()),
 ]
\ No newline at end of file
@@ -0,0 +1,269 @@
+import html
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+
+from tasks.models import SearchEntry, Task, TaskComment, TaskDiscussion, TaskDiscussionMessage
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# The database marks the matches with control characters, which are
+# swapped for the highlight markup once the snippet is escaped.
+MATCH_START = "\x02"
+MATCH_STOP = "\x03"
+
+
+def index_task(task):
+    SearchEntry.objects.update_or_create(
+        kind=SearchEntry.KIND_TASK,
+        object_id=task.id,
+        defaults={
+            "task_id": task.id,
+            "project_id": task.project_id,
+            "title": task.title,
+            "body": task.description,
+        }
+    )
+
+
+def index_new_tasks(tasks, batch_size=None):
+    """Indexes tasks inserted with bulk_create, which never send post_save."""
+    SearchEntry.objects.bulk_create(
+        [
+            SearchEntry(
+                kind=SearchEntry.KIND_TASK,
+                object_id=task.id,
+                task_id=task.id,
+                project_id=task.project_id,
+                title=task.title,
+                body=task.description,
+            )
+            for task in tasks
+        ],
+        batch_size=batch_size,
+    )
+
+
+def index_comment(comment):
+    project_id = Task.objects.filter(id=comment.task_id).values_list("project_id", flat=True).first()
+    SearchEntry.objects.update_or_create(
+        kind=SearchEntry.KIND_COMMENT,
+        object_id=comment.id,
+        defaults={
+            "task_id": comment.task_id,
+            "project_id": project_id,
+            "title": "",
+            "body": comment.content,
+        }
+    )
+
+
+def index_message(message):
+    discussion = TaskDiscussion.objects.filter(
+        id=message.discussion_id
+    ).values("task_id", "task__project_id", "title").first()
+    SearchEntry.objects.update_or_create(
+        kind=SearchEntry.KIND_MESSAGE,
+        object_id=message.id,
+        defaults={
+            "task_id": discussion["task_id"],
+            "project_id": discussion["task__project_id"],
+            "title": discussion["title"] or "",
+            "body": message.text,
+        }
+    )
+
+
+def index_discussion_title(discussion):
+    """The title is indexed with every message of the discussion."""
+    SearchEntry.objects.filter(
+        kind=SearchEntry.KIND_MESSAGE,
+        object_id__in=TaskDiscussionMessage.objects.filter(discussion=discussion).values("id"),
+    ).update(title=discussion.title or "")
+
+
+def remove_entry(kind, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+class SQLiteSearchBackend:
+    """FTS5 shadow table ranked with bm25, title matches weighted above body matches."""
+
+    def build_query(self, text):
+        tokens = TOKEN_PATTERN.findall(text)
+        if not tokens:
+            return None
+        # Quoting every token keeps FTS5 operators in user input from being parsed,
+        # the last token is matched as a prefix for search-as-you-type.
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, text, project_ids, limit):
+        match = self.build_query(text)
+        if not match:
+            return []
+        placeholders = ", ".join(["%s"] * len(project_ids))
+        sql = f"""
+            SELECT e.kind, e.object_id, e.task_id, e.project_id, e.title,
+                   snippet(tasks_searchentry_fts, -1, %s, %s, '...', 16),
+                   -bm25(tasks_searchentry_fts, 10.0, 1.0) AS score
+            FROM tasks_searchentry_fts
+            JOIN tasks_searchentry e ON e.id = tasks_searchentry_fts.rowid
+            JOIN tasks_task t ON t.id = e.task_id
+            WHERE tasks_searchentry_fts MATCH %s
+              AND e.project_id IN ({placeholders})
+              AND t.is_active
+            ORDER BY bm25(tasks_searchentry_fts, 10.0, 1.0)
+            LIMIT %s
+        """
+        params = [
+            MATCH_START,
+            MATCH_STOP,
+            match,
+            *project_ids,
+            limit,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class PostgreSQLSearchBackend:
+    """Generated tsvector column with a GIN index, ranked with ts_rank."""
+
+    def search(self, text, project_ids, limit):
+        if not TOKEN_PATTERN.search(text):
+            return []
+        placeholders = ", ".join(["%s"] * len(project_ids))
+        sql = f"""
+            SELECT e.kind, e.object_id, e.task_id, e.project_id, e.title,
+                   ts_headline(
+                       'english', concat_ws(' ', e.title, e.body), query,
+                       %s
+                   ),
+                   ts_rank(e.search_vector, query) AS score
+            FROM tasks_searchentry e
+            JOIN tasks_task t ON t.id = e.task_id,
+                 websearch_to_tsquery('english', %s) query
+            WHERE e.search_vector @@ query
+              AND e.project_id IN ({placeholders})
+              AND t.is_active
+            ORDER BY score DESC
+            LIMIT %s
+        """
+        options = (
+            f"StartSel={MATCH_START}, StopSel={MATCH_STOP}, "
+            "MaxFragments=2, MaxWords=16, MinWords=4"
+        )
+        params = [options, text, *project_ids, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def highlight(snippet):
+    """Escapes the indexed text, then marks the matches."""
+    return html.escape(snippet).replace(MATCH_START, settings.SEARCH_HIGHLIGHT_START).replace(
+        MATCH_STOP, settings.SEARCH_HIGHLIGHT_STOP
+    )
+
+
+def search(text, project_ids, limit):
+    if not project_ids:
+        return []
+    project_field = SearchEntry._meta.get_field("project")
+    object_id_field = SearchEntry._meta.get_field("object_id")
+    backend = BACKENDS[connection.vendor]()
+    rows = backend.search(
+        text,
+        [project_field.get_db_prep_value(project_id, connection) for project_id in project_ids],
+        limit,
+    )
+    return [
+        {
+            "kind": kind,
+            "object_id": object_id_field.to_python(object_id),
+            "task_id": object_id_field.to_python(task_id),
+            "project_id": object_id_field.to_python(project_id),
+            "title": title,
+            "snippet": highlight(snippet),
+            "score": score,
+        }
+        for kind, object_id, task_id, project_id, title, snippet, score in rows
+    ]
+
+
+def rebuild_index(batch_size, progress=None):
+    """
+    Repopulates every SearchEntry from the source tables in batches of
+    `batch_size`. Each batch replaces the entries of its rows, so search
+    keeps finding everything while the rebuild runs. Entries older than the
+    rebuild that no batch replaced belong to rows that are gone, they are
+    dropped at the end.
+    """
+    last_id = SearchEntry.objects.aggregate(last_id=Max("id"))["last_id"]
+    sources = [
+        (
+            SearchEntry.KIND_TASK,
+            Task.objects.values_list("id", "id", "project_id", "title", "description"),
+        ),
+        (
+            SearchEntry.KIND_COMMENT,
+            TaskComment.objects.values_list("id", "task_id", "task__project_id", "content"),
+        ),
+        (
+            SearchEntry.KIND_MESSAGE,
+            TaskDiscussionMessage.objects.values_list(
+                "id", "discussion__task_id", "discussion__task__project_id", "discussion__title", "text"
+            ),
+        ),
+    ]
+    totals = {}
+    for kind, rows in sources:
+        totals[kind] = 0
+        batch = []
+        for row in rows.order_by().iterator(chunk_size=batch_size):
+            batch.append(build_entry(kind, row))
+            if len(batch) >= batch_size:
+                totals[kind] += write_batch(batch, kind, progress)
+                batch = []
+        if batch:
+            totals[kind] += write_batch(batch, kind, progress)
+    if last_id is not None:
+        SearchEntry.objects.filter(id__lte=last_id).delete()
+    return totals
+
+
+def build_entry(kind, row):
+    if kind == SearchEntry.KIND_COMMENT:
+        object_id, task_id, project_id, body = row
+        title = ""
+    else:
+        object_id, task_id, project_id, title, body = row
+    return SearchEntry(
+        kind=kind,
+        object_id=object_id,
+        task_id=task_id,
+        project_id=project_id,
+        title=title or "",
+        body=body,
+    )
+
+
+def write_batch(batch, kind, progress):
+    with transaction.atomic():
+        SearchEntry.objects.filter(kind=kind, object_id__in=[entry.object_id for entry in batch]).delete()
+        SearchEntry.objects.bulk_create(batch)
+    if progress:
+        progress(kind, len(batch))
+    return len(batch)
@@ -2,8 +2,13 @@ from django.conf import settings
 
 from rest_framework import serializers
 
+from mini_jira import request_cache
 from projects.models import Project
-from tasks.models import Task, TaskDiscussion, TaskDiscussionMessage, TaskComment
+from projects.permissions import is_project_collaborator
+from tasks import export
+from tasks.filters import CommaSeparatedChoiceField, TaskFilterSerializer
+from tasks.models import ArchivedTask, Task, TaskDiscussion, TaskDiscussionMessage, TaskComment, TaskReadWatermark
+from tasks.readers import FORMATS
 from mini_jira.models import User
 
 
@@ -29,6 +34,7 @@ class TaskListSerializer(serializers.ModelSerializer):
             "status",
             "completed",
             "priority",
+            "rank",
             "created_by",
             "modified_by",
             "created_at",
@@ -96,10 +102,9 @@ class TaskCreateSerializer(serializers.ModelSerializer):
 
     def validate_assignee(self, value):
         if value:
-            project = Project.objects.filter(
-                id=self.initial_data.get("project")
-            ).first()
-            if not project.is_collaborator(value):
+            request = self.context.get("request")
+            project = request_cache.get_object(request, Project.objects.all(), self.initial_data.get("project"))
+            if not is_project_collaborator(request, project, value):
                 raise serializers.ValidationError(
                     {
                         "assignee": "Assignee must be from Project members"
@@ -147,6 +152,7 @@ class TaskDiscussionMessageSerializer(serializers.ModelSerializer):
     reply_of = serializers.SlugRelatedField(slug_field="text", read_only=True)
     created_by = serializers.SlugRelatedField(slug_field="username", read_only=True)
     modified_by = serializers.SlugRelatedField(slug_field="username", read_only=True)
+    is_editable = serializers.BooleanField(source="is_content_editable", read_only=True)
 
     class Meta:
         model = TaskDiscussionMessage
@@ -170,6 +176,7 @@ class TaskDiscussionCreateSerializer(serializers.ModelSerializer):
 
 
 class CommentSerializer(serializers.ModelSerializer):
+    is_editable = serializers.BooleanField(source="is_content_editable", read_only=True)
 
     def validate_content(self, value):
         if self.instance:
@@ -186,9 +193,316 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class TaskCommentThreadQuerySerializer(serializers.Serializer):
+    ORDER_LATEST = "latest"
+    ORDER_OLDEST = "oldest"
+    ORDERINGS = {
+        ORDER_LATEST: ("-created_at", "-id"),
+        ORDER_OLDEST: ("created_at", "id"),
+    }
+
+    order = serializers.ChoiceField(choices=[ORDER_LATEST, ORDER_OLDEST], default=ORDER_LATEST)
+    unread = serializers.BooleanField(default=False)
+
+    def get_ordering(self):
+        return self.ORDERINGS[self.validated_data["order"]]
+
+
+class TaskCommentThreadSerializer(serializers.ModelSerializer):
+    """
+    Renders comments annotated by `TaskCommentThreadView`: `author` is the
+    joined username and `is_read` is only present when the caller asked for
+    the unread marker. `content_editable` comes from
+    `EditableQuerySet.with_content_editable`.
+    """
+    created_by = serializers.CharField(source="author", read_only=True)
+    is_editable = serializers.BooleanField(source="content_editable", read_only=True)
+    unread = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TaskComment
+        fields = [
+            "id",
+            "content",
+            "reply_of",
+            "created_by",
+            "is_editable",
+            "unread",
+            "created_at",
+            "updated_at",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("unread"):
+            self.fields.pop("unread")
+
+    def get_unread(self, comment):
+        return not comment.is_read and comment.created_by_id != self.context["user_id"]
+
+
+class ReplyTreeQuerySerializer(serializers.Serializer):
+    """`depth` caps the levels below the root, `replies` the replies listed per node."""
+    depth = serializers.IntegerField(
+        min_value=0,
+        max_value=settings.REPLY_TREE_MAX_DEPTH,
+        default=settings.REPLY_TREE_MAX_DEPTH
+    )
+    replies = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.REPLY_TREE_MAX_REPLIES,
+        default=settings.REPLY_TREE_MAX_REPLIES
+    )
+
+
+class CommentReplyTreeSerializer(serializers.ModelSerializer):
+    """Renders a node built by `tasks.replies.get_reply_tree`, replies nested."""
+    created_by = serializers.CharField(source="author", read_only=True)
+    is_editable = serializers.BooleanField(source="is_content_editable", read_only=True)
+    has_more_replies = serializers.BooleanField(read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TaskComment
+        fields = [
+            "id",
+            "content",
+            "reply_of",
+            "created_by",
+            "is_editable",
+            "created_at",
+            "updated_at",
+            "has_more_replies",
+            "replies",
+        ]
+
+    def get_replies(self, node):
+        return type(self)(node.tree_replies, many=True, context=self.context).data
+
+
+class MessageReplyTreeSerializer(CommentReplyTreeSerializer):
+    class Meta(CommentReplyTreeSerializer.Meta):
+        model = TaskDiscussionMessage
+        fields = ["text" if field == "content" else field for field in CommentReplyTreeSerializer.Meta.fields]
+
+
+class TaskMarkReadSerializer(serializers.Serializer):
+    """`comment` defaults to the task's latest comment."""
+    comment = serializers.UUIDField(required=False)
+
+
+class TaskReadWatermarkSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskReadWatermark
+        fields = ["task", "last_read_comment", "last_read_at", "messages_read_at"]
+
+
 class TaskCommentSerializer(serializers.ModelSerializer):
     comments = CommentSerializer(many=True)
 
     class Meta:
         model = Task
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+class TaskSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    project = serializers.UUIDField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEARCH_MAX_RESULTS,
+        default=settings.SEARCH_DEFAULT_RESULTS
+    )
+
+
+class SearchResultSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    object_id = serializers.UUIDField()
+    task_id = serializers.UUIDField()
+    project_id = serializers.UUIDField()
+    title = serializers.CharField()
+    snippet = serializers.CharField()
+    score = serializers.FloatField()
+
+
+class TaskBulkItemSerializer(TaskCreateSerializer):
+    """
+    Validates a single bulk create item without touching the database.
+    Assignee usernames are resolved for the whole batch by the caller.
+    """
+    assignee = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+
+    class Meta(TaskCreateSerializer.Meta):
+        fields = [
+            "title",
+            "description",
+            "assignee",
+            "due_date",
+            "priority",
+            "status",
+            "completed",
+        ]
+        read_only_fields = []
+
+    def validate_assignee(self, value):
+        return value or None
+
+    def validate(self, attrs):
+        if attrs.get("status") is None:
+            attrs.pop("status", None)
+        return attrs
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    tasks = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.TASK_BULK_MAX_ITEMS
+    )
+    atomic = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        project = self.context["project"]
+        valid, errors = [], []
+        for index, item in enumerate(attrs["tasks"]):
+            item_serializer = TaskBulkItemSerializer(data=item)
+            if item_serializer.is_valid():
+                valid.append((index, item_serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": item_serializer.errors})
+
+        members = project.get_members_by_username(
+            [data["assignee"] for _, data in valid if data.get("assignee")]
+        )
+        rows = []
+        for index, data in valid:
+            username = data.pop("assignee", None)
+            if username and username not in members:
+                errors.append({"index": index, "errors": {"assignee": ["Assignee must be from Project members"]}})
+                continue
+            rows.append({**data, "assignee": members.get(username)})
+
+        attrs["rows"] = rows
+        attrs["errors"] = sorted(errors, key=lambda error: error["index"])
+        return attrs
+
+
+class TaskBulkPatchSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    assignee = serializers.CharField(required=False, allow_null=True)
+    completed = serializers.BooleanField(required=False)
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """
+    Selects tasks by `ids` or by a task list `filter` and applies either a
+    `patch` or a soft `delete` to all of them. The validated `changes` are
+    ready to be passed to `QuerySet.update()`.
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.TASK_BULK_MAX_ITEMS,
+        required=False
+    )
+    filter = serializers.DictField(required=False)
+    patch = TaskBulkPatchSerializer(required=False)
+    delete = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        project = self.context["project"]
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide exactly one of ids or filter")
+        patch = attrs.get("patch") or {}
+        if bool(patch) == attrs["delete"]:
+            raise serializers.ValidationError("Provide either a non-empty patch or delete")
+
+        if "filter" in attrs:
+            filters = TaskFilterSerializer(data=attrs["filter"])
+            if not filters.is_valid():
+                raise serializers.ValidationError({"filter": filters.errors})
+            if not any(value is not None for key, value in filters.validated_data.items() if key != "sort"):
+                # An empty filter would select every task of the project.
+                raise serializers.ValidationError({"filter": ["Provide at least one filter"]})
+            attrs["filters"] = filters
+
+        if attrs["delete"]:
+            attrs["changes"] = {"is_active": False}
+            return attrs
+
+        changes = dict(patch)
+        username = changes.get("assignee")
+        if username:
+            members = project.get_members_by_username([username])
+            if username not in members:
+                raise serializers.ValidationError({"patch": {"assignee": ["Assignee must be from Project members"]}})
+            changes["assignee"] = members[username]
+        attrs["changes"] = changes
+        return attrs
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Places a task in a board column right after the `after` task or right
+    before the `before` task. Without either it goes to the end of the column.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    after = serializers.UUIDField(required=False, allow_null=True)
+    before = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get("after") and attrs.get("before"):
+            raise serializers.ValidationError("Provide only one of after or before")
+        return attrs
+
+
+class TaskExportSerializer(serializers.Serializer):
+    """
+    Export options. The output format is named `export_format` because
+    `format` is reserved for DRF's format suffix negotiation.
+    """
+    export_format = serializers.ChoiceField(
+        choices=[export.FORMAT_CSV, export.FORMAT_NDJSON],
+        default=export.FORMAT_CSV
+    )
+    stream = serializers.ChoiceField(
+        choices=[export.STREAM_TASKS, export.STREAM_COMMENTS, export.STREAM_MESSAGES],
+        default=export.STREAM_TASKS
+    )
+    include = CommaSeparatedChoiceField(
+        choices=[(export.STREAM_COMMENTS, "Comments"), (export.STREAM_MESSAGES, "Discussion messages")],
+        required=False
+    )
+
+    def validate(self, attrs):
+        if attrs.get("include") and (
+            attrs["export_format"] != export.FORMAT_NDJSON or attrs["stream"] != export.STREAM_TASKS
+        ):
+            raise serializers.ValidationError(
+                {"include": "Nested records are only available in the ndjson tasks stream"}
+            )
+        return attrs
+
+
+class TaskImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=FORMATS, required=False)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedTask
+        fields = [
+            "id",
+            "project",
+            "title",
+            "status",
+            "reason",
+            "archived_at",
+        ]
+
+
+class ArchivedTaskDetailSerializer(ArchivedTaskSerializer):
+    class Meta(ArchivedTaskSerializer.Meta):
+        fields = ArchivedTaskSerializer.Meta.fields + ["payload"]
+
@@ -0,0 +1,248 @@
+import asyncio
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from mini_jira.cache import bump_generation
+from tasks import counters, search
+from tasks.ranking import rank_between, ranks_between, spread_ranks
+from mini_jira.serializers import optimize_queryset
+from tasks.consumers import ProjectUpdateConsumer, TaskUpdateConsumer
+from tasks.models import Task, TaskComment, TaskDiscussionMessage
+from tasks.serializers import TaskDetailSerializer
+
+
+def broadcast_project_event(project_id, event_type, data):
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        ProjectUpdateConsumer.get_group_name(project_id),
+        {
+            "type": event_type,
+            "data": data
+        }
+    )
+
+
+def bulk_create_tasks(project, user, rows, batch_size=None):
+    """
+    Inserts validated task rows with bulk_create.
+
+    bulk_create skips the per-row post_save handlers, so the work they do
+    (search indexing, task counters and response cache invalidation) is
+    done here once for the whole batch. Callers broadcast the aggregated event.
+    """
+    batch_size = batch_size or settings.TASK_BULK_CREATE_BATCH_SIZE
+    tasks = [
+        Task(project=project, created_by=user, modified_by=user, **row)
+        for row in rows
+    ]
+    with transaction.atomic():
+        assign_column_ranks(project, tasks)
+        Task.objects.bulk_create(tasks, batch_size=batch_size)
+        search.index_new_tasks(tasks, batch_size=batch_size)
+        deltas = Counter()
+        for task in tasks:
+            deltas.update(counters.get_counter_deltas(None, task.get_counter_state()))
+        counters.apply_counter_deltas(deltas)
+    bump_generation(project.id)
+    return tasks
+
+
+def assign_column_ranks(project, tasks):
+    """Appends new tasks to the end of their board columns, spread evenly after the last card."""
+    last_ranks = dict(
+        Task.objects.filter(project=project, is_active=True)
+        .values("status")
+        .annotate(last_rank=Max("rank"))
+        .values_list("status", "last_rank")
+    )
+    columns = {}
+    for task in tasks:
+        columns.setdefault(task.status, []).append(task)
+    for column, column_tasks in columns.items():
+        ranks = ranks_between(last_ranks.get(column) or None, None, len(column_tasks))
+        for task, rank in zip(column_tasks, ranks):
+            task.rank = rank
+
+
+def move_task(task, user, column=None, after=None, before=None):
+    """
+    Moves `task` into `column` next to a neighbour card. Only the moved row
+    is written: its new rank is picked between the neighbour and the card on
+    the other side of it. Raises Task.DoesNotExist when the neighbour is not
+    an active card of the column.
+    """
+    column = column or task.status
+    low, high = get_neighbour_ranks(task, column, after, before)
+    if "" in (low, high):
+        # Cards without a rank cannot be placed against, the column gets
+        # ranks first.
+        rebalance_column(task.project_id, column)
+        low, high = get_neighbour_ranks(task, column, after, before)
+
+    task.status = column
+    task.rank = rank_between(low, high)
+    task.modified_by = user
+    task.save(update_fields=["status", "rank", "modified_by", "updated_at"])
+    return task
+
+
+def get_neighbour_ranks(task, column, after=None, before=None):
+    """The ranks `task` is placed between when moved after or before a card of `column`."""
+    cards = Task.objects.filter(
+        project_id=task.project_id, status=column, is_active=True
+    ).exclude(id=task.id).values_list("rank", flat=True)
+    if after:
+        low = cards.get(id=after)
+        return low, cards.filter(rank__gt=low).order_by("rank").first()
+    if before:
+        high = cards.get(id=before)
+        return cards.filter(rank__lt=high).order_by("-rank").first(), high
+    return cards.order_by("-rank").first(), None
+
+
+def rebalance_column(project_id, column, batch_size=None):
+    """Rewrites the ranks of a board column with short, evenly spaced keys, keeping the order."""
+    batch_size = batch_size or settings.TASK_RANK_REBALANCE_BATCH_SIZE
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(project_id=project_id, status=column, is_active=True)
+            .order_by("rank", "id")
+            .only("id", "rank")
+        )
+        now = timezone.now()
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            task.rank = rank
+            task.updated_at = now
+        # bulk_update skips the post_save handlers, the rendered ranks
+        # changed all the same.
+        Task.objects.bulk_update(tasks, ["rank", "updated_at"], batch_size=batch_size)
+    bump_generation(project_id)
+    return len(tasks)
+
+
+def append_to_columns(task_ids, status, batch_size):
+    """Gives tasks just moved to the `status` column ranks at its end, keeping their order."""
+    moved = Task.objects.filter(id__in=task_ids).order_by("project_id", "rank", "id").only("id", "project_id", "rank")
+    projects = {}
+    for task in moved:
+        projects.setdefault(task.project_id, []).append(task)
+    for project_id, tasks in projects.items():
+        last = Task.objects.filter(
+            project_id=project_id, status=status, is_active=True
+        ).exclude(id__in=task_ids).order_by("-rank").values_list("rank", flat=True).first()
+        for task, rank in zip(tasks, ranks_between(last or None, None, len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ["rank"], batch_size=batch_size)
+
+
+def get_columns_to_rebalance(max_length):
+    """Returns the (project_id, status) columns holding a rank longer than `max_length`."""
+    return list(
+        Task.objects.filter(is_active=True)
+        .values("project_id", "status")
+        .annotate(longest=Max(Length("rank")))
+        .filter(longest__gt=max_length)
+        .values_list("project_id", "status")
+    )
+
+
+def expire_editable(batch_size=None, max_batches=None, progress=None):
+    """
+    Clears `is_editable` on comments and messages whose edit window is over,
+    one batch of ids per query. Reads never depend on it, so the job only
+    keeps the flag in step with `created_at`. Returns the number of rows updated.
+    """
+    batch_size = batch_size or settings.EDITABLE_EXPIRE_BATCH_SIZE
+    expired, batches = 0, 0
+    for model in (TaskComment, TaskDiscussionMessage):
+        while max_batches is None or batches < max_batches:
+            ids = list(model.objects.expired().values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            expired += model.objects.filter(id__in=ids).update(is_editable=False)
+            batches += 1
+            if progress:
+                progress(model, expired)
+    return expired
+
+
+def broadcast_task_updates(tasks):
+    """Sends the task_update event of every task room from a single event loop hop."""
+    channel_layer = get_channel_layer()
+    messages = [
+        (
+            TaskUpdateConsumer.get_group_name(task.id),
+            {
+                "type": TaskUpdateConsumer.EVENT_TYPE_TASK_UPDATE,
+                "data": TaskDetailSerializer(task).data
+            }
+        )
+        for task in tasks
+    ]
+
+    async def send_all():
+        await asyncio.gather(*[
+            channel_layer.group_send(group, message) for group, message in messages
+        ])
+
+    if messages:
+        async_to_sync(send_all)()
+
+
+def bulk_update_tasks(user, queryset, changes, batch_size=None):
+    """
+    Applies `changes` to the tasks in `queryset` the user may modify.
+
+    Permissions are resolved for the whole selection with one query: like
+    `TaskDetailView.put`, only the creator or the assignee of a task may
+    change it. The update runs as one `UPDATE ... WHERE id IN` per batch,
+    which skips `save()` and its post_save handlers, so the task counters,
+    the task room broadcast and the project cache invalidation are handled
+    here. The caller broadcasts a single project event for the whole
+    selection.
+    Returns the (updated, forbidden) task ids.
+    """
+    batch_size = batch_size or settings.TASK_BULK_UPDATE_BATCH_SIZE
+    allowed, forbidden, project_ids = [], [], set()
+    state_changes = {
+        "assignee_id" if field == "assignee" else field: (
+            getattr(value, "id", None) if field == "assignee" else value
+        )
+        for field, value in changes.items()
+    }
+    deltas = Counter()
+    for task_id, created_by_id, *state in queryset.values_list("id", "created_by_id", *Task.COUNTER_FIELDS):
+        state = dict(zip(Task.COUNTER_FIELDS, state))
+        if user.id in (created_by_id, state["assignee_id"]):
+            allowed.append(task_id)
+            project_ids.add(state["project_id"])
+            deltas.update(counters.get_counter_deltas(state, {**state, **state_changes}))
+        else:
+            forbidden.append(task_id)
+
+    changes = {**changes, "modified_by": user, "updated_at": timezone.now()}
+    with transaction.atomic():
+        for start in range(0, len(allowed), batch_size):
+            batch = allowed[start:start + batch_size]
+            Task.objects.filter(id__in=batch).update(**changes)
+        if "status" in changes:
+            append_to_columns(allowed, changes["status"], batch_size)
+        counters.apply_counter_deltas(deltas)
+
+    for project_id in project_ids:
+        bump_generation(project_id)
+    updated = []
+    for start in range(0, len(allowed), batch_size):
+        batch = allowed[start:start + batch_size]
+        updated.extend(optimize_queryset(Task.objects.filter(id__in=batch), TaskDetailSerializer))
+    broadcast_task_updates(updated)
+    return allowed, forbidden
+
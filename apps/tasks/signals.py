@@ -1,16 +1,19 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
+from mini_jira.cache import bump_generation
+from tasks import counters, search
 from tasks.views import TaskDetailSerializer
 from tasks.consumers import TaskUpdateConsumer
-from tasks.models import Task
+from tasks.models import Task, TaskComment, TaskDiscussion, TaskDiscussionMessage, SearchEntry
 
 
 @receiver(post_save, sender=Task)
 def task_update_handler(sender, instance, created, **kwargs):
+    bump_generation(instance.project_id)
     channel_layer = get_channel_layer()
     serializer = TaskDetailSerializer(instance)
     async_to_sync(channel_layer.group_send)(
@@ -20,3 +23,58 @@ def task_update_handler(sender, instance, created, **kwargs):
             "data": serializer.data
         }
     )
+
+
+@receiver(post_save, sender=Task)
+def task_counter_handler(sender, instance, created, raw=False, **kwargs):
+    old_state = None if created else getattr(instance, "_counter_state", None)
+    if raw or (not created and old_state is None):
+        # Without the loaded state the old counters are unknown, the
+        # reconciliation command picks up the difference.
+        return
+    counters.apply_counter_deltas(counters.get_counter_deltas(old_state, instance.get_counter_state()))
+    instance.snapshot_counter_state()
+
+
+@receiver(post_save, sender=Task)
+def task_search_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and not {"title", "description"} & set(update_fields)):
+        return
+    search.index_task(instance)
+
+
+@receiver(post_save, sender=TaskComment)
+def comment_search_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and "content" not in update_fields):
+        return
+    search.index_comment(instance)
+
+
+@receiver(post_save, sender=TaskDiscussionMessage)
+def message_search_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and "text" not in update_fields):
+        return
+    search.index_message(instance)
+
+
+@receiver(post_save, sender=TaskDiscussion)
+def discussion_search_handler(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or (update_fields and "title" not in update_fields):
+        return
+    search.index_discussion_title(instance)
+
+
+@receiver(post_delete, sender=Task)
+def task_delete_handler(sender, instance, **kwargs):
+    bump_generation(instance.project_id)
+    counters.apply_counter_deltas(counters.get_counter_deltas(instance.get_counter_state(), None))
+
+
+@receiver(post_delete, sender=TaskComment)
+def comment_search_delete_handler(sender, instance, **kwargs):
+    search.remove_entry(SearchEntry.KIND_COMMENT, instance.id)
+
+
+@receiver(post_delete, sender=TaskDiscussionMessage)
+def message_search_delete_handler(sender, instance, **kwargs):
+    search.remove_entry(SearchEntry.KIND_MESSAGE, instance.id)
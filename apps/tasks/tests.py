@@ -1,4 +1,5 @@
 import pytest
+import importlib
 import uuid
 from rest_framework import status
 from django.urls import reverse
@@ -16,8 +17,32 @@ import pytest
 from rest_framework import status
 from django.urls import reverse
 from rest_framework.test import APIClient
-from tasks.models import Task, TaskComment, TaskDiscussion
+import csv
+import gzip
+import io
+import json
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from tasks.models import (
+    CommentReadReceipt,
+    SearchEntry,
+    Task,
+    TaskComment,
+    TaskDiscussion,
+    TaskDiscussionMessage,
+    TaskReadWatermark
+)
+from tasks.serializers import CommentSerializer
 from projects.models import Project
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from tasks.consumers import ProjectUpdateConsumer, TaskUpdateConsumer
+from tasks.views import TaskListView, TaskBulkCreateView, TaskBulkUpdateView, TaskSummaryView, TaskBoardView, TaskDetailView, TaskDiscussionView, TaskCommentView, TaskCommentThreadView, TaskUnreadCountView, CommentReplyTreeView
+from mini_jira.testing import record_queries, assert_no_sequential_scans, assert_query_budget
 
 @pytest.fixture
 def api_client():
@@ -89,7 +114,8 @@ def test_task_list(api_client, user, project):
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert isinstance(response.data, list)
+    assert isinstance(response.data["results"], list)
+    assert response.data["next"] is None
 
 
 # Test Case 2: Create Task for a Project
@@ -238,3 +264,1202 @@ def test_task_comment_mark_as_read_not_found(api_client, user):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data["detail"] == "Comment not found."
 
+
+
+# Test Case 14: List Tasks walks every page through the cursor
+@pytest.mark.django_db
+def test_task_list_cursor_pagination(api_client, user, project):
+    Task.objects.bulk_create([
+        Task(title=f"Task {i}", description="", project=project, created_by=user)
+        for i in range(7)
+    ])
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+
+    seen = []
+    response = api_client.get(url, {"page_size": 3})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 3
+        seen.extend(row["id"] for row in response.data["results"])
+        if not response.data["next"]:
+            break
+        response = api_client.get(response.data["next"])
+
+    expected = Task.objects.filter(project=project).order_by("created_at", "id")
+    assert seen == [str(task_id) for task_id in expected.values_list("id", flat=True)]
+
+
+# Test Case 15: List Tasks unpaginated opt-in keeps the old response shape
+@pytest.mark.django_db
+def test_task_list_unpaginated(api_client, user, task):
+    url = reverse("task_list", kwargs={"project_uuid": task.project_id})
+    response = api_client.get(url, {"paginate": "false"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.data, list)
+    assert response.data[0]["id"] == str(task.id)
+
+
+# Test Case 16: List Tasks with a malformed cursor
+@pytest.mark.django_db
+def test_task_list_invalid_cursor(api_client, user, project):
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+    response = api_client.get(url, {"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.fixture
+def large_dataset(user, organization, project):
+    """Fixture to seed enough rows that a sequential scan would show up in query plans."""
+    projects = Project.objects.bulk_create([
+        Project(
+            name=f"Project {i}",
+            description="",
+            created_by=user,
+            organization_id=organization.id
+        )
+        for i in range(20)
+    ])
+    tasks = Task.objects.bulk_create([
+        Task(
+            title=f"Task {i}",
+            description="",
+            project=target,
+            assignee=user,
+            status=Task.STATUS_CHOICES[i % 3][0],
+            is_active=bool(i % 5),
+            created_by=user,
+        )
+        for target in [project, *projects]
+        for i in range(250)
+    ])
+    project_tasks = [task for task in tasks if task.project_id == project.id and task.is_active]
+    TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=user)
+        for task in project_tasks[:100]
+        for i in range(5)
+    ])
+    discussions = TaskDiscussion.objects.bulk_create([
+        TaskDiscussion(task=task, title="Discussion", created_by=user)
+        for task in project_tasks[:100]
+    ])
+    TaskDiscussionMessage.objects.bulk_create([
+        TaskDiscussionMessage(discussion=discussion, text=f"Message {i}", created_by=user)
+        for discussion in discussions
+        for i in range(5)
+    ])
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return project_tasks[0]
+
+
+TASK_TABLES = [
+    "tasks_task",
+    "tasks_taskcomment",
+    "tasks_taskdiscussion",
+    "tasks_taskdiscussionmessage",
+]
+
+
+# Test Case 17: Every task endpoint reads the task tables through an index
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name, kwarg, params", [
+    ("task_list", "project_uuid", {}),
+    ("task_list", "project_uuid", {"paginate": "false"}),
+    ("task_list", "project_uuid", {"status": "TODO,DONE"}),
+    ("task_list", "project_uuid", {"assignee": "johndoe", "completed": "false"}),
+    ("task_list", "project_uuid", {"due_after": "2025-01-01T00:00:00Z"}),
+    ("task_list", "project_uuid", {"updated_since": "2025-01-01T00:00:00Z", "sort": "-updated_at"}),
+    ("task_board", "project_uuid", {}),
+    ("task_board", "project_uuid", {"column": "DONE"}),
+    ("task_detail", "uuid", {}),
+    ("task_discussion", "task_uuid", {}),
+    ("task_comments", "task_uuid", {}),
+])
+def test_task_endpoints_use_indexes(api_client, user, large_dataset, url_name, kwarg, params):
+    value = large_dataset.project_id if kwarg == "project_uuid" else large_dataset.id
+    url = reverse(url_name, kwargs={kwarg: value})
+
+    with record_queries() as recorder:
+        response = api_client.get(url, params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert_no_sequential_scans(recorder, TASK_TABLES)
+
+
+@pytest.fixture
+def seed_rows(user, project, task):
+    """Fixture to fill every collection a task endpoint renders with `rows` rows."""
+    def seed(rows):
+        Task.objects.bulk_create([
+            Task(
+                title=f"Task {i}",
+                description="",
+                project=project,
+                assignee=user,
+                created_by=user,
+                modified_by=user,
+            )
+            for i in range(rows - 1)
+        ])
+        TaskComment.objects.bulk_create([
+            TaskComment(task=task, content=f"Comment {i}", created_by=user, modified_by=user)
+            for i in range(rows)
+        ])
+        discussions = TaskDiscussion.objects.bulk_create([
+            TaskDiscussion(task=task, title=f"Discussion {i}", created_by=user)
+            for i in range(rows)
+        ])
+        TaskDiscussionMessage.objects.bulk_create([
+            TaskDiscussionMessage(discussion=discussion, text="Message", created_by=user)
+            for discussion in discussions
+        ])
+    return seed
+
+
+# Test Case 18: Task endpoints stay within their query budget regardless of row count
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1, 100, 10000])
+@pytest.mark.parametrize("view_class, url_name, kwarg, params", [
+    (TaskListView, "task_list", "project_uuid", {}),
+    (TaskListView, "task_list", "project_uuid", {"paginate": "false"}),
+    (TaskBoardView, "task_board", "project_uuid", {}),
+    (TaskDetailView, "task_detail", "uuid", {}),
+    (TaskDiscussionView, "task_discussion", "task_uuid", {}),
+    (TaskCommentView, "task_comments", "task_uuid", {}),
+    (TaskCommentThreadView, "task_comment_thread", "task_uuid", {"unread": "true"}),
+])
+def test_task_endpoints_query_budget(api_client, task, seed_rows, rows, view_class, url_name, kwarg, params):
+    seed_rows(rows)
+    value = task.project_id if kwarg == "project_uuid" else task.id
+    url = reverse(url_name, kwargs={kwarg: value})
+
+    with assert_query_budget(view_class, "GET"):
+        response = api_client.get(url, params)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+# Test Case 19: List Tasks filtered and sorted on the server
+@pytest.mark.django_db
+def test_task_list_filters(api_client, user, member_user, project):
+    project.members.add(member_user)
+    now = timezone.now()
+    todo, done, other = Task.objects.bulk_create([
+        Task(title="Todo", description="", project=project, created_by=user,
+             assignee=user, priority=Task.PRIORITY_High, due_date=now + timezone.timedelta(days=1)),
+        Task(title="Done", description="", project=project, created_by=user, status=Task.STATUS_DONE,
+             completed=True, assignee=member_user, due_date=now - timezone.timedelta(days=1)),
+        Task(title="Other", description="", project=project, created_by=user, status=Task.STATUS_IN_PROGRESS),
+    ])
+    for offset, created in enumerate([todo, done, other]):
+        Task.objects.filter(id=created.id).update(created_at=now + timezone.timedelta(seconds=offset))
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+
+    def titles(params):
+        response = api_client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [row["title"] for row in response.data["results"]]
+
+    assert titles({"status": "TODO,DONE"}) == ["Todo", "Done"]
+    assert titles({"priority": "High"}) == ["Todo"]
+    assert titles({"assignee": "janedoe"}) == ["Done"]
+    assert titles({"completed": "true"}) == ["Done"]
+    assert titles({"due_after": now.isoformat()}) == ["Todo"]
+    assert titles({"due_before": now.isoformat()}) == ["Done"]
+    assert titles({"sort": "-created_at"}) == ["Other", "Done", "Todo"]
+
+    Task.objects.filter(id=other.id).update(updated_at=now + timezone.timedelta(hours=1))
+    assert titles({"updated_since": (now + timezone.timedelta(minutes=30)).isoformat()}) == ["Other"]
+
+
+# Test Case 20: List Tasks with invalid filter values
+@pytest.mark.django_db
+def test_task_list_invalid_filters(api_client, user, project):
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+    response = api_client.get(url, {"status": "TODO,UNKNOWN", "sort": "title"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "status" in response.data
+    assert "sort" in response.data
+
+
+# Test Case 21: Search tasks, comments and discussion messages
+@pytest.mark.django_db
+def test_task_search(api_client, user, project, task):
+    task.title = "Payment gateway outage"
+    task.save()
+    comment = TaskComment.objects.create(task=task, content="The gateway returns timeouts", created_by=user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Postmortem", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Rollback the gateway deploy", created_by=user)
+    TaskComment.objects.create(task=task, content="Unrelated note", created_by=user)
+
+    response = api_client.get(reverse("task_search"), {"q": "gateway"})
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["results"]
+    assert [result["kind"] for result in results][0] == "task"
+    assert sorted(result["kind"] for result in results) == ["comment", "message", "task"]
+    assert all("<mark>" in result["snippet"] for result in results)
+
+    TaskComment.objects.create(task=task, content="<img src=x onerror=alert(1)> escalation", created_by=user)
+    response = api_client.get(reverse("task_search"), {"q": "escalation"})
+    assert response.data["results"][0]["snippet"] == "&lt;img src=x onerror=alert(1)&gt; <mark>escalation</mark>"
+
+    discussion.title = "Retrospective"
+    discussion.save()
+    response = api_client.get(reverse("task_search"), {"q": "retrospective"})
+    assert [result["kind"] for result in response.data["results"]] == ["message"]
+
+    comment.delete()
+    response = api_client.get(reverse("task_search"), {"q": "timeouts"})
+    assert response.data["results"] == []
+
+
+# Test Case 22: Search is scoped to the caller's active tasks
+@pytest.mark.django_db
+def test_task_search_scope(api_client, user, member_user, organization, task):
+    other_project = Project.objects.create(
+        name="Other", description="", created_by=member_user, organization_id=organization.id
+    )
+    Task.objects.create(title="Gateway secret", description="", project=other_project, created_by=member_user)
+    Task.objects.create(title="Gateway retired", description="", project=task.project, created_by=user).delete_object()
+
+    response = api_client.get(reverse("task_search"), {"q": "gateway"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
+
+    response = api_client.get(reverse("task_search"), {"q": "gateway", "project": other_project.id})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Test Case 23: Rebuild the search index in batches
+@pytest.mark.django_db
+def test_rebuild_search_index(api_client, user, project):
+    Task.objects.bulk_create([
+        Task(title=f"Imported {i}", description="legacy tracker", project=project, created_by=user)
+        for i in range(5)
+    ])
+    response = api_client.get(reverse("task_search"), {"q": "legacy"})
+    assert response.data["results"] == []
+    # Left behind by a row deleted without its signals.
+    task = Task.objects.create(title="Indexed", description="legacy tracker", project=project, created_by=user)
+    SearchEntry.objects.create(
+        kind=SearchEntry.KIND_COMMENT, object_id=uuid.uuid4(), task=task, project=project, body="legacy tracker"
+    )
+
+    call_command("rebuild_search_index", batch_size=2, stdout=io.StringIO())
+
+    response = api_client.get(reverse("task_search"), {"q": "legacy", "project": project.id})
+    assert sorted(result["kind"] for result in response.data["results"]) == ["task"] * 6
+    assert SearchEntry.objects.count() == 6
+
+
+# Test Case 24: Get Task Detail answers 304 while the task is unchanged
+@pytest.mark.django_db
+def test_task_detail_conditional_get(api_client, user, task):
+    url = reverse("task_detail", kwargs={"uuid": task.id})
+    response = api_client.get(url)
+    etag = response["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    api_client.put(url, {"title": "Renamed"}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["title"] == "Renamed"
+
+
+# Test Case 25: List Tasks validator changes when a task is soft deleted
+@pytest.mark.django_db
+def test_task_list_conditional_get(api_client, user, project, task):
+    other = Task.objects.create(title="Other", description="", project=project, created_by=user)
+    Task.objects.filter(id=other.id).update(updated_at=task.updated_at - timezone.timedelta(minutes=1))
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+    etag = api_client.get(url)["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # The newest updated_at in the list stays the same, only the row count moves.
+    Task.objects.get(id=other.id).delete_object()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 1
+
+    response = api_client.get(url, {"status": "DONE"}, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == status.HTTP_200_OK
+    assert "Last-Modified" not in response
+
+
+# Test Case 26: List Tasks is served from the response cache until a task changes
+@pytest.mark.django_db
+def test_task_list_response_cache(api_client, user, project, task):
+    url = reverse("task_list", kwargs={"project_uuid": project.id})
+    stats_url = reverse("cache_stats")
+    before = api_client.get(stats_url).data["responses"]["task_list"]
+
+    api_client.get(url)
+    with CaptureQueriesContext(connection) as cached:
+        response = api_client.get(url)
+    assert [row["title"] for row in response.data["results"]] == ["Test Task"]
+    assert not any('"tasks_task"."title"' in query["sql"] for query in cached.captured_queries)
+
+    after = api_client.get(stats_url).data["responses"]["task_list"]
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+    task.title = "Renamed"
+    task.save()
+    response = api_client.get(url)
+    assert [row["title"] for row in response.data["results"]] == ["Renamed"]
+
+    task.delete_object()
+    response = api_client.get(url)
+    assert response.data["results"] == []
+
+
+# Test Case 27: Bulk create reports per-item errors and broadcasts one event
+@pytest.mark.django_db
+def test_task_bulk_create(api_client, user, member_user, project):
+    project.members.add(member_user)
+    outsider = User.objects.create_user(username="outsider", email="outsider@example.com", password="password123")
+    channel_layer = get_channel_layer()
+    channel_name = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(ProjectUpdateConsumer.get_group_name(project.id), channel_name)
+
+    url = reverse("task_bulk_create", kwargs={"project_uuid": project.id})
+    data = {
+        "tasks": [
+            {"title": "First", "assignee": "janedoe", "priority": "High"},
+            {"title": "Second", "status": "UNKNOWN"},
+            {"title": "Third", "assignee": outsider.username},
+            {"title": "Fourth", "description": "Searchable import"},
+        ]
+    }
+    response = api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [task["title"] for task in response.data["created"]] == ["First", "Fourth"]
+    assert response.data["created"][0]["assignee"] == "janedoe"
+    assert [error["index"] for error in response.data["errors"]] == [1, 2]
+    assert "status" in response.data["errors"][0]["errors"]
+    assert Task.objects.filter(project=project).count() == 2
+
+    event = async_to_sync(channel_layer.receive)(channel_name)
+    assert event["type"] == ProjectUpdateConsumer.EVENT_TYPE_TASKS_CREATED
+    assert event["data"]["count"] == 2
+
+    response = api_client.get(reverse("task_search"), {"q": "searchable"})
+    assert [result["title"] for result in response.data["results"]] == ["Fourth"]
+
+
+# Test Case 28: Bulk create in atomic mode creates nothing when any item fails
+@pytest.mark.django_db
+def test_task_bulk_create_atomic(api_client, user, project):
+    url = reverse("task_bulk_create", kwargs={"project_uuid": project.id})
+    data = {"atomic": True, "tasks": [{"title": "Valid"}, {"description": "No title"}]}
+    response = api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errors"][0]["index"] == 1
+    assert Task.objects.filter(project=project).count() == 0
+
+
+# Test Case 29: Bulk create runs a constant number of queries per insert batch
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1, 100])
+def test_task_bulk_create_query_budget(api_client, user, project, rows):
+    url = reverse("task_bulk_create", kwargs={"project_uuid": project.id})
+    data = {"tasks": [{"title": f"Task {i}", "assignee": "johndoe"} for i in range(rows)]}
+
+    with assert_query_budget(TaskBulkCreateView, "POST"):
+        response = api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data["created"]) == rows
+
+
+# Test Case 30: Bulk update applies a patch to permitted tasks and reports the rest
+@pytest.mark.django_db
+def test_task_bulk_update(api_client, user, member_user, project, task):
+    project.members.add(member_user)
+    foreign = Task.objects.create(title="Foreign", project=project, created_by=member_user, modified_by=member_user)
+    channel_layer = get_channel_layer()
+    channel_name = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(ProjectUpdateConsumer.get_group_name(project.id), channel_name)
+    task_channel = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(TaskUpdateConsumer.get_group_name(task.id), task_channel)
+
+    missing = uuid.uuid4()
+    url = reverse("task_bulk_update", kwargs={"project_uuid": project.id})
+    data = {
+        "ids": [str(task.id), str(foreign.id), str(missing)],
+        "patch": {"status": "IN_PROGRESS", "assignee": "janedoe"},
+    }
+    response = api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["updated"] == [task.id]
+    assert response.data["forbidden"] == [foreign.id]
+    assert response.data["not_found"] == [missing]
+    task.refresh_from_db()
+    foreign.refresh_from_db()
+    assert (task.status, task.assignee, task.modified_by) == ("IN_PROGRESS", member_user, user)
+    assert foreign.status != "IN_PROGRESS"
+
+    event = async_to_sync(channel_layer.receive)(task_channel)
+    assert event["type"] == TaskUpdateConsumer.EVENT_TYPE_TASK_UPDATE
+    assert event["data"]["assignee"]["username"] == "janedoe"
+    event = async_to_sync(channel_layer.receive)(channel_name)
+    assert event["type"] == ProjectUpdateConsumer.EVENT_TYPE_TASKS_UPDATED
+    assert event["data"]["ids"] == [str(task.id)]
+    assert event["data"]["changes"]["assignee"] == "janedoe"
+
+    data["patch"]["assignee"] = "outsider"
+    response = api_client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 31: Bulk update soft deletes the tasks matched by a filter
+@pytest.mark.django_db
+def test_task_bulk_update_filter_delete(api_client, user, project):
+    for index in range(3):
+        Task.objects.create(
+            title=f"Task {index}",
+            project=project,
+            status="DONE" if index else "TODO",
+            created_by=user,
+            modified_by=user,
+        )
+    list_url = reverse("task_list", kwargs={"project_uuid": project.id})
+    assert len(api_client.get(list_url).data["results"]) == 3
+
+    url = reverse("task_bulk_update", kwargs={"project_uuid": project.id})
+    response = api_client.post(url, {"filter": {"status": ["DONE"]}, "delete": True}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["updated"]) == 2
+    assert [row["title"] for row in api_client.get(list_url).data["results"]] == ["Task 0"]
+
+    response = api_client.post(url, {"filter": {"status": "DONE"}, "patch": {"status": "TODO"}, "delete": True}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # A filter must narrow the selection, and may not select more than a bulk request allows.
+    response = api_client.post(url, {"filter": {"sort": "created_at"}, "delete": True}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    with override_settings(TASK_BULK_MAX_ITEMS=0):
+        response = api_client.post(url, {"filter": {"status": "TODO"}, "delete": True}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Task.objects.filter(project=project, is_active=True).count() == 1
+
+
+# Test Case 32: Bulk update runs a constant number of queries per update batch
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1, 100])
+def test_task_bulk_update_query_budget(api_client, user, project, rows):
+    Task.objects.bulk_create([
+        Task(title=f"Task {i}", project=project, created_by=user, modified_by=user) for i in range(rows)
+    ])
+    url = reverse("task_bulk_update", kwargs={"project_uuid": project.id})
+    data = {"filter": {"status": "TODO"}, "patch": {"priority": "High", "assignee": "johndoe"}}
+
+    with assert_query_budget(TaskBulkUpdateView, "POST"):
+        response = api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["updated"]) == rows
+    assert Task.objects.filter(project=project, priority="High").count() == rows
+
+
+# Test Case 33: Board summary follows task writes through the maintained counters
+@pytest.mark.django_db
+def test_task_summary(api_client, user, member_user, project, task):
+    project.members.add(member_user)
+    url = reverse("task_summary", kwargs={"project_uuid": project.id})
+    yesterday = timezone.now() - timezone.timedelta(days=1)
+
+    api_client.put(
+        reverse("task_detail", kwargs={"uuid": task.id}),
+        {"status": "IN_PROGRESS", "priority": "High", "due_date": yesterday.isoformat()},
+        format="json"
+    )
+    api_client.post(
+        reverse("task_bulk_create", kwargs={"project_uuid": project.id}),
+        {"tasks": [{"title": "Second", "assignee": "janedoe"}, {"title": "Third", "status": "DONE"}]},
+        format="json"
+    )
+    third = Task.objects.get(title="Third")
+    api_client.post(
+        reverse("task_bulk_update", kwargs={"project_uuid": project.id}),
+        {"ids": [str(third.id)], "delete": True},
+        format="json"
+    )
+
+    with assert_query_budget(TaskSummaryView):
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total"] == 2
+    assert response.data["status"] == {"TODO": 1, "IN_PROGRESS": 1, "DONE": 0}
+    assert response.data["priority"]["High"] == 1
+    assert response.data["assignee"] == {"unassigned": 1, "janedoe": 1}
+    assert response.data["overdue"] == 1
+
+    task.refresh_from_db()
+    task.status = "DONE"
+    task.save()
+    response = api_client.get(url)
+    assert response.data["overdue"] == 0
+    assert response.data["status"]["DONE"] == 1
+
+
+# Test Case 34: Counter reconciliation reports and repairs drift
+@pytest.mark.django_db
+def test_reconcile_task_counters(user, project, task):
+    Task.objects.filter(id=task.id).update(status="DONE")
+
+    out = io.StringIO()
+    call_command("reconcile_task_counters", "--dry-run", stdout=out)
+    assert "status=TODO: stored 1, actual 0" in out.getvalue()
+    assert "status=DONE: stored 0, actual 1" in out.getvalue()
+
+    out = io.StringIO()
+    call_command("reconcile_task_counters", "--batch-size", "1", stdout=out)
+    assert "2 counters repaired" in out.getvalue()
+
+    out = io.StringIO()
+    call_command("reconcile_task_counters", stdout=out)
+    assert "Task counters are in sync" in out.getvalue()
+
+
+# Test Case 35: Board pages every status column independently in rank order
+@pytest.mark.django_db
+def test_task_board(api_client, user, project):
+    for index in range(3):
+        Task.objects.create(title=f"Todo {index}", project=project, created_by=user, modified_by=user)
+    Task.objects.create(title="Done", project=project, status="DONE", created_by=user, modified_by=user)
+
+    url = reverse("task_board", kwargs={"project_uuid": project.id})
+    response = api_client.get(url, {"page_size": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    columns = {column["status"]: column for column in response.data["columns"]}
+    assert list(columns) == ["TODO", "IN_PROGRESS", "DONE"]
+    assert [task["title"] for task in columns["TODO"]["results"]] == ["Todo 0", "Todo 1"]
+    assert [task["title"] for task in columns["DONE"]["results"]] == ["Done"]
+    assert columns["DONE"]["next"] is None
+
+    response = api_client.get(columns["TODO"]["next"])
+    assert [column["status"] for column in response.data["columns"]] == ["TODO"]
+    assert [task["title"] for task in response.data["columns"][0]["results"]] == ["Todo 2"]
+
+    response = api_client.get(url, {"column": "UNKNOWN"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 36: Moving a card writes only the moved task
+@pytest.mark.django_db
+def test_task_move(api_client, user, member_user, project):
+    first, second, third = [
+        Task.objects.create(title=title, project=project, created_by=user, modified_by=user)
+        for title in ["First", "Second", "Third"]
+    ]
+    url = reverse("task_move", kwargs={"uuid": third.id})
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(url, {"after": str(first.id)}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    task_writes = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith(("UPDATE", "INSERT")) and '"tasks_task"' in query["sql"]
+    ]
+    assert len(task_writes) == 1
+
+    board_url = reverse("task_board", kwargs={"project_uuid": project.id})
+    todo = api_client.get(board_url, {"column": "TODO"}).data["columns"][0]["results"]
+    assert [task["title"] for task in todo] == ["First", "Third", "Second"]
+
+    response = api_client.post(
+        reverse("task_move", kwargs={"uuid": first.id}), {"status": "DONE"}, format="json"
+    )
+    assert response.data["status"] == "DONE"
+    response = api_client.post(
+        reverse("task_move", kwargs={"uuid": second.id}), {"before": str(first.id)}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # Like editing it, moving a card is up to the task's creator or assignee.
+    project.members.add(member_user)
+    api_client.force_authenticate(user=member_user)
+    response = api_client.post(url, {"status": "DONE"}, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    third.refresh_from_db()
+    assert third.status == "TODO"
+
+
+# Test Case 37: Rebalancing shortens long rank keys and keeps the column order
+@pytest.mark.django_db
+def test_rebalance_task_ranks(api_client, user, project):
+    titles = [f"Task {index}" for index in range(40)]
+    for title in titles:
+        Task.objects.create(title=title, project=project, created_by=user, modified_by=user)
+    assert Task.objects.filter(project=project, rank__regex=r"^.{3,}$").exists()
+    list_url = reverse("task_list", kwargs={"project_uuid": project.id})
+    etag = api_client.get(list_url)["ETag"]
+
+    out = io.StringIO()
+    call_command("rebalance_task_ranks", "--max-length", "2", stdout=out)
+
+    assert "1 columns rebalanced" in out.getvalue()
+    ordered = Task.objects.filter(project=project).order_by("rank")
+    assert [task.title for task in ordered] == titles
+    assert max(len(task.rank) for task in ordered) <= 2
+    # The list renders the ranks, neither its cache nor its validators may serve the old ones.
+    response = api_client.get(list_url, {"page_size": 100}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert {row["rank"] for row in response.data["results"]} == {task.rank for task in ordered}
+
+
+
+# Test Case 38: Export streams tasks as CSV with the related usernames joined in
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1, 100])
+def test_task_export_csv(api_client, user, member_user, project, seed_rows, rows):
+    seed_rows(rows)
+    Task.objects.filter(project=project).update(assignee=member_user)
+    url = reverse("task_export", kwargs={"project_uuid": project.id})
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, {"status": "TODO"})
+        content = b"".join(response.streaming_content).decode("utf-8")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"].startswith("text/csv")
+    lines = list(csv.DictReader(io.StringIO(content)))
+    assert len(lines) == Task.objects.filter(project=project, is_active=True, status="TODO").count()
+    assert {line["assignee"] for line in lines} == {"janedoe"}
+    assert len(context.captured_queries) <= 5
+
+
+# Test Case 39: NDJSON export nests comments and messages or streams them separately
+@pytest.mark.django_db
+def test_task_export_ndjson(api_client, user, project, task):
+    other = Task.objects.create(title="Other", project=project, created_by=user, modified_by=user)
+    TaskComment.objects.create(task=task, content="First comment", created_by=user)
+    TaskComment.objects.create(task=other, content="Other comment", created_by=user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Design", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Hello", created_by=user)
+    url = reverse("task_export", kwargs={"project_uuid": project.id})
+
+    response = api_client.get(url, {"export_format": "ndjson", "include": "comments,messages"})
+    records = {
+        record["title"]: record
+        for record in map(json.loads, b"".join(response.streaming_content).splitlines())
+    }
+    assert [comment["content"] for comment in records["Test Task"]["comments"]] == ["First comment"]
+    assert [message["text"] for message in records["Test Task"]["messages"]] == ["Hello"]
+    assert [comment["content"] for comment in records["Other"]["comments"]] == ["Other comment"]
+    assert records["Other"]["messages"] == []
+
+    response = api_client.get(url, {"export_format": "ndjson", "stream": "comments"})
+    comments = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert sorted(comment["content"] for comment in comments) == ["First comment", "Other comment"]
+
+    response = api_client.get(url, {"include": "comments"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Test Case 40: Export is gzip compressed on the fly when the client accepts it
+@pytest.mark.django_db
+def test_task_export_gzip(api_client, user, project, task):
+    url = reverse("task_export", kwargs={"project_uuid": project.id})
+    response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+    assert response["Content-Encoding"] == "gzip"
+    content = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8")
+    assert content.splitlines()[1].startswith(str(task.id))
+
+
+# Test Case 41: Import endpoint inserts valid rows and sends one summary event
+@pytest.mark.django_db
+def test_task_import_upload(api_client, user, member_user, project):
+    project.members.add(member_user)
+    channel_layer = get_channel_layer()
+    channel_name = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(ProjectUpdateConsumer.get_group_name(project.id), channel_name)
+
+    content = (
+        "title,description,assignee,priority,status,due_date\n"
+        "First,Imported,janedoe,High,TODO,\n"
+        "Second,,outsider,,,\n"
+        "Third,,,Urgent,,\n"
+        "Fourth,,johndoe,,DONE,2030-01-01T00:00:00Z\n"
+    ).encode("utf-8") + "Fifth,Caf\u00e9,,,,\n".encode("latin-1")
+    upload = SimpleUploadedFile("tasks.csv", content, content_type="text/csv")
+    url = reverse("task_import", kwargs={"project_uuid": project.id})
+    response = api_client.post(url, {"file": upload}, format="multipart")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert (response.data["created"], response.data["failed"]) == (2, 3)
+    assert [error["row"] for error in response.data["errors"]] == [2, 3, 5]
+    imported = Task.objects.filter(project=project).order_by("title")
+    assert [(task.title, task.assignee.username) for task in imported] == [("First", "janedoe"), ("Fourth", "johndoe")]
+
+    event = async_to_sync(channel_layer.receive)(channel_name)
+    assert event["type"] == ProjectUpdateConsumer.EVENT_TYPE_TASKS_IMPORTED
+    assert event["data"] == {"count": 2, "failed": 3}
+
+
+# Test Case 42: Import command works in batches and resumes from its checkpoint
+@pytest.mark.django_db
+def test_import_tasks_command(user, project, tmp_path):
+    source = tmp_path / "tasks.jsonl"
+    source.write_text("".join(json.dumps({"title": f"Task {i}"}) + "\n" for i in range(5)) + "not json\n")
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({
+        "project": str(project.id), "path": str(source), "processed": 2, "created": 2, "failed": 0
+    }))
+
+    out = io.StringIO()
+    call_command(
+        "import_tasks", str(project.id), str(source),
+        "--user", user.username, "--batch-size", "2", "--checkpoint", str(checkpoint),
+        stdout=out
+    )
+
+    assert "Resuming after row 2" in out.getvalue()
+    assert "5 tasks imported, 1 rows failed" in out.getvalue()
+    assert sorted(Task.objects.filter(project=project).values_list("title", flat=True)) == ["Task 2", "Task 3", "Task 4"]
+    assert json.loads(checkpoint.read_text())["processed"] == 6
+
+
+# Test Case 43: Archiving moves dead tasks with their children out of the live tables
+@pytest.mark.django_db
+def test_archive_tasks(api_client, user, member_user, project, task):
+    stale = timezone.now() - timezone.timedelta(days=400)
+    done = Task.objects.create(title="Done", project=project, status="DONE", created_by=user, modified_by=user)
+    Task.objects.filter(id=done.id).update(updated_at=stale)
+    recent = Task.objects.create(title="Recent", project=project, status="DONE", created_by=user, modified_by=user)
+    comment = TaskComment.objects.create(task=task, content="Archived comment", created_by=user)
+    comment.mark_as_read(user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Design", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Archived message", created_by=user)
+    task.delete_object()
+
+    out = io.StringIO()
+    call_command("archive_tasks", "--batch-size", "1", stdout=out)
+
+    assert "2 tasks archived" in out.getvalue()
+    assert list(Task.objects.values_list("id", flat=True)) == [recent.id]
+    assert not TaskComment.objects.exists() and not TaskDiscussionMessage.objects.exists()
+
+    response = api_client.get(reverse("archived_task_list", kwargs={"project_uuid": project.id}))
+    assert {row["title"]: row["reason"] for row in response.data["results"]} == {"Test Task": "inactive", "Done": "done"}
+    response = api_client.get(reverse("archived_task_detail", kwargs={"uuid": task.id}))
+    assert response.data["payload"]["comments"][0]["fields"]["content"] == "Archived comment"
+    assert len(response.data["payload"]["read_receipts"]) == 1
+
+    api_client.force_authenticate(user=member_user)
+    response = api_client.get(reverse("archived_task_detail", kwargs={"uuid": task.id}))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    # Picked while stale, reopened before its batch ran.
+    from tasks.archive import archive_batch
+    Task.objects.filter(id=recent.id).update(status="TODO")
+    assert archive_batch([recent.id], retention_days=1) == 0
+    assert Task.objects.filter(id=recent.id).exists()
+
+
+# Test Case 44: Restoring an archived task brings back the task and its children
+@pytest.mark.django_db
+def test_restore_archived_task(api_client, user, project, task):
+    comment = TaskComment.objects.create(task=task, content="Restored comment", created_by=user)
+    comment.mark_as_read(user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Design", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Restored message", created_by=user)
+    task.delete_object()
+    call_command("archive_tasks", stdout=io.StringIO())
+
+    response = api_client.post(reverse("archived_task_restore", kwargs={"uuid": task.id}))
+
+    assert response.status_code == status.HTTP_200_OK
+    restored = Task.objects.get(id=task.id)
+    assert restored.is_active
+    assert restored.comments.get().read_receipts.count() == 1
+    assert TaskDiscussionMessage.objects.filter(discussion__task=restored).count() == 1
+    summary = api_client.get(reverse("task_summary", kwargs={"project_uuid": project.id}))
+    assert summary.data["total"] == 1
+    results = api_client.get(reverse("task_search"), {"q": "restored"}).data["results"]
+    assert {result["kind"] for result in results} == {"comment", "message"}
+    response = api_client.post(reverse("archived_task_restore", kwargs={"uuid": task.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Test Case 45: Task detail loads the task with its project once, shared by the permission check and the view
+@pytest.mark.django_db
+def test_task_detail_loads_task_once(api_client, user, member_user, task):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse("task_detail", kwargs={"uuid": task.id}))
+
+    assert response.status_code == status.HTTP_200_OK
+    task_queries = [query["sql"] for query in context.captured_queries if 'FROM "tasks_task"' in query["sql"]]
+    assert len(task_queries) == 1
+    assert 'JOIN "projects_project"' in task_queries[0]
+
+    api_client.force_authenticate(user=member_user)
+    response = api_client.put(reverse("task_detail", kwargs={"uuid": task.id}), {"title": "Renamed"}, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+# Test Case 46: The request cache answers repeated and related lookups without a query
+@pytest.mark.django_db
+def test_request_cache_identity_map(rf, task):
+    from mini_jira import request_cache
+
+    request = rf.get("/")
+    with CaptureQueriesContext(connection) as context:
+        first = request_cache.get_object(request, Task.objects.select_related("project"), task.id)
+        second = request_cache.get_object(request, Task.objects.all(), str(task.id))
+        project = request_cache.get_object(request, Project.objects.all(), task.project_id)
+        missing_id = uuid.uuid4()
+        missing = request_cache.get_object(request, Task.objects.all(), missing_id)
+        missing_again = request_cache.get_object(request, Task.objects.all(), missing_id)
+
+    assert first is second
+    assert project is first.project
+    assert missing is None and missing_again is None
+    assert len(context.captured_queries) == 2
+
+
+# Test Case 47: Read-only endpoints authenticate from the token claims without loading the user
+@pytest.mark.django_db
+def test_task_list_stateless_user(user, project, task):
+    from authentication.serializers import ClaimsTokenObtainPairSerializer
+
+    client = APIClient()
+    access = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("task_list", kwargs={"project_uuid": project.id}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [query for query in context.captured_queries if 'FROM "accounts_user"' in query["sql"]]
+
+
+# Test Case 48: Comment thread pages through comments in both directions with an unread marker
+@pytest.mark.django_db
+def test_task_comment_thread(api_client, user, member_user, project, task):
+    project.members.add(member_user)
+    now = timezone.now()
+    comments = TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=member_user if i % 2 else user)
+        for i in range(5)
+    ])
+    for i, comment in enumerate(comments):
+        TaskComment.objects.filter(id=comment.id).update(created_at=now - timezone.timedelta(minutes=10 - i))
+    comments[1].mark_as_read(user)
+    url = reverse("task_comment_thread", kwargs={"task_uuid": task.id})
+
+    response = api_client.get(url, {"page_size": 2, "unread": "true"})
+    assert [row["content"] for row in response.data["results"]] == ["Comment 4", "Comment 3"]
+    assert [row["unread"] for row in response.data["results"]] == [False, True]
+    assert response.data["results"][1]["created_by"] == "janedoe"
+    assert response.data["results"][0]["is_editable"] is False
+
+    contents = []
+    next_url = f"{url}?order=oldest&page_size=2"
+    while next_url:
+        response = api_client.get(next_url)
+        contents += [row["content"] for row in response.data["results"]]
+        assert "unread" not in response.data["results"][0]
+        next_url = response.data["next"]
+    assert contents == [f"Comment {i}" for i in range(5)]
+    assert TaskComment.objects.filter(is_editable=False).count() == 0
+
+
+# Test Case 49: Editability is computed without writes, the expiry job flips the flags in batches
+@pytest.mark.django_db
+def test_comment_editability_expiry(user, task):
+    discussion = TaskDiscussion.objects.create(task=task, title="Release", created_by=user)
+    old = timezone.now() - timezone.timedelta(seconds=settings.COMMENT_EDIT_DURATION_SECONDS + 60)
+    comments = TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=user) for i in range(3)
+    ])
+    message = TaskDiscussionMessage.objects.create(discussion=discussion, text="Message", created_by=user)
+    TaskComment.objects.filter(id__in=[comments[0].id, comments[1].id]).update(created_at=old)
+    TaskDiscussionMessage.objects.filter(id=message.id).update(created_at=old)
+
+    with CaptureQueriesContext(connection) as queries:
+        comment = TaskComment.objects.get(id=comments[0].id)
+        assert comment.is_content_editable is False
+        serializer = CommentSerializer(comment, data={"content": "Edited"}, partial=True)
+        assert not serializer.is_valid()
+    assert len(queries) == 1
+    editable = dict(TaskComment.objects.with_content_editable().values_list("content", "content_editable"))
+    assert editable == {"Comment 0": False, "Comment 1": False, "Comment 2": True}
+
+    call_command("expire_editable", batch_size=1, stdout=io.StringIO())
+    assert set(TaskComment.objects.filter(is_editable=False).values_list("content", flat=True)) == {"Comment 0", "Comment 1"}
+    assert TaskDiscussionMessage.objects.get(id=message.id).is_editable is False
+    assert not TaskComment.objects.expired().exists()
+
+
+# Test Case 50: Bulk mark-read moves the watermark forward and keeps receipts only past it
+@pytest.mark.django_db
+def test_task_mark_read_watermark(api_client, user, member_user, project, task):
+    project.members.add(member_user)
+    now = timezone.now()
+    comments = TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=member_user) for i in range(4)
+    ])
+    for i, comment in enumerate(comments):
+        TaskComment.objects.filter(id=comment.id).update(created_at=now - timezone.timedelta(minutes=10 - i))
+    comments = list(TaskComment.objects.filter(task=task).order_by("created_at"))
+    comments[1].mark_as_read(user)
+    comments[3].mark_as_read(user)
+    url = reverse("task_comments_mark_read", kwargs={"task_uuid": task.id})
+
+    response = api_client.post(url, {"comment": str(comments[2].id)}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["last_read_comment"] == comments[2].id
+    assert list(CommentReadReceipt.objects.filter(user=user).values_list("task_comment_id", flat=True)) == [comments[3].id]
+    assert comments[0].mark_as_read(user) == (None, False)
+
+    # The watermark never moves back.
+    api_client.post(url, {"comment": str(comments[0].id)}, format="json")
+    assert TaskReadWatermark.objects.get(user=user, task=task).last_read_comment_id == comments[2].id
+
+    thread = api_client.get(reverse("task_comment_thread", kwargs={"task_uuid": task.id}), {"unread": "true"})
+    assert [row["unread"] for row in thread.data["results"]] == [False, False, False, False]
+
+    response = api_client.post(url, {"comment": str(uuid.uuid4())}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(url)
+    assert response.data["last_read_comment"] == comments[3].id
+    assert not CommentReadReceipt.objects.filter(user=user).exists()
+
+
+# Test Case 51: Compacting read receipts turns the unbroken read run into a watermark
+@pytest.mark.django_db
+def test_compact_read_receipts(user, member_user, task):
+    from django.apps import apps
+    compaction = importlib.import_module("tasks.migrations.0014_compact_read_receipts")
+    now = timezone.now()
+    comments = TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=user if i == 1 else member_user) for i in range(4)
+    ])
+    for i, comment in enumerate(comments):
+        TaskComment.objects.filter(id=comment.id).update(created_at=now - timezone.timedelta(minutes=10 - i))
+    for comment in (comments[0], comments[3]):
+        comment.mark_as_read(user)
+    comments[3].mark_as_read(member_user)
+
+    compaction.compact_read_receipts(apps, None)
+
+    watermark = TaskReadWatermark.objects.get(user=user, task=task)
+    assert watermark.last_read_comment_id == comments[1].id
+    assert set(CommentReadReceipt.objects.values_list("user_id", "task_comment_id")) == {
+        (user.id, comments[3].id),
+        (member_user.id, comments[3].id),
+    }
+    assert not TaskReadWatermark.objects.filter(user=member_user).exists()
+
+
+# Test Case 52: Unread counts cover every task of the caller's projects and drop with the watermarks
+@pytest.mark.django_db
+def test_task_unread_counts(api_client, user, member_user, organization, project, task):
+    project.members.add(member_user)
+    other_project = Project.objects.create(name="Other", created_by=user, organization_id=organization.id)
+    other_project.members.add(user)
+    other_task = Task.objects.create(title="Other Task", project=other_project, created_by=user)
+    hidden_project = Project.objects.create(name="Hidden", created_by=member_user, organization_id=organization.id)
+    hidden_task = Task.objects.create(title="Hidden Task", project=hidden_project, created_by=member_user)
+    comments = TaskComment.objects.bulk_create([
+        TaskComment(task=task, content=f"Comment {i}", created_by=member_user) for i in range(3)
+    ] + [
+        TaskComment(task=task, content="Own comment", created_by=user),
+        TaskComment(task=other_task, content="Other comment", created_by=member_user),
+        TaskComment(task=hidden_task, content="Hidden comment", created_by=member_user),
+    ])
+    comments[0].mark_as_read(user)
+    discussion = TaskDiscussion.objects.create(task=task, title="Release", created_by=user)
+    TaskDiscussionMessage.objects.bulk_create([
+        TaskDiscussionMessage(discussion=discussion, text="Message", created_by=member_user),
+        TaskDiscussionMessage(discussion=discussion, text="Message", created_by=member_user),
+        TaskDiscussionMessage(discussion=discussion, text="Own message", created_by=user),
+    ])
+    url = reverse("task_unread_counts")
+
+    with assert_query_budget(TaskUnreadCountView, "GET"):
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.data["comments"], response.data["messages"]) == (3, 2)
+    assert {row["task"]: (row["comments"], row["messages"]) for row in response.data["tasks"]} == {
+        task.id: (2, 2),
+        other_task.id: (1, 0),
+    }
+    assert {row["project"]: row["comments"] for row in response.data["projects"]} == {project.id: 2, other_project.id: 1}
+
+    other_project.request_deletion(user)
+    assert [row["task"] for row in api_client.get(url).data["tasks"]] == [task.id]
+
+    api_client.post(reverse("task_discussions_mark_read", kwargs={"task_uuid": task.id}))
+    response = api_client.get(url)
+    assert response.data["tasks"] == [{"task": task.id, "project": project.id, "comments": 2, "messages": 0}]
+
+    api_client.post(reverse("task_comments_mark_read", kwargs={"task_uuid": task.id}))
+    assert api_client.get(url).data == {"comments": 0, "messages": 0, "projects": [], "tasks": []}
+
+
+# Test Case 53: Reply trees come back nested from one query and are cut at the depth and breadth limits
+@pytest.mark.django_db
+def test_reply_trees(api_client, user, member_user, task):
+    root = TaskComment.objects.create(task=task, content="Root", created_by=user)
+    first = TaskComment.objects.create(task=task, content="First", reply_of=root, created_by=member_user)
+    second = TaskComment.objects.create(task=task, content="Second", reply_of=root, created_by=user)
+    TaskComment.objects.create(task=task, content="Third", reply_of=root, created_by=user)
+    nested = TaskComment.objects.create(task=task, content="Nested", reply_of=first, created_by=user)
+    TaskComment.objects.create(task=task, content="Deepest", reply_of=nested, created_by=user)
+    TaskComment.objects.create(task=task, content="Unrelated", created_by=user)
+    url = reverse("task_comment_tree", kwargs={"uuid": root.id})
+
+    with assert_query_budget(CommentReplyTreeView, "GET"):
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert [reply["content"] for reply in response.data["replies"]] == ["First", "Second", "Third"]
+    assert response.data["replies"][0]["created_by"] == "janedoe"
+    assert response.data["replies"][0]["replies"][0]["replies"][0]["content"] == "Deepest"
+
+    response = api_client.get(url, {"depth": 1, "replies": 2})
+    assert [reply["content"] for reply in response.data["replies"]] == ["First", "Second"]
+    assert response.data["has_more_replies"] is True
+    assert response.data["replies"][0]["has_more_replies"] is True
+    assert response.data["replies"][0]["replies"] == []
+    assert response.data["replies"][1]["has_more_replies"] is False
+
+    # Cut siblings are not walked, their replies do not use up the node budget.
+    for index in range(3):
+        TaskComment.objects.create(task=task, content=f"Second {index}", reply_of=second, created_by=user)
+    with override_settings(REPLY_TREE_MAX_NODES=4):
+        response = api_client.get(url, {"replies": 1})
+    assert response.data["has_more_replies"] is True
+    assert [reply["content"] for reply in response.data["replies"]] == ["First"]
+    assert response.data["replies"][0]["replies"][0]["content"] == "Nested"
+    assert response.data["replies"][0]["has_more_replies"] is False
+    with override_settings(REPLY_TREE_MAX_NODES=3):
+        response = api_client.get(url, {"replies": 1})
+    assert response.data["replies"][0]["replies"][0]["has_more_replies"] is True
+
+    subtree = api_client.get(reverse("task_comment_tree", kwargs={"uuid": first.id}))
+    assert subtree.data["reply_of"] == root.id
+    assert [reply["content"] for reply in subtree.data["replies"]] == ["Nested"]
+
+    discussion = TaskDiscussion.objects.create(task=task, title="Release", created_by=user)
+    message = TaskDiscussionMessage.objects.create(discussion=discussion, text="Ship it?", created_by=user)
+    TaskDiscussionMessage.objects.create(discussion=discussion, text="Yes", reply_of=message, created_by=member_user)
+    response = api_client.get(reverse("task_message_tree", kwargs={"uuid": message.id}))
+    assert response.data["text"] == "Ship it?"
+    assert [reply["text"] for reply in response.data["replies"]] == ["Yes"]
+
+    assert api_client.get(reverse("task_comment_tree", kwargs={"uuid": uuid.uuid4()})).status_code == status.HTTP_404_NOT_FOUND
+    api_client.force_authenticate(user=member_user)
+    assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+# Test Case 54: A restored DONE task is not archived again and only its creator or assignee may restore it
+@pytest.mark.django_db
+def test_restore_done_task(api_client, user, member_user, project, task):
+    project.members.add(member_user)
+    old = timezone.now() - timezone.timedelta(days=settings.TASK_ARCHIVE_RETENTION_DAYS + 1)
+    Task.objects.filter(id=task.id).update(status=Task.STATUS_DONE, updated_at=old)
+    call_command("archive_tasks", stdout=io.StringIO())
+    url = reverse("archived_task_restore", kwargs={"uuid": task.id})
+
+    api_client.force_authenticate(user=member_user)
+    assert api_client.post(url).status_code == status.HTTP_403_FORBIDDEN
+
+    api_client.force_authenticate(user=user)
+    assert api_client.post(url).status_code == status.HTTP_200_OK
+    out = io.StringIO()
+    call_command("archive_tasks", stdout=out)
+    assert "0 tasks archived" in out.getvalue()
+    assert Task.objects.filter(id=task.id, is_active=True).exists()
+
+
+# Test Case 55: Cards changing column go to its end, and cards without a rank can still be moved
+@pytest.mark.django_db
+def test_task_status_change_reranks(api_client, user, project):
+    first, second, third = [
+        Task.objects.create(title=title, project=project, created_by=user, modified_by=user)
+        for title in ["First", "Second", "Third"]
+    ]
+    done = Task.objects.create(title="Done", project=project, created_by=user, status=Task.STATUS_DONE)
+    board_url = reverse("task_board", kwargs={"project_uuid": project.id})
+
+    api_client.put(reverse("task_detail", kwargs={"uuid": first.id}), {"status": "DONE"}, format="json")
+    api_client.post(
+        reverse("task_bulk_update", kwargs={"project_uuid": project.id}),
+        {"ids": [str(second.id)], "patch": {"status": "DONE"}},
+        format="json",
+    )
+    column = api_client.get(board_url, {"column": "DONE"}).data["columns"][0]["results"]
+    assert [task["title"] for task in column] == ["Done", "First", "Second"]
+
+    Task.objects.filter(project=project).update(rank="")
+    response = api_client.post(reverse("task_move", kwargs={"uuid": third.id}), {"before": str(done.id), "status": "DONE"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    titles = [task["title"] for task in api_client.get(board_url, {"column": "DONE"}).data["columns"][0]["results"]]
+    assert titles.index("Third") == titles.index("Done") - 1
+
+
+# Test Case 56: Discussions, comments and archived tasks of a project being deleted are gone at once
+@pytest.mark.django_db
+def test_pending_deletion_hides_task_children(api_client, user, project, task):
+    comment = TaskComment.objects.create(task=task, content="Comment", created_by=user)
+    TaskDiscussion.objects.create(task=task, title="Design", created_by=user)
+    archived = Task.objects.create(title="Done", project=project, status=Task.STATUS_DONE, created_by=user, modified_by=user)
+    old = timezone.now() - timezone.timedelta(days=settings.TASK_ARCHIVE_RETENTION_DAYS + 1)
+    Task.objects.filter(id=archived.id).update(updated_at=old)
+    call_command("archive_tasks", stdout=io.StringIO())
+    project.request_deletion(user)
+
+    response = api_client.get(reverse("task_discussion", kwargs={"task_uuid": task.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = api_client.post(reverse("task_comments", kwargs={"comment_uuid": comment.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not CommentReadReceipt.objects.exists()
+    response = api_client.get(reverse("archived_task_list", kwargs={"project_uuid": project.id}))
+    assert response.data["results"] == []
+    response = api_client.get(reverse("archived_task_detail", kwargs={"uuid": archived.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = api_client.post(reverse("archived_task_restore", kwargs={"uuid": archived.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not Task.objects.filter(id=archived.id).exists()
+
+
+# Test Case 57: Only project members may listen to the project's updates
+@pytest.mark.django_db(transaction=True)
+def test_project_updates_require_membership(user, member_user, project):
+    from channels.testing import WebsocketCommunicator
+    from django.contrib.auth.models import AnonymousUser
+
+    async def connect(scope_user):
+        communicator = WebsocketCommunicator(ProjectUpdateConsumer.as_asgi(), f"/ws/project/{project.id}/updates")
+        communicator.scope["url_route"] = {"kwargs": {"uuid": project.id}}
+        communicator.scope["user"] = scope_user
+        connected, _ = await communicator.connect()
+        await communicator.disconnect()
+        return connected
+
+    assert async_to_sync(connect)(user)
+    assert not async_to_sync(connect)(member_user)
+    assert not async_to_sync(connect)(AnonymousUser())
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.db import connection
+
+from projects.models import Project
+from tasks.models import (
+    CommentReadReceipt,
+    Task,
+    TaskComment,
+    TaskDiscussion,
+    TaskDiscussionMessage,
+    TaskReadWatermark
+)
+
+
+# Stands in for a missing watermark, everything after it is unread.
+NEVER_READ = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Counted from the comments and messages past each watermark, grouped by
+# task, so tasks without anything unread never come back and read rows
+# are skipped through the (task, created_at) and (discussion, created_at)
+# indexes. A task with unread comments and messages comes back twice.
+UNREAD_SQL = """
+    SELECT task.id, task.project_id, COUNT(*), 0
+    FROM {members} member
+    JOIN {projects} project ON project.id = member.project_id
+    JOIN {tasks} task ON task.project_id = member.project_id
+    LEFT JOIN {watermarks} watermark ON watermark.task_id = task.id AND watermark.user_id = %(user)s
+    JOIN {comments} task_comment ON task_comment.task_id = task.id
+        AND task_comment.created_at > COALESCE(watermark.last_read_at, %(never)s)
+    WHERE member.user_id = %(user)s
+      AND NOT project.is_pending_deletion
+      AND task.is_active
+      AND task_comment.created_by_id != %(user)s
+      AND NOT EXISTS (
+          SELECT 1 FROM {receipts} receipt
+          WHERE receipt.task_comment_id = task_comment.id AND receipt.user_id = %(user)s
+      )
+    GROUP BY task.id, task.project_id
+    UNION ALL
+    SELECT task.id, task.project_id, 0, COUNT(*)
+    FROM {members} member
+    JOIN {projects} project ON project.id = member.project_id
+    JOIN {tasks} task ON task.project_id = member.project_id
+    LEFT JOIN {watermarks} watermark ON watermark.task_id = task.id AND watermark.user_id = %(user)s
+    JOIN {discussions} discussion ON discussion.task_id = task.id
+    JOIN {messages} task_message ON task_message.discussion_id = discussion.id
+        AND task_message.created_at > COALESCE(watermark.messages_read_at, %(never)s)
+    WHERE member.user_id = %(user)s
+      AND NOT project.is_pending_deletion
+      AND task.is_active
+      AND task_message.created_by_id != %(user)s
+    GROUP BY task.id, task.project_id
+"""
+
+
+def get_unread_tasks(user_id):
+    """
+    Active tasks of the user's projects that have unread comments or
+    messages, as (task id, project id, comments, messages) rows, in a
+    single query. Comments and messages the user wrote are never unread,
+    comments are also read through a receipt.
+    """
+    tables = {
+        "members": Project.members.through,
+        "projects": Project,
+        "tasks": Task,
+        "watermarks": TaskReadWatermark,
+        "comments": TaskComment,
+        "receipts": CommentReadReceipt,
+        "discussions": TaskDiscussion,
+        "messages": TaskDiscussionMessage,
+    }
+    sql = UNREAD_SQL.format(**{name: connection.ops.quote_name(model._meta.db_table) for name, model in tables.items()})
+    params = {
+        "user": user_id,
+        "never": TaskComment._meta.get_field("created_at").get_db_prep_value(NEVER_READ, connection),
+    }
+    to_uuid = Task._meta.pk.to_python
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            (to_uuid(task_id), to_uuid(project_id), comments, messages)
+            for task_id, project_id, comments, messages in cursor.fetchall()
+        ]
+
+
+def get_unread_counts(user_id):
+    """Unread counts per task and per project."""
+    tasks = {}
+    projects = defaultdict(lambda: {"comments": 0, "messages": 0})
+    for task_id, project_id, comments, messages in get_unread_tasks(user_id):
+        task = tasks.setdefault(task_id, {"task": task_id, "project": project_id, "comments": 0, "messages": 0})
+        task["comments"] += comments
+        task["messages"] += messages
+        projects[project_id]["comments"] += comments
+        projects[project_id]["messages"] += messages
+    return {
+        "comments": sum(counts["comments"] for counts in projects.values()),
+        "messages": sum(counts["messages"] for counts in projects.values()),
+        "projects": [{"project": project_id, **counts} for project_id, counts in projects.items()],
+        "tasks": list(tasks.values()),
+    }
@@ -3,16 +3,50 @@ from tasks.views import (
     TaskListView,
     TaskDetailView,
     TaskCreateView,
+    TaskBulkCreateView,
+    TaskBulkUpdateView,
+    TaskSummaryView,
+    TaskBoardView,
+    TaskMoveView,
+    TaskExportView,
+    TaskImportView,
     TaskDiscussionView,
     TaskCommentView,
-    CommentMarkAsReadView
+    TaskCommentThreadView,
+    CommentMarkAsReadView,
+    TaskMarkReadView,
+    TaskDiscussionMarkReadView,
+    TaskUnreadCountView,
+    CommentReplyTreeView,
+    MessageReplyTreeView,
+    TaskSearchView,
+    ArchivedTaskListView,
+    ArchivedTaskDetailView,
+    ArchivedTaskRestoreView
 )
 
 urlpatterns = [
     path("list/<uuid:project_uuid>", TaskListView.as_view(), name="task_list"),
     path("create/<uuid:project_uuid>", TaskCreateView.as_view(), name="task_create"),
+    path("bulk-create/<uuid:project_uuid>", TaskBulkCreateView.as_view(), name="task_bulk_create"),
+    path("bulk-update/<uuid:project_uuid>", TaskBulkUpdateView.as_view(), name="task_bulk_update"),
+    path("summary/<uuid:project_uuid>", TaskSummaryView.as_view(), name="task_summary"),
+    path("board/<uuid:project_uuid>", TaskBoardView.as_view(), name="task_board"),
+    path("move/<uuid:uuid>", TaskMoveView.as_view(), name="task_move"),
+    path("export/<uuid:project_uuid>", TaskExportView.as_view(), name="task_export"),
+    path("import/<uuid:project_uuid>", TaskImportView.as_view(), name="task_import"),
     path("detail/<uuid:uuid>", TaskDetailView.as_view(), name="task_detail"),
     path("discussions/<uuid:task_uuid>", TaskDiscussionView.as_view(), name="task_discussion"),
     path("comments/<uuid:task_uuid>", TaskCommentView.as_view(), name="task_comments"),
+    path("comments/thread/<uuid:task_uuid>", TaskCommentThreadView.as_view(), name="task_comment_thread"),
     path("comments/<uuid:comment_uuid>/mark-as-read/", CommentMarkAsReadView.as_view(), name="task_comments"),
+    path("comments/mark-read/<uuid:task_uuid>", TaskMarkReadView.as_view(), name="task_comments_mark_read"),
+    path("discussions/mark-read/<uuid:task_uuid>", TaskDiscussionMarkReadView.as_view(), name="task_discussions_mark_read"),
+    path("unread/", TaskUnreadCountView.as_view(), name="task_unread_counts"),
+    path("comments/tree/<uuid:uuid>", CommentReplyTreeView.as_view(), name="task_comment_tree"),
+    path("discussions/messages/tree/<uuid:uuid>", MessageReplyTreeView.as_view(), name="task_message_tree"),
+    path("search/", TaskSearchView.as_view(), name="task_search"),
+    path("archive/<uuid:project_uuid>", ArchivedTaskListView.as_view(), name="archived_task_list"),
+    path("archive/detail/<uuid:uuid>", ArchivedTaskDetailView.as_view(), name="archived_task_detail"),
+    path("archive/restore/<uuid:uuid>", ArchivedTaskRestoreView.as_view(), name="archived_task_restore"),
 ]
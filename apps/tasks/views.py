@@ -1,47 +1,144 @@
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from mini_jira.conditional import (
+    get_list_validators,
+    get_object_validators,
+    get_not_modified_response,
+    set_validators
+)
+from authentication.authentication import StatelessJWTAuthentication
+from mini_jira import request_cache
+from mini_jira.cache import ResponseCache
+from mini_jira.serializers import optimize_queryset
 from projects.models import Project
 from projects.permissions import ProjectCollaboratorPermission
-from tasks.models import Task, TaskComment, TaskDiscussion
+from tasks.models import (
+    ArchivedTask,
+    CommentReadReceipt,
+    Task,
+    TaskComment,
+    TaskDiscussion,
+    TaskDiscussionMessage,
+    TaskReadWatermark
+)
 from tasks.serializers import (
     TaskListSerializer,
     TaskCreateSerializer,
     TaskDetailSerializer,
     TaskDiscussionSerializer,
     TaskDiscussionCreateSerializer,
-    TaskCommentSerializer
+    TaskCommentSerializer,
+    TaskCommentThreadQuerySerializer,
+    TaskCommentThreadSerializer,
+    TaskMarkReadSerializer,
+    ReplyTreeQuerySerializer,
+    CommentReplyTreeSerializer,
+    MessageReplyTreeSerializer,
+    TaskReadWatermarkSerializer,
+    TaskSearchQuerySerializer,
+    SearchResultSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkUpdateSerializer,
+    TaskMoveSerializer,
+    TaskExportSerializer,
+    TaskImportSerializer,
+    ArchivedTaskSerializer,
+    ArchivedTaskDetailSerializer
+)
+from tasks.consumers import ProjectUpdateConsumer
+from tasks.services import bulk_create_tasks, bulk_update_tasks, broadcast_project_event, move_task
+from tasks import export
+from tasks.importer import import_tasks
+from tasks.readers import get_file_format, read_rows
+from tasks.search import search
+from tasks.counters import get_summary
+from tasks.filters import TaskFilterSerializer
+from tasks.unread import get_unread_counts
+from tasks.replies import get_reply_tree
+from tasks.archive import restore_task
+from tasks.pagination import (
+    ArchivedTaskPagination,
+    TaskBoardPagination,
+    TaskCommentPagination,
+    TaskCursorPagination
 )
-from tasks.permissions import TaskCollaboratorPermission
+from tasks.permissions import (
+    ArchivedTaskPermission,
+    ReplyTreePermission,
+    TaskCollaboratorPermission,
+    TaskEditPermission,
+    get_task_queryset
+)
+
+
+task_list_cache = ResponseCache("task_list")
+
+
+def get_active_task(request, queryset, uuid):
+    """Loads the task through the request cache, which the permission check already filled."""
+    task = request_cache.get_object(request, queryset, uuid)
+    if task and task.is_active and not task.project.is_pending_deletion:
+        return task
+    return None
+
+
+def get_archived_task(request, uuid):
+    """Same as `get_active_task`, archived tasks of a project being deleted are gone as well."""
+    archived_task = request_cache.get_object(request, ArchivedTask.objects.select_related("project"), uuid)
+    if archived_task and not archived_task.project.is_pending_deletion:
+        return archived_task
+    return None
 
 
 class TaskListView(APIView):
     permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    pagination_class = TaskCursorPagination
+    query_budgets = {"GET": 4}
 
     def get_project_object(self, uuid):
-        try:
-            return Project.objects.get(id=uuid)
-        except Project.DoesNotExist:
-            return None
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
 
     def get(self, request, project_uuid):
         project = self.get_project_object(project_uuid)
         if project:
-            tasks = Task.objects.filter(project=project, is_active=True)
-            serializer = TaskListSerializer(tasks, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            filters = TaskFilterSerializer(data=request.query_params.dict())
+            if not filters.is_valid():
+                return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+            tasks = filters.filter_queryset(Task.objects.filter(project=project, is_active=True))
+            etag, last_modified = get_list_validators(request, tasks)
+            not_modified = get_not_modified_response(request, etag, last_modified)
+            if not_modified:
+                return not_modified
+
+            data = task_list_cache.get(request, project.id)
+            if data is None:
+                data = task_list_cache.set(request, project.id, self.get_data(request, tasks, filters))
+            return set_validators(Response(data, status=status.HTTP_200_OK), etag, last_modified)
         return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
 
+    def get_data(self, request, tasks, filters):
+        tasks = optimize_queryset(tasks, TaskListSerializer)
+        # Full unpaginated list is kept for clients that explicitly opt in.
+        if request.query_params.get("paginate") == "false":
+            return TaskListSerializer(tasks.order_by(*filters.get_ordering()), many=True).data
+        paginator = self.pagination_class(ordering=filters.get_ordering())
+        page = paginator.paginate_queryset(tasks, request, view=self)
+        serializer = TaskListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
 
 class TaskCreateView(APIView):
     permission_classes = [ProjectCollaboratorPermission,]
 
     def get_project_object(self, uuid):
-        try:
-            return Project.objects.get(id=uuid)
-        except Project.DoesNotExist:
-            return None
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
 
     def post(self, request, project_uuid):
         project = self.get_project_object(project_uuid)
@@ -55,20 +152,257 @@ class TaskCreateView(APIView):
         return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
 
 
-class TaskDetailView(APIView):
-    permission_classes = [TaskCollaboratorPermission,]
+class TaskBulkCreateView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    query_budgets = {"POST": 11}
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def post(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TaskBulkCreateSerializer(data=request.data, context={"project": project})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, errors = serializer.validated_data["rows"], serializer.validated_data["errors"]
+        if not rows or (errors and serializer.validated_data["atomic"]):
+            return Response({"created": [], "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = bulk_create_tasks(project, request.user, rows)
+        broadcast_project_event(
+            project.id,
+            ProjectUpdateConsumer.EVENT_TYPE_TASKS_CREATED,
+            {"ids": [str(task.id) for task in tasks], "count": len(tasks)}
+        )
+        data = {"created": TaskListSerializer(tasks, many=True).data, "errors": errors}
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class TaskBulkUpdateView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    query_budgets = {"POST": 11}
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def post(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TaskBulkUpdateSerializer(data=request.data, context={"project": project})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        tasks = Task.objects.filter(project=project, is_active=True)
+        if "ids" in data:
+            tasks = tasks.filter(id__in=data["ids"])
+        else:
+            tasks = data["filters"].filter_queryset(tasks)
+            if tasks[:settings.TASK_BULK_MAX_ITEMS + 1].count() > settings.TASK_BULK_MAX_ITEMS:
+                return Response(
+                    {"filter": [f"The filter matches more than {settings.TASK_BULK_MAX_ITEMS} tasks"]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        updated, forbidden = bulk_update_tasks(request.user, tasks, data["changes"])
+        found = set(updated) | set(forbidden)
+        not_found = [task_id for task_id in data.get("ids", []) if task_id not in found]
+        if updated:
+            broadcast_project_event(
+                project.id,
+                ProjectUpdateConsumer.EVENT_TYPE_TASKS_UPDATED,
+                {
+                    "ids": [str(task_id) for task_id in updated],
+                    "count": len(updated),
+                    "changes": data.get("patch") or {"is_active": False}
+                }
+            )
+        return Response(
+            {"updated": updated, "forbidden": forbidden, "not_found": not_found},
+            status=status.HTTP_200_OK
+        )
+
+
+class TaskSummaryView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    query_budgets = {"GET": 5}
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def get(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if project:
+            return Response(get_summary(project), status=status.HTTP_200_OK)
+        return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class TaskBoardView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    pagination_class = TaskBoardPagination
+    query_budgets = {"GET": 5}
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def get(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        columns = [choice for choice, _ in Task.STATUS_CHOICES]
+        column = request.query_params.get(self.pagination_class.column_query_param)
+        if column:
+            if column not in columns:
+                return Response(
+                    {"column": f"Invalid column. Please choose from: {', '.join(columns)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            columns = [column]
+
+        tasks = optimize_queryset(Task.objects.filter(project=project, is_active=True), TaskListSerializer)
+        data = []
+        for column in columns:
+            paginator = self.pagination_class(column)
+            page = paginator.paginate_queryset(tasks.filter(status=column), request, view=self)
+            data.append({
+                "status": column,
+                "next": paginator.get_next_link(),
+                "results": TaskListSerializer(page, many=True).data,
+            })
+        return Response({"columns": data}, status=status.HTTP_200_OK)
+
+
+class TaskMoveView(APIView):
+    permission_classes = [TaskEditPermission,]
+
+    def get_task_queryset(self):
+        return Task.objects.select_related("project")
 
     def get_object(self, uuid):
+        return get_active_task(self.request, self.get_task_queryset(), uuid)
+
+    def post(self, request, uuid):
+        instance = self.get_object(uuid)
+        if not instance:
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TaskMoveSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         try:
-            return Task.objects.get(id=uuid, is_active=True)
+            data = serializer.validated_data
+            move_task(instance, request.user, data.get("status"), data.get("after"), data.get("before"))
         except Task.DoesNotExist:
-            return None
+            return Response(
+                {"detail": "Neighbour task not found in the column."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(TaskListSerializer(instance).data, status=status.HTTP_200_OK)
+
+
+class TaskExportView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    renderer_classes = [*APIView.renderer_classes, export.CSVRenderer, export.NDJSONRenderer]
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def get(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        options = TaskExportSerializer(data=request.query_params.dict())
+        filters = TaskFilterSerializer(data=request.query_params.dict())
+        if not options.is_valid():
+            return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = options.validated_data
+        tasks = filters.filter_queryset(Task.objects.filter(project=project, is_active=True))
+        chunks = export.export(
+            tasks,
+            export_format=data["export_format"],
+            stream=data["stream"],
+            include=data.get("include") or (),
+            chunk_size=settings.TASK_EXPORT_CHUNK_SIZE
+        )
+        compress = export.accepts_gzip(request)
+        response = StreamingHttpResponse(
+            export.gzip_chunks(chunks) if compress else chunks,
+            content_type=export.CONTENT_TYPES[data["export_format"]]
+        )
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        response["Vary"] = "Accept-Encoding"
+        response["Content-Disposition"] = (
+            f'attachment; filename="{data["stream"]}-{project.id}.{data["export_format"]}"'
+        )
+        return response
+
+
+class TaskImportView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    parser_classes = [MultiPartParser,]
+
+    def get_project_object(self, uuid):
+        return request_cache.get_object(self.request, Project.objects.all(), uuid)
+
+    def post(self, request, project_uuid):
+        project = self.get_project_object(project_uuid)
+        if not project:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TaskImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        upload = serializer.validated_data["file"]
+        file_format = serializer.validated_data.get("file_format") or get_file_format(upload.name)
+        if not file_format:
+            return Response(
+                {"file_format": "Unknown file format, please choose from: csv, jsonl"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = import_tasks(project, request.user, read_rows(upload.file, file_format))
+        broadcast_project_event(
+            project.id,
+            ProjectUpdateConsumer.EVENT_TYPE_TASKS_IMPORTED,
+            {"count": result["created"], "failed": result["failed"]}
+        )
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+class TaskDetailView(APIView):
+    permission_classes = [TaskCollaboratorPermission,]
+    query_budgets = {"GET": 2}
+
+    def get_task_queryset(self):
+        return optimize_queryset(Task.objects.select_related("project"), TaskDetailSerializer)
+
+    def get_object(self, uuid):
+        return get_active_task(self.request, self.get_task_queryset(), uuid)
 
     def get(self, request, uuid):
         instance = self.get_object(uuid)
         if instance:
+            etag, last_modified = get_object_validators(request, instance)
+            not_modified = get_not_modified_response(request, etag, last_modified)
+            if not_modified:
+                return not_modified
             serializer = TaskDetailSerializer(instance)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return set_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, last_modified)
         return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
 
     def put(self, request, uuid):
@@ -97,15 +431,19 @@ class TaskDetailView(APIView):
 
 class TaskDiscussionView(APIView):
     permission_classes = [TaskCollaboratorPermission,]
+    query_budgets = {"GET": 4}
 
     def get_task_object(self, uuid):
-        try:
-            return Task.objects.get(id=uuid, is_active=True)
-        except Task.DoesNotExist:
-            return None
+        return get_active_task(self.request, get_task_queryset(self), uuid)
 
     def get(self, request, task_uuid):
-        discussions = TaskDiscussion.objects.filter(task=task_uuid)
+        task = self.get_task_object(task_uuid)
+        if not task:
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+        discussions = optimize_queryset(
+            TaskDiscussion.objects.filter(task=task),
+            TaskDiscussionSerializer
+        )
         serializer = TaskDiscussionSerializer(discussions, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -123,12 +461,13 @@ class TaskDiscussionView(APIView):
 
 class TaskCommentView(APIView):
     permission_classes = [TaskCollaboratorPermission,]
+    query_budgets = {"GET": 3}
+
+    def get_task_queryset(self):
+        return optimize_queryset(Task.objects.select_related("project"), TaskCommentSerializer)
 
     def get_task_object(self, uuid):
-        try:
-            return Task.objects.get(id=uuid, is_active=True)
-        except Task.DoesNotExist:
-            return None
+        return get_active_task(self.request, self.get_task_queryset(), uuid)
 
     def get(self, request, task_uuid):
         instance = self.get_task_object(task_uuid)
@@ -136,14 +475,47 @@ class TaskCommentView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class TaskCommentThreadView(APIView):
+    """
+    One page of a task's comments, latest or oldest first. Pass `unread=true`
+    to mark the comments the caller has not read yet.
+    """
+    permission_classes = [TaskCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    pagination_class = TaskCommentPagination
+    query_budgets = {"GET": 3}
+
+    def get_task_object(self, uuid):
+        return get_active_task(self.request, get_task_queryset(self), uuid)
+
+    def get(self, request, task_uuid):
+        task = self.get_task_object(task_uuid)
+        if not task:
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+        query = TaskCommentThreadQuerySerializer(data=request.query_params.dict())
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        comments = TaskComment.objects.filter(task=task).with_content_editable().annotate(author=F("created_by__username"))
+        unread = query.validated_data["unread"]
+        if unread:
+            watermark = TaskReadWatermark.objects.filter(task=task, user_id=request.user.id).values("last_read_at")
+            comments = comments.annotate(is_read=Exists(
+                CommentReadReceipt.objects.filter(task_comment=OuterRef("pk"), user_id=request.user.id)
+            ) | Q(created_at__lte=Subquery(watermark)))
+        paginator = self.pagination_class(ordering=query.get_ordering())
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = TaskCommentThreadSerializer(page, many=True, context={"unread": unread, "user_id": request.user.id})
+        return paginator.get_paginated_response(serializer.data)
+
+
 class CommentMarkAsReadView(APIView):
     permission_classes = [TaskCollaboratorPermission,]
 
     def get_object(self, uuid):
-        try:
-            return TaskComment.objects.get(id=uuid)
-        except TaskComment.DoesNotExist:
-            return None
+        return TaskComment.objects.filter(
+            id=uuid, task__is_active=True, task__project__is_pending_deletion=False
+        ).first()
 
     def post(self, request, comment_uuid):
         instance = self.get_object(comment_uuid)
@@ -151,3 +523,180 @@ class CommentMarkAsReadView(APIView):
             instance.mark_as_read(request.user)
             return Response(status=status.HTTP_200_OK)
         return Response({"detail": "Comment not found."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class TaskMarkReadView(APIView):
+    """Marks every comment of the task up to `comment`, or the latest one, as read in one call."""
+    permission_classes = [TaskCollaboratorPermission,]
+
+    def get_task_object(self, uuid):
+        return get_active_task(self.request, get_task_queryset(self), uuid)
+
+    def post(self, request, task_uuid):
+        task = self.get_task_object(task_uuid)
+        if not task:
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TaskMarkReadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        comments = TaskComment.objects.filter(task=task)
+        comment_uuid = serializer.validated_data.get("comment")
+        if comment_uuid:
+            comment = comments.filter(id=comment_uuid).first()
+            if not comment:
+                return Response({"comment": ["Comment not found on this task."]}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            comment = comments.order_by("-created_at", "-id").first()
+            if not comment:
+                watermark = TaskReadWatermark.objects.filter(user=request.user, task=task).first()
+                return Response(TaskReadWatermarkSerializer(watermark or TaskReadWatermark(task=task)).data, status=status.HTTP_200_OK)
+
+        watermark = TaskReadWatermark.advance(request.user, task, comment)
+        return Response(TaskReadWatermarkSerializer(watermark).data, status=status.HTTP_200_OK)
+
+
+class TaskDiscussionMarkReadView(APIView):
+    """Marks every discussion message of the task as read."""
+    permission_classes = [TaskCollaboratorPermission,]
+
+    def get_task_object(self, uuid):
+        return get_active_task(self.request, get_task_queryset(self), uuid)
+
+    def post(self, request, task_uuid):
+        task = self.get_task_object(task_uuid)
+        if not task:
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+        read_at = TaskDiscussionMessage.objects.filter(discussion__task=task).order_by("-created_at").values_list(
+            "created_at", flat=True
+        ).first()
+        if not read_at:
+            watermark = TaskReadWatermark.objects.filter(user=request.user, task=task).first()
+            return Response(TaskReadWatermarkSerializer(watermark or TaskReadWatermark(task=task)).data, status=status.HTTP_200_OK)
+        watermark = TaskReadWatermark.advance_messages(request.user, task, read_at)
+        return Response(TaskReadWatermarkSerializer(watermark).data, status=status.HTTP_200_OK)
+
+
+class TaskUnreadCountView(APIView):
+    """Unread comment and discussion message counts of the caller, per task and per project."""
+    authentication_classes = [StatelessJWTAuthentication,]
+    query_budgets = {"GET": 1}
+
+    def get(self, request):
+        return Response(get_unread_counts(request.user.id), status=status.HTTP_200_OK)
+
+
+class CommentReplyTreeView(APIView):
+    """A comment with its replies nested, cut at `depth` levels and `replies` per node."""
+    permission_classes = [ReplyTreePermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    query_budgets = {"GET": 3}
+    model = TaskComment
+    serializer_class = CommentReplyTreeSerializer
+
+    def get_root_object(self):
+        return request_cache.get_object(
+            self.request, self.model.objects.select_related("task__project"), self.kwargs["uuid"]
+        )
+
+    def get_task(self, root):
+        return root.task
+
+    def get(self, request, uuid):
+        root = self.get_root_object()
+        task = root and self.get_task(root)
+        if not task or not task.is_active or task.project.is_pending_deletion:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        query = ReplyTreeQuerySerializer(data=request.query_params.dict())
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tree = get_reply_tree(
+            self.model,
+            root.id,
+            max_depth=query.validated_data["depth"],
+            max_replies=query.validated_data["replies"],
+            max_nodes=settings.REPLY_TREE_MAX_NODES,
+        )
+        return Response(self.serializer_class(tree).data, status=status.HTTP_200_OK)
+
+
+class MessageReplyTreeView(CommentReplyTreeView):
+    model = TaskDiscussionMessage
+    serializer_class = MessageReplyTreeSerializer
+
+    def get_root_object(self):
+        return request_cache.get_object(
+            self.request, self.model.objects.select_related("discussion__task__project"), self.kwargs["uuid"]
+        )
+
+    def get_task(self, root):
+        return root.discussion.task
+
+
+class TaskSearchView(APIView):
+
+    def get(self, request):
+        query = TaskSearchQuerySerializer(data=request.query_params.dict())
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Searches cover the caller's projects within their organizations only.
+        projects = Project.objects.filter(
+            members=request.user,
+            organization__in=request.user.organizations_organization.all()
+        )
+        if query.validated_data.get("project"):
+            projects = projects.filter(id=query.validated_data["project"])
+        project_ids = list(projects.values_list("id", flat=True))
+        if query.validated_data.get("project") and not project_ids:
+            return Response({"detail": "Project not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        results = search(query.validated_data["q"], project_ids, query.validated_data["limit"])
+        serializer = SearchResultSerializer(results, many=True)
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+
+class ArchivedTaskListView(APIView):
+    permission_classes = [ProjectCollaboratorPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+    pagination_class = ArchivedTaskPagination
+
+    def get(self, request, project_uuid):
+        archived_tasks = ArchivedTask.objects.filter(
+            project=project_uuid, project__is_pending_deletion=False
+        ).defer("payload")
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(archived_tasks, request, view=self)
+        serializer = ArchivedTaskSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ArchivedTaskDetailView(APIView):
+    permission_classes = [ArchivedTaskPermission,]
+    authentication_classes = [StatelessJWTAuthentication,]
+
+    def get_object(self, uuid):
+        return get_archived_task(self.request, uuid)
+
+    def get(self, request, uuid):
+        instance = self.get_object(uuid)
+        if instance:
+            serializer = ArchivedTaskDetailSerializer(instance)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response({"detail": "Archived task not found."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ArchivedTaskRestoreView(APIView):
+    permission_classes = [ArchivedTaskPermission,]
+
+    def get_object(self, uuid):
+        return get_archived_task(self.request, uuid)
+
+    def post(self, request, uuid):
+        instance = self.get_object(uuid)
+        if instance:
+            task = restore_task(instance, request.user)
+            return Response(TaskDetailSerializer(task).data, status=status.HTTP_200_OK)
+        return Response({"detail": "Archived task not found."}, status=status.HTTP_404_NOT_FOUND)
+
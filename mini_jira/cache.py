@@ -0,0 +1,102 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+GENERATION_KEY = "project:{project_id}:generation"
+RESPONSE_KEY = "response:{namespace}:{project_id}:{generation}:{digest}"
+STATS_KEY = "response_cache:{namespace}:{outcome}"
+
+HIT = "hits"
+MISS = "misses"
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def new_generation():
+    # Seeded from the clock rather than 1 so that a generation key evicted
+    # from the cache can never come back with a value an old entry used.
+    return time.time_ns()
+
+
+def get_generation(project_id):
+    cache = get_cache()
+    key = GENERATION_KEY.format(project_id=project_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, new_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(project_id):
+    """Invalidates every cached response of a project in O(1)."""
+    cache = get_cache()
+    key = GENERATION_KEY.format(project_id=project_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_generation(), timeout=None)
+
+
+def increment_stat(namespace, outcome, delta=1):
+    cache = get_cache()
+    key = STATS_KEY.format(namespace=namespace, outcome=outcome)
+    if not cache.add(key, delta, timeout=None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, delta, timeout=None)
+
+
+def get_stats(namespaces):
+    cache = get_cache()
+    stats = {}
+    for namespace in namespaces:
+        hits = cache.get(STATS_KEY.format(namespace=namespace, outcome=HIT), 0)
+        misses = cache.get(STATS_KEY.format(namespace=namespace, outcome=MISS), 0)
+        total = hits + misses
+        stats[namespace] = {
+            HIT: hits,
+            MISS: misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+class ResponseCache:
+    """
+    Caches serialized response data per project and request URL.
+
+    Keys embed the project's generation counter, so bumping the counter
+    orphans every entry of the project at once. Orphans are never read
+    again and simply expire.
+    """
+    namespaces = set()
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout or settings.RESPONSE_CACHE_TIMEOUT
+        ResponseCache.namespaces.add(namespace)
+
+    def get_key(self, request, project_id):
+        digest = hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+        return RESPONSE_KEY.format(
+            namespace=self.namespace,
+            project_id=project_id,
+            generation=get_generation(project_id),
+            digest=digest,
+        )
+
+    def get(self, request, project_id):
+        data = get_cache().get(self.get_key(request, project_id))
+        increment_stat(self.namespace, MISS if data is None else HIT)
+        return data
+
+    def set(self, request, project_id, data):
+        get_cache().set(self.get_key(request, project_id), data, timeout=self.timeout)
+        return data
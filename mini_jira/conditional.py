@@ -0,0 +1,54 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(request, *parts):
+    # The request path is part of the tag so that different filters or
+    # pages of the same collection never share a validator.
+    value = ":".join([request.get_full_path(), *(str(part) for part in parts)])
+    return "W/" + quote_etag(hashlib.md5(value.encode("utf-8")).hexdigest())
+
+
+def get_object_validators(request, instance):
+    return make_etag(request, instance.pk, instance.updated_at.isoformat()), instance.updated_at
+
+
+def get_list_validators(request, queryset):
+    """
+    Derives validators for a collection from one aggregate query. The row
+    count is included so that rows leaving the set (for example a task
+    soft deleted with `Task.delete_object`) change the tag even though
+    the newest `updated_at` of the remaining rows does not move. For the
+    same reason no Last-Modified is returned, a date alone would keep
+    answering 304 after a row left the set.
+    """
+    aggregates = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+    last_modified = aggregates["last_modified"]
+    etag = make_etag(
+        request,
+        aggregates["count"],
+        last_modified.isoformat() if last_modified else "",
+    )
+    return etag, None
+
+
+def get_not_modified_response(request, etag, last_modified):
+    """Returns a 304 (or 412) response when the client's copy is still current, otherwise None."""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
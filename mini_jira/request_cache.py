@@ -0,0 +1,67 @@
+"""
+Request scoped identity map.
+
+Permission classes, views and serializers handling the same request look
+objects up through here, so each row is fetched at most once per request.
+Related instances loaded with select_related are registered as well, a
+task fetched with its project also answers later lookups of that project.
+"""
+
+REQUEST_ATTRIBUTE = "_object_cache"
+MISSING = object()
+
+
+def get_request_cache(request):
+    if request is None:
+        return None
+    # DRF wraps the Django request, the cache lives on the underlying one
+    # so it is shared with code that only sees the HttpRequest.
+    request = getattr(request, "_request", request)
+    cache = getattr(request, REQUEST_ATTRIBUTE, None)
+    if cache is None:
+        cache = {}
+        setattr(request, REQUEST_ATTRIBUTE, cache)
+    return cache
+
+
+def get_object_key(model, pk):
+    return (model._meta.label, str(pk))
+
+
+def register(cache, instance, seen=None):
+    seen = seen or set()
+    if instance is None or id(instance) in seen:
+        return
+    seen.add(id(instance))
+    cache.setdefault(get_object_key(type(instance), instance.pk), instance)
+    for related in instance._state.fields_cache.values():
+        register(cache, related, seen)
+
+
+def get_object(request, queryset, pk):
+    """
+    Returns the instance of `queryset.model` with primary key `pk`, or None.
+    The first lookup of a request decides which relations are joined in,
+    so callers that need them should pass the fully joined queryset.
+    """
+    cache = get_request_cache(request)
+    if cache is None:
+        return queryset.filter(pk=pk).first()
+    key = get_object_key(queryset.model, pk)
+    instance = cache.get(key, MISSING)
+    if instance is MISSING:
+        instance = queryset.filter(pk=pk).first()
+        cache[key] = instance
+        register(cache, instance)
+    return instance
+
+
+def memoize(request, key, function):
+    """Returns `function()`, computed once per request for `key`."""
+    cache = get_request_cache(request)
+    if cache is None:
+        return function()
+    key = ("memo", *key)
+    if key not in cache:
+        cache[key] = function()
+    return cache[key]
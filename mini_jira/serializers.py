@@ -0,0 +1,76 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def get_related_lookups(serializer, model, prefix=""):
+    """
+    Walks the readable fields of `serializer` and returns the
+    (select_related, prefetch_related) lookups needed to render it
+    without issuing a query per row.
+    """
+    select_related, prefetch_related = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        attrs = field.source_attrs
+        try:
+            model_field = model._meta.get_field(attrs[0])
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        lookup = f"{prefix}{attrs[0]}"
+        related_model = model_field.related_model
+
+        if model_field.many_to_many or model_field.one_to_many:
+            child = getattr(field, "child", None)
+            if isinstance(child, serializers.BaseSerializer):
+                queryset = optimize_queryset(related_model._default_manager.all(), child)
+                prefetch_related.append(Prefetch(lookup, queryset=queryset))
+            else:
+                prefetch_related.append(lookup)
+            continue
+
+        # A bare primary key is already on the row as `<name>_id`.
+        if (
+            len(attrs) == 1
+            and isinstance(field, serializers.RelatedField)
+            and field.use_pk_only_optimization()
+        ):
+            continue
+
+        select_related.append(lookup)
+        if isinstance(field, serializers.BaseSerializer):
+            nested_select, nested_prefetch = get_related_lookups(field, related_model, f"{lookup}__")
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+            continue
+
+        # Dotted sources such as "project.organization.name" follow forward relations.
+        for attr in attrs[1:]:
+            try:
+                model_field = related_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not (model_field.many_to_one or model_field.one_to_one):
+                break
+            lookup = f"{lookup}__{attr}"
+            related_model = model_field.related_model
+            select_related.append(lookup)
+
+    return select_related, prefetch_related
+
+
+def optimize_queryset(queryset, serializer):
+    """Adds the joins and prefetches `serializer` (class or instance) will need."""
+    if isinstance(serializer, type):
+        serializer = serializer()
+    select_related, prefetch_related = get_related_lookups(serializer, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
@@ -114,6 +114,20 @@ if PRODUCTION:
         }
     }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+if PRODUCTION:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://127.0.0.1:6379/1",
+        }
+    }
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -168,7 +182,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework configs
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -183,7 +197,12 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timezone.timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authentication.serializers.ClaimsTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "authentication.authentication.ClaimsTokenUser",
 }
+AUTH_CLAIMS_CACHE_ALIAS = "default"
+AUTH_CLAIMS_CACHE_TIMEOUT = 24 * 60 * 60  # 1 day
 
 # Custom Auth Model
 AUTH_USER_MODEL = "accounts.User"
@@ -203,3 +222,68 @@ INVITATION_EMAIL_SUBJECT = "You're invited to join a project"
 
 # Task Comment Allow Edit Till
 COMMENT_EDIT_DURATION_SECONDS = 5 * 60  # 5 mins
+EDITABLE_EXPIRE_BATCH_SIZE = 1000
+
+# Projects
+PROJECT_LIST_PAGE_SIZE = 50
+PROJECT_LIST_MAX_PAGE_SIZE = 200
+PROJECT_LIST_MAX_MEMBERS = 100
+PROJECT_MEMBERS_MAX_ITEMS = 1000
+PROJECT_PURGE_BATCH_SIZE = 500
+PROJECT_PURGE_MAX_ATTEMPTS = 5
+PROJECT_PURGE_LEASE_TIMEOUT = 10 * 60  # 10 mins
+
+# Task List Pagination
+TASK_LIST_PAGE_SIZE = 50
+TASK_LIST_MAX_PAGE_SIZE = 500
+
+# Task Comment Thread Pagination
+TASK_COMMENT_PAGE_SIZE = 50
+TASK_COMMENT_MAX_PAGE_SIZE = 200
+
+# Reply Trees
+REPLY_TREE_MAX_DEPTH = 10
+REPLY_TREE_MAX_REPLIES = 50
+REPLY_TREE_MAX_NODES = 1000
+
+# Full Text Search
+SEARCH_HIGHLIGHT_START = "<mark>"
+SEARCH_HIGHLIGHT_STOP = "</mark>"
+SEARCH_DEFAULT_RESULTS = 20
+SEARCH_MAX_RESULTS = 100
+SEARCH_REBUILD_BATCH_SIZE = 1000
+
+# Response Cache
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = 5 * 60  # 5 mins
+
+# Task Bulk Operations
+TASK_BULK_CREATE_BATCH_SIZE = 500
+TASK_BULK_MAX_ITEMS = 5000
+TASK_BULK_UPDATE_BATCH_SIZE = 500
+
+# Task Counters
+TASK_COUNTER_RECONCILE_BATCH_SIZE = 2000
+
+# Task Board
+TASK_BOARD_PAGE_SIZE = 20
+TASK_RANK_MAX_LENGTH = 32
+TASK_RANK_REBALANCE_BATCH_SIZE = 500
+
+# Task Export
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# Task Import
+TASK_IMPORT_BATCH_SIZE = 1000
+TASK_IMPORT_MAX_REPORTED_ERRORS = 100
+
+# Task Archive
+TASK_ARCHIVE_RETENTION_DAYS = 180
+TASK_ARCHIVE_BATCH_SIZE = 200
+
+# Membership Cache
+MEMBERSHIP_CACHE_ALIAS = "default"
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 60  # 1 hour
+MEMBERSHIP_LOCAL_CACHE_SIZE = 10000
+MEMBERSHIP_LOCAL_CACHE_TIMEOUT = 5  # seconds
+MEMBERSHIP_STATS_FLUSH_INTERVAL = 10  # seconds
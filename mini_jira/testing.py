@@ -0,0 +1,72 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryRecorder:
+    """Records the raw SQL and parameters of every query run on a connection."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def for_tables(self, tables):
+        pattern = re.compile(r'"(%s)"' % "|".join(re.escape(table) for table in tables))
+        return [
+            (sql, params) for sql, params in self.queries
+            if sql.lstrip().upper().startswith("SELECT") and pattern.search(sql)
+        ]
+
+
+@contextmanager
+def record_queries(using=connection):
+    recorder = QueryRecorder()
+    with using.execute_wrapper(recorder):
+        yield recorder
+
+
+def explain(sql, params, using=connection):
+    with using.cursor() as cursor:
+        if using.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN {sql}", params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def sequential_scans(plan, tables, using=connection):
+    """Returns the plan lines that read one of `tables` without an index seek."""
+    if using.vendor == "sqlite":
+        # "SCAN t" and "SCAN t USING INDEX i" both walk every row of t,
+        # only "SEARCH t USING ..." narrows the read down with an index.
+        pattern = re.compile(r"\bSCAN (%s)\b" % "|".join(re.escape(table) for table in tables))
+    else:
+        pattern = re.compile(r"\bSeq Scan on (%s)\b" % "|".join(re.escape(table) for table in tables))
+    return [line for line in plan if pattern.search(line)]
+
+
+def assert_no_sequential_scans(recorder, tables, using=connection):
+    queries = recorder.for_tables(tables)
+    assert queries, f"No queries were recorded against {', '.join(tables)}"
+    for sql, params in queries:
+        plan = explain(sql, params, using=using)
+        scans = sequential_scans(plan, tables, using=using)
+        assert not scans, f"Sequential scan in query plan:\n{sql}\n" + "\n".join(plan)
+
+
+@contextmanager
+def assert_query_budget(view_class, method="GET", using=connection):
+    """Fails when the wrapped block runs more queries than `view_class` declares for `method`."""
+    budget = view_class.query_budgets[method]
+    with CaptureQueriesContext(using) as context:
+        yield context
+    executed = len(context.captured_queries)
+    assert executed <= budget, (
+        f"{view_class.__name__} {method} ran {executed} queries, budget is {budget}:\n"
+        + "\n".join(query["sql"] for query in context.captured_queries)
+    )
@@ -18,6 +18,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from mini_jira.views import CacheStatsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/register/", include("registration.urls")),
@@ -27,6 +29,7 @@ urlpatterns = [
     path("tasks/", include("tasks.urls")),
     path("tasks/", include("tasks.urls")),
     path("collaborations/", include("collaborations.urls")),
+    path("api/monitoring/cache/", CacheStatsView.as_view(), name="cache_stats"),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,18 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import AdminGroupPermission
+from mini_jira.cache import ResponseCache, get_stats
+from projects.membership import get_membership_stats
+
+
+class CacheStatsView(APIView):
+    permission_classes = [AdminGroupPermission,]
+
+    def get(self, request):
+        data = {
+            "responses": get_stats(sorted(ResponseCache.namespaces)),
+            "membership": get_membership_stats(),
+        }
+        return Response(data, status=status.HTTP_200_OK)